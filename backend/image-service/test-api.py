@@ -17,14 +17,29 @@ def test_image_generation(api_url, test_data):
     try:
         response = requests.post(
             api_url,
-            headers={'Content-Type': 'application/json'},
+            headers={'Content-Type': 'application/json', 'Accept': 'image/png'},
             json=test_data,
             timeout=180
         )
         
         print(f"📊 Status Code: {response.status_code}")
         
-        if response.status_code == 200:
+        # Raw PNG response (servers without binary support fall back to JSON/base64)
+        if response.status_code == 200 and response.headers.get('Content-Type', '').startswith('image/'):
+            print("✅ Image generation successful! (binary)")
+            print(f"🗂  Cache: {response.headers.get('X-Image-Cache', 'N/A')}")
+            print(f"📦 Size: {len(response.content)} bytes")
+            
+            if '--save' in sys.argv:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"generated_image_{timestamp}.png"
+                
+                with open(filename, 'wb') as f:
+                    f.write(response.content)
+                print(f"💾 Image saved as: {filename}")
+            
+            return True
+        elif response.status_code == 200:
             data = response.json()
             if data.get('success'):
                 print("✅ Image generation successful!")
@@ -0,0 +1,46 @@
+// MCP get_bazi_details 결과 녹화 - 로컬 사주 엔진(lambda/saju_engine.py) 패리티 테스트용
+// 사용법: node record-bazi-fixtures.js (npx @mymcp-fun/bazi 실행 가능한 환경)
+import { Client } from "@modelcontextprotocol/sdk/client/index.js";
+import { StdioClientTransport } from "@modelcontextprotocol/sdk/client/stdio.js";
+import fs from "fs";
+import path from "path";
+import { fileURLToPath } from "url";
+
+const fixturesDir = path.join(path.dirname(fileURLToPath(import.meta.url)), "..", "test", "fixtures");
+const outputDir = path.join(fixturesDir, "mcp_bazi");
+
+// 기준 사주 입력 + 절입/야자시 경계 사례
+const reference = JSON.parse(fs.readFileSync(path.join(fixturesDir, "saju_reference.json"), "utf-8"));
+const inputs = [
+  ...reference.cases.map((item) => item.input),
+  { year: 1990, month: 5, day: 15, hour: 14 },
+  { year: 1988, month: 8, day: 8, hour: 23 },
+  { year: 2010, month: 12, day: 31, hour: 0 },
+  { year: 2023, month: 3, day: 6, hour: 5 },
+  { year: 2023, month: 3, day: 6, hour: 6 },
+];
+
+const pad = (value) => String(value).padStart(2, "0");
+
+const client = new Client(
+  { name: "yedamo-fixture-recorder", version: "1.0.0" },
+  { capabilities: {} }
+);
+await client.connect(new StdioClientTransport({ command: "npx", args: ["@mymcp-fun/bazi"] }));
+fs.mkdirSync(outputDir, { recursive: true });
+
+for (const input of inputs) {
+  // server.js /saju/basic과 같은 인자로 호출
+  const result = await client.callTool({
+    name: "get_bazi_details",
+    arguments: { ...input, gender: "male", timezone: "Asia/Seoul" },
+  });
+  const file = path.join(
+    outputDir,
+    `${input.year}-${pad(input.month)}-${pad(input.day)}-${pad(input.hour)}.json`
+  );
+  fs.writeFileSync(file, JSON.stringify({ input, result }, null, 2) + "\n");
+  console.log("녹화 완료:", file);
+}
+
+await client.close();
@@ -3,33 +3,66 @@ import cors from "cors";
 import { Client } from "@modelcontextprotocol/sdk/client/index.js";
 import { StdioClientTransport } from "@modelcontextprotocol/sdk/client/stdio.js";
 import { spawn } from "child_process";
-import crypto from "crypto";
-import redis from "redis";
-import { BedrockRuntimeClient, InvokeModelCommand } from "@aws-sdk/client-bedrock-runtime";
+import redis, { commandOptions } from "redis";
+import {
+  BedrockRuntimeClient,
+  InvokeModelCommand,
+  InvokeModelWithResponseStreamCommand,
+} from "@aws-sdk/client-bedrock-runtime";
 import { translateSajuResult, analyzeWuxing } from "./utils/sajuTranslator.js";
+import { loadPillarTable, lookupBazi } from "./utils/pillarTable.js";
+import { AnswerCache } from "./utils/answerCache.js";
+import { SAJU_CODEC_MEDIA_TYPE, decodeChart, encodeChart } from "./utils/sajuCodec.js";
+import { refreshChart, writeChartSession } from "./utils/chartStore.js";
+import {
+  SESSION_KEY_PREFIX,
+  chartCacheKey,
+  localChartCacheKey,
+  sessionCacheKey,
+  withName,
+} from "./utils/sajuKeys.js";
 
 const app = express();
 const PORT = process.env.PORT || 3001;
 
+// 사주 계산 엔진 - "local"이면 사전 계산 간지 테이블 우선 (양력 입력만, 음력은 MCP)
+const SAJU_ENGINE = process.env.SAJU_ENGINE || "mcp";
+// MCP 미연결 시 간지 테이블로 대체 계산 (명시적으로 켠 경우만, 결과는 로컬 엔진 차트 키에 저장)
+const SAJU_TABLE_FALLBACK = process.env.SAJU_TABLE_FALLBACK === "true";
+const pillarTable = loadPillarTable();
+
 // Bedrock 클라이언트 설정
 const bedrockClient = new BedrockRuntimeClient({ 
   region: process.env.AWS_REGION || "us-east-1" 
 });
 
 // Redis 클라이언트 설정
+// - REDIS_READER_HOST: 복제 그룹 읽기 엔드포인트 (있으면 조회는 복제본, 쓰기는 REDIS_HOST primary)
+// - REDIS_CLUSTER_MODE=true: REDIS_HOST를 클러스터 구성 엔드포인트로 사용, 읽기 전용 명령은 복제본으로 분산
+const REDIS_PORT = Number(process.env.REDIS_PORT || 6379);
+const REDIS_READER_HOST = process.env.REDIS_READER_HOST || "";
+const REDIS_CLUSTER_MODE = process.env.REDIS_CLUSTER_MODE === "true";
+
 let redisClient = null;
 let redisConnected = false;
+let redisReader = null;
+let readerConnected = false;
+
+function createRedisClient(host) {
+  const socket = { host, port: REDIS_PORT, connectTimeout: 5000 };
+  if (REDIS_CLUSTER_MODE) {
+    return redis.createCluster({
+      rootNodes: [{ socket }],
+      defaults: { socket: { connectTimeout: 5000 } },
+      useReplicas: true,
+    });
+  }
+  return redis.createClient({ socket: { ...socket, lazyConnect: true } });
+}
 
 async function initializeRedis() {
   try {
-    redisClient = redis.createClient({
-      socket: {
-        host: process.env.REDIS_HOST || "localhost",
-        port: process.env.REDIS_PORT || 6379,
-        connectTimeout: 5000,
-        lazyConnect: true,
-      },
-    });
+    redisClient = createRedisClient(process.env.REDIS_HOST || "localhost");
 
     redisClient.on("error", (err) => {
       console.error("Redis 연결 오류:", err.message);
@@ -42,10 +75,44 @@ async function initializeRedis() {
     });
 
     await redisClient.connect();
+    // 클러스터 클라이언트는 노드별로 연결하므로 connect 완료 시점에 연결 상태로 표시
+    if (REDIS_CLUSTER_MODE) redisConnected = true;
   } catch (error) {
     console.error("Redis 초기화 실패:", error.message);
     redisConnected = false;
   }
+
+  if (REDIS_READER_HOST && !REDIS_CLUSTER_MODE) {
+    try {
+      redisReader = createRedisClient(REDIS_READER_HOST);
+      redisReader.on("error", (err) => {
+        console.error("Redis 복제본 연결 오류:", err.message);
+        readerConnected = false;
+      });
+      redisReader.on("connect", () => {
+        console.log("Redis 복제본 연결 성공");
+        readerConnected = true;
+      });
+      await redisReader.connect();
+    } catch (error) {
+      console.error("Redis 복제본 초기화 실패 (primary에서 읽음):", error.message);
+      readerConnected = false;
+    }
+  }
+}
+
+// 조회용 클라이언트 - 복제본이 연결되어 있으면 복제본, 아니면 primary
+function readClient() {
+  return redisReader && readerConnected ? redisReader : redisClient;
+}
+
+// 복제본에서 조회하고, 없으면 primary에서 다시 조회
+// (방금 저장한 세션/차트가 복제 지연으로 아직 복제본에 없을 수 있음)
+async function readWithFallback(read) {
+  const reader = readClient();
+  const value = await read(reader);
+  if (value !== null || reader === redisClient) return value;
+  return read(redisClient);
 }
 
 app.use(cors());
@@ -78,10 +145,155 @@ async function initializeMCP() {
   }
 }
 
-// 캐시 키 생성 (cache_manager와 동일한 방식)
-function generateCacheKey(name) {
-  const timestamp = Math.floor(Date.now() / 1000);
-  return `${timestamp}_${name}`;
+const SAJU_CACHE_TTL = 1800;
+// 만료 5분 전부터 stale - 즉시 반환 후 백그라운드 갱신 (락은 계산 시간보다 길게)
+const SAJU_REFRESH_THRESHOLD = 300;
+const SAJU_REFRESH_LOCK_TTL = 30;
+// 차트(null이면 기존 차트 TTL 연장)와 세션 → 차트 매핑 저장 (Redis 연결된 경우만)
+async function storeChartSession(chartKey, chart, sessionKey, name) {
+  if (!redisConnected || !redisClient) return;
+  try {
+    await writeChartSession(redisClient, {
+      chartKey,
+      chart,
+      sessionKey,
+      name,
+      ttl: SAJU_CACHE_TTL,
+      cluster: REDIS_CLUSTER_MODE,
+    });
+    console.log("캐시에 데이터 저장:", chartKey, sessionKey);
+  } catch (cacheError) {
+    console.error("캐시 저장 오류:", cacheError.message);
+  }
+}
+
+// 상담 답변 캐시 - 같은 차트의 같은 질문 의도는 Bedrock 호출 없이 응답
+const answerCache = new AnswerCache({
+  getRedis: () => (redisConnected ? redisClient : null),
+  getReader: () => (redisConnected ? readClient() : null),
+  maxEntries: Number(process.env.ANSWER_CACHE_MAX_ENTRIES || 1000),
+  ttlSeconds: Number(process.env.ANSWER_CACHE_TTL || 21600),
+});
+
+// 차트 조회 - 바이너리(SJC)/기존 JSON 모두 읽음 (복제본 우선)
+async function getChart(chartKey) {
+  return decodeChart(
+    await readWithFallback((client) => client.get(commandOptions({ returnBuffers: true }), chartKey))
+  );
+}
+
+// 사주 응답 - 클라이언트가 차트 바이너리 형식을 우선 요청하면(Lambda 프록시) SJC로 전송
+function sendSajuResponse(req, res, body) {
+  if (req.accepts(["application/json", SAJU_CODEC_MEDIA_TYPE]) === SAJU_CODEC_MEDIA_TYPE) {
+    return res.type(SAJU_CODEC_MEDIA_TYPE).send(encodeChart(body));
+  }
+  return res.json(body);
+}
+
+// 세션 키면 가리키는 차트에 이름을 붙여, 차트 키(또는 기존 키)면 그대로 조회
+// 반환: { chartKey, chart } 또는 null
+async function loadSajuByKey(cacheKey) {
+  let chartKey = cacheKey;
+  let session = null;
+  if (cacheKey.startsWith(SESSION_KEY_PREFIX)) {
+    const sessionJson = await readWithFallback((client) => client.get(cacheKey));
+    if (!sessionJson) return null;
+    session = JSON.parse(sessionJson);
+    chartKey = session.chart_key;
+  }
+
+  const chart = await getChart(chartKey);
+  if (!chart) return null;
+  return { chartKey, chart: session ? withName(chart, session.name) : chart };
+}
+
+// 차트 계산 경로 - "table"(간지 테이블, 양력 입력만) / "mcp" / null(사용할 경로 없음)
+// 테이블은 SAJU_ENGINE=local이거나 SAJU_TABLE_FALLBACK=true에서 MCP가 미연결일 때만 사용
+function chartEngine({ birthDate, isLunar }) {
+  const tableAvailable = pillarTable && !isLunar && pillarTable.covers(new Date(birthDate).getFullYear());
+  if (tableAvailable && (SAJU_ENGINE === "local" || (SAJU_TABLE_FALLBACK && !mcpClient))) return "table";
+  return mcpClient ? "mcp" : null;
+}
+
+// 계산 경로별 차트 키 - 테이블 결과는 MCP와 대조되지 않았으므로 공유 MCP 차트 키와 분리
+function chartKeyFor(engine, birth) {
+  return engine === "table" ? localChartCacheKey(birth) : chartCacheKey(birth);
+}
+
+// 차트 계산 (이름 없는 sajuAnalysis) - 지정한 계산 경로를 사용할 수 없으면 null
+async function computeSajuChart({ birthDate, birthTime, gender }, engine) {
+  // 날짜 파싱
+  const date = new Date(birthDate);
+  const [hours, minutes] = birthTime.split(":").map(Number);
+
+  let result;
+  if (engine === "table") {
+    const baziData = lookupBazi(
+      pillarTable,
+      date.getFullYear(),
+      date.getMonth() + 1,
+      date.getDate(),
+      hours
+    );
+    result = { content: [{ type: "text", text: JSON.stringify(baziData) }] };
+  } else {
+    if (engine !== "mcp" || !mcpClient) return null;
+
+    // 사주 계산
+    result = await mcpClient.callTool({
+      name: "get_bazi_details",
+      arguments: {
+        year: date.getFullYear(),
+        month: date.getMonth() + 1,
+        day: date.getDate(),
+        hour: hours,
+        gender: gender || "male",
+        timezone: "Asia/Seoul",
+      },
+    });
+  }
+
+  // 결과 번역 및 파싱
+  const translatedResult = translateSajuResult(result);
+
+  if (!translatedResult) {
+    throw new Error("사주 결과 번역에 실패했습니다.");
+  }
+
+  const wuxingAnalysis = analyzeWuxing(translatedResult.오행);
+
+  return {
+    success: true,
+    data: {
+      translatedData: translatedResult,
+      wuxingAnalysis: wuxingAnalysis,
+      rawData: {
+        content: [
+          {
+            type: "text",
+            text: JSON.stringify(translatedResult.원본데이터, null, 2),
+          },
+        ],
+        isError: false,
+      },
+    },
+    timestamp: Math.floor(Date.now() / 1000),
+  };
+}
+
+// 만료 임박 차트 백그라운드 갱신 - Redis 락으로 여러 워커 중 하나만 재계산
+async function refreshChartInBackground(chartKey, birth, engine) {
+  try {
+    const status = await refreshChart(redisClient, {
+      chartKey,
+      compute: () => computeSajuChart(birth, engine),
+      ttl: SAJU_CACHE_TTL,
+      lockTtl: SAJU_REFRESH_LOCK_TTL,
+    });
+    if (status === "refreshed") console.log("차트 백그라운드 갱신 완료:", chartKey);
+  } catch (error) {
+    console.error("차트 백그라운드 갱신 오류:", error.message);
+  }
 }
 
 // 사주 기본 분석 API (캐시 지원)
@@ -111,100 +323,66 @@ app.post("/saju/basic", async (req, res) => {
         .json({ error: "생년월일과 시간 정보가 필요합니다." });
     }
 
-    // 캐시 키 처리 - 요청에 있으면 사용, 없으면 생성
-    const cacheKey = requestCacheKey || generateCacheKey(name || "anonymous");
+    // 캐시 키 - 차트는 계산 경로별 생년월일시 해시(이름 무관), 세션은 요청자별 (요청에 있으면 사용)
+    const birth = { birthDate, birthTime, isLunar, gender };
+    const engine = chartEngine(birth);
+    const [birthYear, birthMonth, birthDay] = birthDate.split("-").map(Number);
+    const chartKey = chartKeyFor(engine, {
+      year: birthYear,
+      month: birthMonth,
+      day: birthDay,
+      hour: Number(birthTime.split(":")[0]),
+      isLunar,
+      gender,
+    });
+    const cacheKey = sessionCacheKey(requestCacheKey);
 
     // 캐시에서 데이터 확인 (Redis 연결된 경우만)
     let needsRefresh = false;
     if (redisConnected && redisClient) {
       try {
-        const cachedJson = await redisClient.get(cacheKey);
-        if (cachedJson) {
-          const cachedItem = JSON.parse(cachedJson);
+        const cachedItem = await getChart(chartKey);
+        if (cachedItem) {
           const currentTime = Math.floor(Date.now() / 1000);
           const age = currentTime - (cachedItem.timestamp || 0);
 
-          // 갱신 필요 확인 (만료 5분 미만)
-          needsRefresh = age > 1800 - 300; // TTL 30분 - 갱신임계값 5분
-
-          if (!needsRefresh) {
-            console.log("캐시에서 데이터 반환:", cacheKey);
-            return res.json({
-              cache_key: cacheKey,
-              cached: true,
-              needsRefresh: false,
-              ...cachedItem,
-            });
+          // 갱신 필요 확인 (만료 5분 미만) - stale-while-revalidate:
+          // 만료 임박 차트도 즉시 반환하고 재계산은 백그라운드에서 한 워커만 수행
+          needsRefresh = age > SAJU_CACHE_TTL - SAJU_REFRESH_THRESHOLD;
+          if (needsRefresh) {
+            refreshChartInBackground(chartKey, birth, engine);
           }
+
+          console.log("캐시에서 데이터 반환:", chartKey, needsRefresh ? "(stale)" : "");
+          // 세션과 함께 차트 TTL도 연장 - 백그라운드 갱신이 실패해도 세션이 남은 차트를 가리킴
+          await storeChartSession(chartKey, null, cacheKey, name);
+          return sendSajuResponse(req, res, {
+            cache_key: cacheKey,
+            chart_key: chartKey,
+            cached: true,
+            needsRefresh,
+            ...withName(cachedItem, name),
+          });
         }
       } catch (cacheError) {
         console.error("캐시 조회 오류:", cacheError.message);
       }
     }
 
-    if (!mcpClient) {
+    const chart = await computeSajuChart(birth, engine);
+    if (!chart) {
       return res
         .status(500)
         .json({ error: "MCP 클라이언트가 연결되지 않았습니다." });
     }
+    const sajuAnalysis = withName(chart, name);
 
-    // 날짜 파싱
-    const date = new Date(birthDate);
-    const [hours, minutes] = birthTime.split(":").map(Number);
-
-    // 사주 계산
-    const result = await mcpClient.callTool({
-      name: "get_bazi_details",
-      arguments: {
-        year: date.getFullYear(),
-        month: date.getMonth() + 1,
-        day: date.getDate(),
-        hour: hours,
-        gender: gender || "male",
-        timezone: "Asia/Seoul",
-      },
-    });
-
-    // 결과 번역 및 파싱
-    const translatedResult = translateSajuResult(result);
-
-    if (!translatedResult) {
-      throw new Error("사주 결과 번역에 실패했습니다.");
-    }
-
-    const wuxingAnalysis = analyzeWuxing(translatedResult.오행);
-
-    const sajuAnalysis = {
-      success: true,
-      data: {
-        name: name || "익명",
-        translatedData: translatedResult,
-        wuxingAnalysis: wuxingAnalysis,
-        rawData: {
-          content: [
-            {
-              type: "text",
-              text: JSON.stringify(translatedResult.원본데이터, null, 2),
-            },
-          ],
-          isError: false,
-        },
-      },
-      timestamp: Math.floor(Date.now() / 1000),
-    };
+    // 캐시에 저장 - 차트는 이름 없이 저장하고 이름은 세션에 보관
+    await storeChartSession(chartKey, chart, cacheKey, name);
 
-    // 캐시에 저장 (Redis 연결된 경우만)
-    if (redisConnected && redisClient) {
-      try {
-        await redisClient.setEx(cacheKey, 1800, JSON.stringify(sajuAnalysis));
-        console.log("캐시에 데이터 저장:", cacheKey);
-      } catch (cacheError) {
-        console.error("캐시 저장 오류:", cacheError.message);
-      }
-    }
-
-    res.json({
+    sendSajuResponse(req, res, {
       cache_key: cacheKey,
+      chart_key: chartKey,
       cached: false,
       needsRefresh: needsRefresh,
       redis_connected: redisConnected,
@@ -228,17 +406,17 @@ app.get("/api/saju/:cacheKey", async (req, res) => {
       return res.status(503).json({ error: "Redis 연결이 없습니다." });
     }
 
-    const cachedJson = await redisClient.get(cacheKey);
-    if (!cachedJson) {
+    const saju = await loadSajuByKey(cacheKey);
+    if (!saju) {
       return res
         .status(404)
         .json({ error: "캐시된 데이터를 찾을 수 없습니다." });
     }
+    const cachedItem = saju.chart;
 
-    const cachedItem = JSON.parse(cachedJson);
     const currentTime = Math.floor(Date.now() / 1000);
     const age = currentTime - (cachedItem.timestamp || 0);
-    const needsRefresh = age > 1800 - 300;
+    const needsRefresh = age > SAJU_CACHE_TTL - SAJU_REFRESH_THRESHOLD;
 
     res.json({
       cache_key: cacheKey,
@@ -255,41 +433,64 @@ app.get("/api/saju/:cacheKey", async (req, res) => {
   }
 });
 
-// 사주 상담 API (Lambda에서 이전)
-app.post("/saju/consultation", async (req, res) => {
-  try {
-    const { cache_key, question } = req.body;
+// 상담 요청 검증 및 캐시된 사주 데이터 조회 (실패 시 오류 응답 후 null 반환)
+async function loadConsultationContext(req, res) {
+  const { cache_key, question } = req.body;
 
-    if (!cache_key) {
-      return res.status(400).json({ error: "cache_key가 필요합니다" });
-    }
-    if (!question) {
-      return res.status(400).json({ error: "질문이 필요합니다" });
-    }
+  if (!cache_key) {
+    res.status(400).json({ error: "cache_key가 필요합니다" });
+    return null;
+  }
+  if (!question) {
+    res.status(400).json({ error: "질문이 필요합니다" });
+    return null;
+  }
 
-    // Redis에서 캐시된 사주 데이터 조회
-    if (!redisConnected || !redisClient) {
-      return res.status(503).json({ error: "Redis 연결이 없습니다" });
-    }
+  // Redis에서 캐시된 사주 데이터 조회
+  if (!redisConnected || !redisClient) {
+    res.status(503).json({ error: "Redis 연결이 없습니다" });
+    return null;
+  }
 
-    const cachedJson = await redisClient.get(cache_key);
-    if (!cachedJson) {
-      return res.status(404).json({ 
-        error: "캐시에서 사주 데이터를 찾을 수 없습니다",
-        cache_key: cache_key
-      });
-    }
+  // 세션 키/차트 키 모두 허용
+  const saju = await loadSajuByKey(cache_key);
+  if (!saju) {
+    res.status(404).json({ 
+      error: "캐시에서 사주 데이터를 찾을 수 없습니다",
+      cache_key: cache_key
+    });
+    return null;
+  }
 
-    const cachedData = JSON.parse(cachedJson);
-    
-    // Bedrock을 사용한 AI 상담 응답 생성
-    const consultation = await generateConsultation(question, cachedData);
+  return { cache_key, question, chartKey: saju.chartKey, cachedData: saju.chart };
+}
 
+// 사주 상담 API (Lambda에서 이전)
+app.post("/saju/consultation", async (req, res) => {
+  try {
+    const context = await loadConsultationContext(req, res);
+    if (!context) return;
+    const { cache_key, question, chartKey, cachedData } = context;
+    const name = cachedData.data?.name;
+
+    // 답변 캐시 확인 후 없으면 Bedrock을 사용한 AI 상담 응답 생성 (폴백 답변은 캐시하지 않음)
+    const cached = await answerCache.get(chartKey, question, name);
+    let consultation = cached?.consultation;
+    if (!cached) {
+      const generated = await generateConsultation(question, cachedData);
+      consultation = generated.consultation;
+      if (!generated.fallback) {
+        await answerCache.set(chartKey, question, name, consultation);
+      }
+    }
+
+    res.set("X-Answer-Cache", cached ? "HIT" : "MISS");
     res.json({
       agent_type: "ec2_bedrock_consultation",
       consultation: consultation,
       cache_key: cache_key,
       question: question,
+      cached: Boolean(cached),
       timestamp: new Date().toISOString()
     });
 
@@ -302,6 +503,88 @@ app.post("/saju/consultation", async (req, res) => {
   }
 });
 
+// 사주 상담 스트리밍 API (SSE) - 생성되는 텍스트를 즉시 전달
+// 이벤트 순서: meta → delta* → done (스트림 도중 실패 시 error)
+app.post("/saju/consultation/stream", async (req, res) => {
+  let context;
+  try {
+    context = await loadConsultationContext(req, res);
+  } catch (error) {
+    console.error("상담 처리 오류:", error);
+    return res.status(500).json({
+      error: "상담 중 오류가 발생했습니다. 다시 시도해주세요.",
+      details: error.message
+    });
+  }
+  if (!context) return;
+  const { cache_key, question, chartKey, cachedData } = context;
+  const name = cachedData.data?.name;
+  const cached = await answerCache.get(chartKey, question, name);
+
+  res.set({
+    "X-Answer-Cache": cached ? "HIT" : "MISS",
+    "Content-Type": "text/event-stream; charset=utf-8",
+    "Cache-Control": "no-cache, no-transform",
+    Connection: "keep-alive",
+    "X-Accel-Buffering": "no",
+  });
+  res.flushHeaders();
+  const send = (event, data) => res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+
+  // 클라이언트 연결이 끊기면 Bedrock 스트림도 중단
+  const disconnect = new AbortController();
+  res.on("close", () => disconnect.abort());
+
+  send("meta", { cache_key, question });
+
+  const done = (consultation, fallback) => {
+    send("done", {
+      agent_type: "ec2_bedrock_consultation",
+      consultation: consultation,
+      cache_key: cache_key,
+      question: question,
+      fallback: fallback,
+      cached: Boolean(cached),
+      timestamp: new Date().toISOString()
+    });
+    res.end();
+  };
+
+  // 캐시된 답변은 한 번의 delta로 즉시 전달
+  if (cached) {
+    send("delta", { text: cached.consultation });
+    return done(cached.consultation, false);
+  }
+
+  let consultation = "";
+  let fallback = false;
+  try {
+    await streamConsultation(question, cachedData, (text) => {
+      consultation += text;
+      send("delta", { text });
+    }, disconnect.signal);
+  } catch (error) {
+    if (disconnect.signal.aborted) return;
+    console.error("Bedrock 스트리밍 오류:", error);
+    if (consultation) {
+      // 이미 일부 답변을 보낸 뒤에는 폴백으로 덮어쓰지 않음
+      send("error", {
+        error: "상담 중 오류가 발생했습니다. 다시 시도해주세요.",
+        details: error.message
+      });
+      return res.end();
+    }
+    consultation = fallbackConsultation(question, cachedData);
+    fallback = true;
+    send("delta", { text: consultation });
+  }
+
+  if (!fallback) {
+    await answerCache.set(chartKey, question, name, consultation);
+  }
+  done(consultation, fallback);
+});
+
 // Bedrock을 사용한 상담 응답 생성 함수
 
 // 헬스 체크
@@ -313,8 +596,18 @@ app.get("/health", (req, res) => {
   });
 });
 
+// 캐시 지표 (답변 캐시 적중률 등)
+app.get("/metrics", (req, res) => {
+  res.json({
+    answer_cache: answerCache.stats(),
+  });
+});
+
+// Lambda가 init 단계에서 미리 연 keep-alive 연결을 유지하도록 유휴 제한을 Node 기본값(5초)보다 길게
+const KEEP_ALIVE_TIMEOUT_MS = Number(process.env.KEEP_ALIVE_TIMEOUT_MS || 65000);
+
 // 서버 시작
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   console.log(`서버가 포트 ${PORT}에서 실행 중입니다.`);
   console.log(`- API 엔드포인트: http://localhost:${PORT}/api/saju`);
   console.log(`- 캐시 조회: http://localhost:${PORT}/api/saju/:cacheKey`);
@@ -324,14 +617,20 @@ app.listen(PORT, () => {
   initializeRedis();
   initializeMCP();
 });
-// Bedrock을 사용한 상담 응답 생성 함수 (타임아웃 추가)
-async function generateConsultation(question, sajuData) {
-  try {
-    const name = sajuData.data?.name || '고객';
-    const translatedData = sajuData.data?.translatedData;
-    const wuxingAnalysis = sajuData.data?.wuxingAnalysis;
-    
-    const prompt = `당신은 전문 사주명리학 상담사입니다. 다음 사주 정보를 바탕으로 질문에 답변해주세요.
+server.keepAliveTimeout = KEEP_ALIVE_TIMEOUT_MS;
+server.headersTimeout = KEEP_ALIVE_TIMEOUT_MS + 1000;
+const CONSULTATION_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0";
+const CONSULTATION_MAX_TOKENS = 500;
+// 전체 응답(버퍼링) 또는 첫 텍스트(스트리밍) 대기 제한
+const CONSULTATION_TIMEOUT_MS = 10000;
+
+// 상담 프롬프트 생성
+function buildConsultationPrompt(question, sajuData) {
+  const name = sajuData.data?.name || "고객";
+  const translatedData = sajuData.data?.translatedData;
+  const wuxingAnalysis = sajuData.data?.wuxingAnalysis;
+
+  return `당신은 전문 사주명리학 상담사입니다. 다음 사주 정보를 바탕으로 질문에 답변해주세요.
 
 고객명: ${name}
 질문: ${question}
@@ -339,7 +638,6 @@ async function generateConsultation(question, sajuData) {
 사주 정보:
 - 사주팔자: ${JSON.stringify(translatedData?.사주팔자 || {})}
 - 오행 분석: ${JSON.stringify(wuxingAnalysis || {})}
-- 십신: ${JSON.stringify(translatedData?.십신 || {})}
 
 답변 요구사항:
 1. 전문적이면서도 이해하기 쉽게 설명
@@ -348,94 +646,54 @@ async function generateConsultation(question, sajuData) {
 4. 200-300자 내외로 간결하게 작성
 
 답변:`;
+}
 
-    // 10초 타임아웃으로 Bedrock 호출
-    const timeoutPromise = new Promise((_, reject) => 
-      setTimeout(() => reject(new Error('Bedrock timeout')), 10000)
-    );
-
-    const bedrockPromise = (async () => {
-      const command = new InvokeModelCommand({
-        modelId: 'anthropic.claude-3-haiku-20240307-v1:0',
-        body: JSON.stringify({
-          anthropic_version: 'bedrock-2023-05-31',
-          max_tokens: 500,
-          messages: [{ role: 'user', content: prompt }]
-        })
-      });
-
-      const response = await bedrockClient.send(command);
-      const responseBody = JSON.parse(new TextDecoder().decode(response.body));
-      return responseBody.content[0].text;
-    })();
-
-    return await Promise.race([bedrockPromise, timeoutPromise]);
+function consultationRequestBody(question, sajuData) {
+  return JSON.stringify({
+    anthropic_version: "bedrock-2023-05-31",
+    max_tokens: CONSULTATION_MAX_TOKENS,
+    messages: [{ role: "user", content: buildConsultationPrompt(question, sajuData) }]
+  });
+}
 
-  } catch (error) {
-    console.error('Bedrock 호출 오류:', error);
-    
-    // 빠른 폴백 응답
-    const name = sajuData.data?.name || '고객';
-    const wuxing = sajuData.data?.wuxingAnalysis || [];
-    
-    let response = `${name}님의 사주를 바탕으로 답변드리겠습니다.\n\n`;
-    
-    if (question.includes('운세') || question.includes('올해')) {
-      response += '올해는 ';
-      if (wuxing.some(w => w.includes('화') && w.includes('강함'))) {
-        response += '화의 기운이 강해 활동적이고 적극적인 한 해가 될 것입니다. ';
-      } else if (wuxing.some(w => w.includes('금') && w.includes('강함'))) {
-        response += '금의 기운으로 결단력과 추진력이 좋은 해입니다. ';
-      } else {
-        response += '균형잡힌 오행으로 안정적인 운세를 보입니다. ';
-      }
+// 빠른 폴백 응답 (사주 데이터 기반)
+function fallbackConsultation(question, sajuData) {
+  const name = sajuData.data?.name || "고객";
+  const wuxing = sajuData.data?.wuxingAnalysis || [];
+  
+  let response = `${name}님의 사주를 바탕으로 답변드리겠습니다.\n\n`;
+  
+  if (question.includes("운세") || question.includes("올해")) {
+    response += "올해는 ";
+    if (wuxing.some(w => w.includes("화") && w.includes("강함"))) {
+      response += "화의 기운이 강해 활동적이고 적극적인 한 해가 될 것입니다. ";
+    } else if (wuxing.some(w => w.includes("금") && w.includes("강함"))) {
+      response += "금의 기운으로 결단력과 추진력이 좋은 해입니다. ";
     } else {
-      response += '전반적으로 균형잡힌 사주를 가지고 계십니다. ';
+      response += "균형잡힌 오행으로 안정적인 운세를 보입니다. ";
     }
-    
-    response += '꾸준한 노력과 긍정적인 마음가짐이 좋은 결과를 가져다 줄 것입니다.';
-    
-    return response;
+  } else {
+    response += "전반적으로 균형잡힌 사주를 가지고 계십니다. ";
   }
+  
+  response += "꾸준한 노력과 긍정적인 마음가짐이 좋은 결과를 가져다 줄 것입니다.";
+  
+  return response;
 }
 
 // Bedrock을 사용한 상담 응답 생성 함수 (타임아웃 최적화)
+// 반환: { consultation, fallback } - Bedrock 실패/타임아웃 시 폴백 답변
 async function generateConsultation(question, sajuData) {
   try {
-    const name = sajuData.data?.name || "고객";
-    const translatedData = sajuData.data?.translatedData;
-    const wuxingAnalysis = sajuData.data?.wuxingAnalysis;
-    
-    const prompt = `당신은 전문 사주명리학 상담사입니다. 다음 사주 정보를 바탕으로 질문에 답변해주세요.
-
-고객명: ${name}
-질문: ${question}
-
-사주 정보:
-- 사주팔자: ${JSON.stringify(translatedData?.사주팔자 || {})}
-- 오행 분석: ${JSON.stringify(wuxingAnalysis || {})}
-
-답변 요구사항:
-1. 전문적이면서도 이해하기 쉽게 설명
-2. 구체적이고 실용적인 조언 제공
-3. 긍정적이고 건설적인 방향으로 안내
-4. 200-300자 내외로 간결하게 작성
-
-답변:`;
-
     // 10초 타임아웃으로 Bedrock 호출
     const timeoutPromise = new Promise((_, reject) => 
-      setTimeout(() => reject(new Error("Bedrock timeout")), 10000)
+      setTimeout(() => reject(new Error("Bedrock timeout")), CONSULTATION_TIMEOUT_MS)
     );
 
     const bedrockPromise = (async () => {
       const command = new InvokeModelCommand({
-        modelId: "anthropic.claude-3-haiku-20240307-v1:0",
-        body: JSON.stringify({
-          anthropic_version: "bedrock-2023-05-31",
-          max_tokens: 500,
-          messages: [{ role: "user", content: prompt }]
-        })
+        modelId: CONSULTATION_MODEL_ID,
+        body: consultationRequestBody(question, sajuData)
       });
 
       const response = await bedrockClient.send(command);
@@ -443,32 +701,43 @@ async function generateConsultation(question, sajuData) {
       return responseBody.content[0].text;
     })();
 
-    return await Promise.race([bedrockPromise, timeoutPromise]);
+    const consultation = await Promise.race([bedrockPromise, timeoutPromise]);
+    return { consultation, fallback: false };
 
   } catch (error) {
     console.error("Bedrock 호출 오류:", error);
-    
-    // 빠른 폴백 응답 (사주 데이터 기반)
-    const name = sajuData.data?.name || "고객";
-    const wuxing = sajuData.data?.wuxingAnalysis || [];
-    
-    let response = `${name}님의 사주를 바탕으로 답변드리겠습니다.\n\n`;
-    
-    if (question.includes("운세") || question.includes("올해")) {
-      response += "올해는 ";
-      if (wuxing.some(w => w.includes("화") && w.includes("강함"))) {
-        response += "화의 기운이 강해 활동적이고 적극적인 한 해가 될 것입니다. ";
-      } else if (wuxing.some(w => w.includes("금") && w.includes("강함"))) {
-        response += "금의 기운으로 결단력과 추진력이 좋은 해입니다. ";
-      } else {
-        response += "균형잡힌 오행으로 안정적인 운세를 보입니다. ";
+    return { consultation: fallbackConsultation(question, sajuData), fallback: true };
+  }
+}
+
+// Bedrock 스트리밍 상담 응답 생성 - 텍스트 조각이 도착할 때마다 onDelta 호출
+async function streamConsultation(question, sajuData, onDelta, abortSignal) {
+  const controller = new AbortController();
+  const abort = () => controller.abort();
+  abortSignal?.addEventListener("abort", abort);
+  // 첫 텍스트가 제한 시간 내 도착하지 않으면 중단 (호출 측에서 폴백)
+  const firstTokenTimer = setTimeout(abort, CONSULTATION_TIMEOUT_MS);
+
+  try {
+    const command = new InvokeModelWithResponseStreamCommand({
+      modelId: CONSULTATION_MODEL_ID,
+      contentType: "application/json",
+      accept: "application/json",
+      body: consultationRequestBody(question, sajuData)
+    });
+
+    const response = await bedrockClient.send(command, { abortSignal: controller.signal });
+    const decoder = new TextDecoder();
+    for await (const event of response.body) {
+      if (!event.chunk?.bytes) continue;
+      const payload = JSON.parse(decoder.decode(event.chunk.bytes));
+      if (payload.type === "content_block_delta" && payload.delta?.text) {
+        clearTimeout(firstTokenTimer);
+        onDelta(payload.delta.text);
       }
-    } else {
-      response += "전반적으로 균형잡힌 사주를 가지고 계십니다. ";
     }
-    
-    response += "꾸준한 노력과 긍정적인 마음가짐이 좋은 결과를 가져다 줄 것입니다.";
-    
-    return response;
+  } finally {
+    clearTimeout(firstTokenTimer);
+    abortSignal?.removeEventListener("abort", abort);
   }
 }
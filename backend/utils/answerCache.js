@@ -0,0 +1,160 @@
+// 상담 답변 캐시 - (차트 키, 정규화한 질문 의도) 기준
+// 1단계: 프로세스 내 LRU (밀리초 응답), 2단계: Redis (워커 간 공유, TTL 만료)
+
+import crypto from 'crypto';
+
+export const ANSWER_KEY_PREFIX = 'saju:answer:v2:';
+
+// 답변 안의 요청자 이름은 자리표시자로 저장해 같은 차트의 다른 세션에도 재사용
+const NAME_PLACEHOLDER = '{{name}}';
+
+// 의도로 묶는 정형 질문 - "[기간][주제운][조사/맺음말]" 형태(정규화 후)와 정확히 일치할 때만
+// (이직/승진/돈 문제처럼 구체적인 질문은 키워드가 겹쳐도 서로 다른 답변이므로 정규화 원문 기준)
+const CANONICAL_PERIODS = {
+  '': 'any',
+  올해: 'this_year', 금년: 'this_year', 신년: 'this_year',
+  내년: 'next_year',
+  이번달: 'this_month', 이달: 'this_month'
+};
+const CANONICAL_TOPICS = {
+  운세: 'general', 총운: 'general', 전체운: 'general',
+  직장운: 'career', 직업운: 'career',
+  재물운: 'wealth', 금전운: 'wealth',
+  연애운: 'love', 애정운: 'love',
+  건강운: 'health'
+};
+const CANONICAL_ENDINGS = [
+  '', '은', '는', '이', '가',
+  '은어떤가요', '는어떤가요', '은어때요', '는어때요',
+  '이궁금합니다', '가궁금합니다', '이궁금해요', '가궁금해요',
+  '알려주세요', '을알려주세요', '를알려주세요', '좀알려주세요'
+];
+
+// 공백/문장부호/기호 제거, 전각·반각 통일, 소문자화
+export function normalizeQuestion(question) {
+  return String(question || '')
+    .normalize('NFKC')
+    .toLowerCase()
+    .replace(/[\s\p{P}\p{S}]+/gu, '');
+}
+
+// 정규화한 정형 질문 → 의도
+const CANONICAL_INTENTS = new Map();
+for (const [periodWord, period] of Object.entries(CANONICAL_PERIODS)) {
+  for (const [topicWord, topic] of Object.entries(CANONICAL_TOPICS)) {
+    for (const ending of CANONICAL_ENDINGS) {
+      CANONICAL_INTENTS.set(normalizeQuestion(periodWord + topicWord + ending), `intent:${period}:${topic}`);
+    }
+  }
+}
+
+// 질문 의도 - 정형 질문이면 기간/주제, 아니면 정규화 원문
+export function questionIntent(question) {
+  const normalized = normalizeQuestion(question);
+  return CANONICAL_INTENTS.get(normalized) || `text:${normalized}`;
+}
+
+export function answerCacheKey(chartKey, question) {
+  const digest = crypto
+    .createHash('sha256')
+    .update(`${chartKey}\n${questionIntent(question)}`, 'utf8')
+    .digest('hex');
+  return ANSWER_KEY_PREFIX + digest.slice(0, 32);
+}
+
+// 기본 이름(고객/익명)은 일반 단어와 겹치므로 자리표시자로 바꾸지 않음
+function isPersonalName(name) {
+  return Boolean(name) && name.length >= 2 && name !== '고객' && name !== '익명';
+}
+
+function toTemplate(answer, name) {
+  return isPersonalName(name) ? answer.split(name).join(NAME_PLACEHOLDER) : answer;
+}
+
+function fromTemplate(template, name) {
+  return template.split(NAME_PLACEHOLDER).join(name || '고객');
+}
+
+export class AnswerCache {
+  // getRedis: 연결된 Redis 클라이언트 또는 null을 반환하는 함수 (getReader: 조회용, 기본은 getRedis)
+  constructor({ getRedis, getReader = getRedis, maxEntries = 1000, ttlSeconds = 21600 }) {
+    this.getRedis = getRedis;
+    this.getReader = getReader;
+    this.maxEntries = maxEntries;
+    this.ttlSeconds = ttlSeconds;
+    this.entries = new Map();
+    this.localHits = 0;
+    this.redisHits = 0;
+    this.misses = 0;
+  }
+
+  // 캐시된 답변 ({ consultation, tier }) 또는 null
+  async get(chartKey, question, name) {
+    const key = answerCacheKey(chartKey, question);
+
+    const entry = this.entries.get(key);
+    if (entry && entry.expiresAt > Date.now()) {
+      // LRU - 최근 사용 항목을 뒤로
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+      this.localHits += 1;
+      return { consultation: fromTemplate(entry.template, name), tier: 'local' };
+    }
+    if (entry) this.entries.delete(key);
+
+    const redis = this.getReader();
+    if (redis) {
+      try {
+        const [cached, ttl] = await redis.multi().get(key).ttl(key).exec();
+        if (cached) {
+          this.remember(key, cached, ttl > 0 ? ttl : this.ttlSeconds);
+          this.redisHits += 1;
+          return { consultation: fromTemplate(cached, name), tier: 'redis' };
+        }
+      } catch (error) {
+        console.error('답변 캐시 조회 오류:', error.message);
+      }
+    }
+
+    this.misses += 1;
+    return null;
+  }
+
+  async set(chartKey, question, name, consultation) {
+    const key = answerCacheKey(chartKey, question);
+    const template = toTemplate(consultation, name);
+    this.remember(key, template, this.ttlSeconds);
+
+    const redis = this.getRedis();
+    if (!redis) return;
+    try {
+      await redis.setEx(key, this.ttlSeconds, template);
+    } catch (error) {
+      console.error('답변 캐시 저장 오류:', error.message);
+    }
+  }
+
+  remember(key, template, ttlSeconds) {
+    if (this.maxEntries <= 0) return;
+    this.entries.delete(key);
+    this.entries.set(key, { template, expiresAt: Date.now() + ttlSeconds * 1000 });
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  stats() {
+    const hits = this.localHits + this.redisHits;
+    const total = hits + this.misses;
+    return {
+      hits,
+      local_hits: this.localHits,
+      redis_hits: this.redisHits,
+      misses: this.misses,
+      hit_rate: total ? Number((hits / total).toFixed(4)) : 0,
+      entries: this.entries.size,
+      max_entries: this.maxEntries,
+      ttl_seconds: this.ttlSeconds
+    };
+  }
+}
@@ -0,0 +1,46 @@
+// 사주 차트/세션 Redis 저장과 만료 임박 차트 갱신 (backend/server.js /saju/basic)
+// 키 형식은 sajuKeys.js, 차트 값은 sajuCodec.js의 SJC 바이너리
+
+import crypto from 'crypto';
+import { encodeChart } from './sajuCodec.js';
+
+// 락 값이 자신의 토큰일 때만 삭제 - 계산이 TTL보다 길어져 다른 워커가 잡은 락은 유지
+export const RELEASE_LOCK_SCRIPT =
+  "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0";
+
+// 차트와 세션 → 차트 매핑 저장
+// chart가 null이면(캐시 적중) 기존 차트의 TTL을 세션과 같게 연장 - 갱신 임박 차트를 가리키는 세션이
+// 갱신 실패(락 경합, MCP 미연결, 계산 오류) 시 차트보다 오래 남아 404가 되지 않도록 함
+export async function writeChartSession(client, { chartKey, chart, sessionKey, name, ttl, cluster = false }) {
+  const session = JSON.stringify({ chart_key: chartKey, name });
+  if (cluster) {
+    // 차트/세션 키가 다른 슬롯이라 MULTI 대신 개별 저장
+    await Promise.all([
+      chart ? client.setEx(chartKey, ttl, encodeChart(chart)) : client.expire(chartKey, ttl),
+      client.setEx(sessionKey, ttl, session),
+    ]);
+    return;
+  }
+  const multi = client.multi();
+  if (chart) multi.setEx(chartKey, ttl, encodeChart(chart));
+  else multi.expire(chartKey, ttl);
+  multi.setEx(sessionKey, ttl, session);
+  await multi.exec();
+}
+
+// 만료 임박 차트 갱신 - Redis 락(SET NX)으로 여러 워커 중 하나만 재계산
+// 반환: "refreshed" / "locked"(다른 워커가 갱신 중) / "unavailable"(계산 경로 없음), 계산 오류는 그대로 전달
+export async function refreshChart(client, { chartKey, compute, ttl, lockTtl }) {
+  const lockKey = `saju:lock:${chartKey}`;
+  const lockToken = crypto.randomUUID();
+  const acquired = await client.set(lockKey, lockToken, { NX: true, PX: lockTtl * 1000 });
+  if (!acquired) return 'locked';
+  try {
+    const chart = await compute();
+    if (!chart) return 'unavailable';
+    await client.setEx(chartKey, ttl, encodeChart(chart));
+    return 'refreshed';
+  } finally {
+    await client.eval(RELEASE_LOCK_SCRIPT, { keys: [lockKey], arguments: [lockToken] });
+  }
+}
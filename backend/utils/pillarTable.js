@@ -0,0 +1,151 @@
+// 사전 계산된 사주 간지 테이블 조회 (lambda/pillar_table.py가 생성한 saju_pillars.bin)
+// 파일 형식은 lambda/pillar_table.py 참고 - 헤더 32B + 시주 표 240B + 일별 4B 레코드
+
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+
+const MAGIC = 'SJPT';
+const VERSION = 1;
+const HOUR_TABLE_OFFSET = 32;
+const RECORDS_OFFSET = HOUR_TABLE_OFFSET + 10 * 24;
+const RECORD_SIZE = 4;
+const YIN = 2;
+
+// 1970-01-01의 proleptic Gregorian ordinal (Python date.toordinal과 같은 기준)
+const UNIX_EPOCH_ORDINAL = 719163;
+const DAY_MS = 86400000;
+
+const DEFAULT_TABLE_PATH = path.join(
+  path.dirname(fileURLToPath(import.meta.url)),
+  '..', '..', 'lambda', 'data', 'saju_pillars.bin'
+);
+
+// lambda/saju_engine.py와 같은 표
+const STEMS = '甲乙丙丁戊己庚辛壬癸';
+const BRANCHES = '子丑寅卯辰巳午未申酉戌亥';
+const ELEMENTS = '木火土金水';
+const STEM_ELEMENTS = '木木火火土土金金水水';
+const BRANCH_ELEMENTS = '水土木木土火火土金金土水';
+const BRANCH_MAIN_STEMS = '癸己甲乙戊丙丁己庚辛戊壬';
+const SHENGXIAO = ['鼠', '牛', '虎', '兔', '龙', '蛇', '马', '羊', '猴', '鸡', '狗', '猪'];
+const JIE_NAMES = ['立春', '驚蟄', '清明', '立夏', '芒種', '小暑', '立秋', '白露', '寒露', '立冬', '大雪', '小寒'];
+const TEN_GODS = [
+  ['比肩', '劫财'],
+  ['食神', '伤官'],
+  ['偏财', '正财'],
+  ['七杀', '正官'],
+  ['偏印', '正印']
+];
+const CONSTELLATIONS = [
+  [120, '水瓶'], [219, '双鱼'], [321, '白羊'], [420, '金牛'],
+  [521, '双子'], [622, '巨蟹'], [723, '狮子'], [823, '处女'],
+  [923, '天秤'], [1024, '天蝎'], [1123, '射手'], [1222, '摩羯']
+];
+
+// 간지 테이블 로드 (파일이 없거나 형식이 다르면 null - 호출 측은 MCP 사용)
+export function loadPillarTable(file = process.env.SAJU_PILLAR_TABLE || DEFAULT_TABLE_PATH) {
+  let buffer;
+  try {
+    buffer = fs.readFileSync(file);
+  } catch {
+    return null;
+  }
+
+  if (buffer.length < RECORDS_OFFSET || buffer.toString('latin1', 0, 4) !== MAGIC || buffer.readUInt16LE(4) !== VERSION) {
+    console.error('지원하지 않는 간지 테이블 형식입니다:', file);
+    return null;
+  }
+
+  const startYear = buffer.readUInt16LE(6);
+  const endYear = buffer.readUInt16LE(8);
+  const epochOrdinal = buffer.readUInt32LE(10);
+  const dayCount = buffer.readUInt32LE(14);
+  if (buffer.length < RECORDS_OFFSET + dayCount * RECORD_SIZE) {
+    console.error('간지 테이블 파일이 손상되었습니다:', file);
+    return null;
+  }
+
+  return {
+    startYear,
+    endYear,
+    covers: (year) => startYear <= year && year <= endYear,
+    // 연주/월주/일주/시주 60갑자 순번
+    lookup(year, month, day, hour) {
+      const utc = Date.UTC(year, month - 1, day);
+      const parsed = new Date(utc);
+      if (parsed.getUTCFullYear() !== year || parsed.getUTCMonth() !== month - 1 || parsed.getUTCDate() !== day) {
+        throw new RangeError('존재하지 않는 날짜입니다');
+      }
+      const offset = utc / DAY_MS + UNIX_EPOCH_ORDINAL - epochOrdinal;
+      if (offset < 0 || offset >= dayCount) {
+        throw new RangeError(`간지 테이블 범위(${startYear}-${endYear}) 밖의 날짜입니다`);
+      }
+      if (!Number.isInteger(hour) || hour < 0 || hour > 23) {
+        throw new RangeError('시간은 0-23 사이여야 합니다');
+      }
+
+      const base = RECORDS_OFFSET + offset * RECORD_SIZE;
+      let yearIndex = buffer[base];
+      let monthIndex = buffer[base + 1];
+      const dayIndex = buffer[base + 2];
+      if (hour >= buffer[base + 3]) {
+        monthIndex = (monthIndex + 1) % 60;
+        if (monthIndex % 12 === YIN) yearIndex = (yearIndex + 1) % 60;
+      }
+      const hourIndex = buffer[HOUR_TABLE_OFFSET + (dayIndex % 10) * 24 + hour];
+      return [yearIndex, monthIndex, dayIndex, hourIndex];
+    }
+  };
+}
+
+function tenGod(dayStem, stem) {
+  const relation = (ELEMENTS.indexOf(STEM_ELEMENTS[stem]) - ELEMENTS.indexOf(STEM_ELEMENTS[dayStem]) + 5) % 5;
+  return TEN_GODS[relation][dayStem % 2 === stem % 2 ? 0 : 1];
+}
+
+function constellation(month, day) {
+  const monthDay = month * 100 + day;
+  let name = '摩羯';
+  for (const [start, candidate] of CONSTELLATIONS) {
+    if (monthDay >= start) name = candidate;
+  }
+  return name;
+}
+
+// MCP get_bazi_details 결과와 같은 키 구성의 사주 정보 (lambda/saju_engine.py bazi_details와 동일)
+export function lookupBazi(table, year, month, day, hour) {
+  const indices = table.lookup(year, month, day, hour);
+  const stems = indices.map((index) => index % 10);
+  const branches = indices.map((index) => index % 12);
+  const dayStem = stems[2];
+
+  const wuxing = Object.fromEntries([...ELEMENTS].map((element) => [element, 0]));
+  stems.forEach((stem) => { wuxing[STEM_ELEMENTS[stem]] += 1; });
+  branches.forEach((branch) => { wuxing[BRANCH_ELEMENTS[branch]] += 1; });
+
+  const tenGods = {
+    年干: tenGod(dayStem, stems[0]),
+    月干: tenGod(dayStem, stems[1]),
+    時干: tenGod(dayStem, stems[3])
+  };
+  ['年支', '月支', '日支', '時支'].forEach((label, i) => {
+    tenGods[label] = tenGod(dayStem, STEMS.indexOf(BRANCH_MAIN_STEMS[branches[i]]));
+  });
+
+  const pillar = (i) => STEMS[stems[i]] + BRANCHES[branches[i]];
+  return {
+    四柱: {
+      年柱: pillar(0),
+      月柱: pillar(1),
+      日柱: pillar(2),
+      時柱: pillar(3)
+    },
+    五行: wuxing,
+    十神: tenGods,
+    節氣: JIE_NAMES[(branches[1] + 10) % 12],
+    生肖: SHENGXIAO[branches[0]],
+    星座: constellation(month, day),
+    日主: STEMS[dayStem]
+  };
+}
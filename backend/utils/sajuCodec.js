@@ -0,0 +1,198 @@
+// 사주 차트 캐시/전송 바이너리 형식 (lambda/saju_codec.py와 동일)
+//
+// [0:3) magic 'SJC'  [3] 버전  [4] 압축 (0 없음, 1 deflate, 2 zstd)  [5:) MessagePack 본문
+// 본문에서는 data.rawData(translatedData.원본데이터를 다시 JSON 문자열로 담은 사본)를 빼고
+// 디코딩 시 원본데이터로 다시 만든다. 'SJC'로 시작하지 않는 값은 기존 JSON으로 읽는다.
+
+import zlib from 'zlib';
+
+export const SAJU_CODEC_MEDIA_TYPE = 'application/x-saju-chart';
+
+const MAGIC = Buffer.from('SJC', 'latin1');
+const VERSION = 1;
+const COMPRESSION = { none: 0, deflate: 1, zstd: 2 };
+
+// 기본 압축 - zstd는 Node 22.15+ (zlib.zstdCompressSync)에서만 사용 가능
+export const SAJU_CODEC_COMPRESSION = resolveCompression(process.env.SAJU_CACHE_COMPRESSION || 'deflate');
+
+function resolveCompression(name) {
+  if (name === 'zstd' && typeof zlib.zstdCompressSync !== 'function') {
+    console.error('zstd를 지원하지 않는 Node 버전입니다. deflate로 대체합니다.');
+    return 'deflate';
+  }
+  if (!(name in COMPRESSION)) {
+    throw new Error(`지원하지 않는 압축 방식입니다: ${name}`);
+  }
+  return name;
+}
+
+// ---- MessagePack (nil/bool/int/float64/str/array/map만 사용) ----
+
+function encodeValue(value, chunks) {
+  if (value === null || value === undefined) {
+    chunks.push(Buffer.from([0xc0]));
+  } else if (value === false || value === true) {
+    chunks.push(Buffer.from([value ? 0xc3 : 0xc2]));
+  } else if (typeof value === 'number') {
+    encodeNumber(value, chunks);
+  } else if (typeof value === 'string') {
+    const bytes = Buffer.from(value, 'utf8');
+    chunks.push(lengthHeader(bytes.length, 0xa0, 31, 0xd9, 0xda, 0xdb), bytes);
+  } else if (Array.isArray(value)) {
+    chunks.push(lengthHeader(value.length, 0x90, 15, null, 0xdc, 0xdd));
+    value.forEach((item) => encodeValue(item, chunks));
+  } else if (typeof value === 'object') {
+    // JSON.stringify와 같이 undefined 값은 생략
+    const entries = Object.entries(value).filter(([, item]) => item !== undefined);
+    chunks.push(lengthHeader(entries.length, 0x80, 15, null, 0xde, 0xdf));
+    entries.forEach(([key, item]) => {
+      encodeValue(key, chunks);
+      encodeValue(item, chunks);
+    });
+  } else {
+    throw new TypeError(`직렬화할 수 없는 값입니다: ${typeof value}`);
+  }
+}
+
+function lengthHeader(length, fixBase, fixMax, code8, code16, code32) {
+  if (length <= fixMax) return Buffer.from([fixBase | length]);
+  if (code8 !== null && length <= 0xff) return Buffer.from([code8, length]);
+  if (length <= 0xffff) {
+    const header = Buffer.alloc(3);
+    header[0] = code16;
+    header.writeUInt16BE(length, 1);
+    return header;
+  }
+  const header = Buffer.alloc(5);
+  header[0] = code32;
+  header.writeUInt32BE(length, 1);
+  return header;
+}
+
+function encodeNumber(value, chunks) {
+  if (Number.isInteger(value) && Math.abs(value) <= Number.MAX_SAFE_INTEGER) {
+    if (value >= 0 && value <= 0x7f) return chunks.push(Buffer.from([value]));
+    if (value < 0 && value >= -32) return chunks.push(Buffer.from([value & 0xff]));
+    const [code, size, writer] =
+      value >= 0
+        ? value <= 0xff ? [0xcc, 1, 'writeUInt8']
+          : value <= 0xffff ? [0xcd, 2, 'writeUInt16BE']
+            : value <= 0xffffffff ? [0xce, 4, 'writeUInt32BE'] : [0xcf, 8, 'writeBigUInt64BE']
+        : value >= -0x80 ? [0xd0, 1, 'writeInt8']
+          : value >= -0x8000 ? [0xd1, 2, 'writeInt16BE']
+            : value >= -0x80000000 ? [0xd2, 4, 'writeInt32BE'] : [0xd3, 8, 'writeBigInt64BE'];
+    const header = Buffer.alloc(1 + size);
+    header[0] = code;
+    header[writer](size === 8 ? BigInt(value) : value, 1);
+    return chunks.push(header);
+  }
+  const header = Buffer.alloc(9);
+  header[0] = 0xcb;
+  header.writeDoubleBE(value, 1);
+  return chunks.push(header);
+}
+
+function decodeValue(buffer, state) {
+  const code = buffer[state.offset++];
+  const read = (size, reader) => {
+    const value = reader.call(buffer, state.offset);
+    state.offset += size;
+    return value;
+  };
+  const str = (length) => {
+    const value = buffer.toString('utf8', state.offset, state.offset + length);
+    state.offset += length;
+    return value;
+  };
+  const array = (length) => Array.from({ length }, () => decodeValue(buffer, state));
+  const map = (length) => {
+    const result = {};
+    for (let i = 0; i < length; i++) {
+      const key = decodeValue(buffer, state);
+      result[key] = decodeValue(buffer, state);
+    }
+    return result;
+  };
+
+  if (code <= 0x7f) return code;
+  if (code >= 0xe0) return code - 0x100;
+  if ((code & 0xf0) === 0x80) return map(code & 0x0f);
+  if ((code & 0xf0) === 0x90) return array(code & 0x0f);
+  if ((code & 0xe0) === 0xa0) return str(code & 0x1f);
+  switch (code) {
+    case 0xc0: return null;
+    case 0xc2: return false;
+    case 0xc3: return true;
+    case 0xca: return read(4, buffer.readFloatBE);
+    case 0xcb: return read(8, buffer.readDoubleBE);
+    case 0xcc: return read(1, buffer.readUInt8);
+    case 0xcd: return read(2, buffer.readUInt16BE);
+    case 0xce: return read(4, buffer.readUInt32BE);
+    case 0xcf: return Number(read(8, buffer.readBigUInt64BE));
+    case 0xd0: return read(1, buffer.readInt8);
+    case 0xd1: return read(2, buffer.readInt16BE);
+    case 0xd2: return read(4, buffer.readInt32BE);
+    case 0xd3: return Number(read(8, buffer.readBigInt64BE));
+    case 0xd9: return str(read(1, buffer.readUInt8));
+    case 0xda: return str(read(2, buffer.readUInt16BE));
+    case 0xdb: return str(read(4, buffer.readUInt32BE));
+    case 0xdc: return array(read(2, buffer.readUInt16BE));
+    case 0xdd: return array(read(4, buffer.readUInt32BE));
+    case 0xde: return map(read(2, buffer.readUInt16BE));
+    case 0xdf: return map(read(4, buffer.readUInt32BE));
+    default: throw new Error(`지원하지 않는 MessagePack 형식입니다: 0x${code.toString(16)}`);
+  }
+}
+
+// ---- 차트 인코딩 ----
+
+// rawData 제거 (원본데이터에서 다시 만들 수 있음)
+function compactChart(chart) {
+  const data = chart?.data;
+  if (!data?.rawData || data.translatedData?.원본데이터 === undefined) return chart;
+  const { rawData, ...rest } = data;
+  return { ...chart, data: rest };
+}
+
+function expandChart(chart) {
+  const data = chart?.data;
+  if (!data || data.rawData || data.translatedData?.원본데이터 === undefined) return chart;
+  return {
+    ...chart,
+    data: {
+      ...data,
+      rawData: {
+        content: [{ type: 'text', text: JSON.stringify(data.translatedData.원본데이터, null, 2) }],
+        isError: false
+      }
+    }
+  };
+}
+
+export function encodeChart(chart, compression = SAJU_CODEC_COMPRESSION) {
+  const chunks = [];
+  encodeValue(compactChart(chart), chunks);
+  let body = Buffer.concat(chunks);
+  if (compression === 'deflate') body = zlib.deflateSync(body);
+  else if (compression === 'zstd') body = zlib.zstdCompressSync(body);
+  return Buffer.concat([MAGIC, Buffer.from([VERSION, COMPRESSION[compression]]), body]);
+}
+
+export function decodeChart(value) {
+  if (value === null || value === undefined) return null;
+  const buffer = Buffer.isBuffer(value) ? value : Buffer.from(value);
+  if (buffer.length < 5 || !buffer.subarray(0, 3).equals(MAGIC)) {
+    // 기존 JSON 형식
+    return JSON.parse(buffer.toString('utf8'));
+  }
+  if (buffer[3] !== VERSION) {
+    throw new Error(`지원하지 않는 차트 형식 버전입니다: ${buffer[3]}`);
+  }
+
+  let body = buffer.subarray(5);
+  if (buffer[4] === COMPRESSION.deflate) body = zlib.inflateSync(body);
+  else if (buffer[4] === COMPRESSION.zstd) body = zlib.zstdDecompressSync(body);
+  else if (buffer[4] !== COMPRESSION.none) throw new Error(`지원하지 않는 압축 방식입니다: ${buffer[4]}`);
+
+  return expandChart(decodeValue(body, { offset: 0 }));
+}
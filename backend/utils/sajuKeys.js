@@ -0,0 +1,51 @@
+// 사주 캐시 키 유틸리티 (lambda/saju_store.py와 같은 형식)
+// 차트: 정규화한 생년월일시 해시 (이름 무관, 같은 입력이면 같은 키)
+// 세션: 사용자 요청마다 발급, 차트 키와 이름을 가리킴
+
+import crypto from 'crypto';
+
+export const CHART_KEY_PREFIX = 'saju:chart:v1:';
+// 로컬 엔진(간지 테이블) 차트 - MCP 결과와 대조되지 않았으므로 MCP 차트 키와 분리
+export const LOCAL_CHART_KEY_PREFIX = 'saju:chart:local:v1:';
+export const SESSION_KEY_PREFIX = 'saju:session:';
+
+const RESPONSE_ONLY_FIELDS = ['cache_key', 'chart_key', 'cached', 'needsRefresh', 'redis_connected'];
+
+// 생년월일시/음력 여부/성별로 결정되는 차트 캐시 키
+export function chartCacheKey({ year, month, day, hour, isLunar, gender }) {
+  const canonical = [
+    parseInt(year, 10),
+    parseInt(month, 10),
+    parseInt(day, 10),
+    parseInt(hour, 10),
+    isLunar ? '1' : '0',
+    (gender || 'male').toLowerCase()
+  ].join('|');
+  return CHART_KEY_PREFIX + crypto.createHash('sha256').update(canonical, 'utf8').digest('hex').slice(0, 32);
+}
+
+// 로컬 엔진 차트 키 - 같은 해시를 로컬 엔진 네임스페이스에 둠
+export function localChartCacheKey(birth) {
+  return LOCAL_CHART_KEY_PREFIX + chartCacheKey(birth).slice(CHART_KEY_PREFIX.length);
+}
+
+// 세션 키 - 요청에 있으면 세션 네임스페이스로 맞추고, 없으면 새로 발급
+export function sessionCacheKey(requested) {
+  if (!requested) return SESSION_KEY_PREFIX + crypto.randomUUID().replace(/-/g, '');
+  return requested.startsWith(SESSION_KEY_PREFIX) ? requested : SESSION_KEY_PREFIX + requested;
+}
+
+// 차트 저장용 사본 - 이름과 응답 전용 필드(키/캐시 상태) 제거
+export function chartRecord(sajuAnalysis) {
+  const record = Object.fromEntries(
+    Object.entries(sajuAnalysis).filter(([key]) => !RESPONSE_ONLY_FIELDS.includes(key))
+  );
+  const { name, ...data } = sajuAnalysis.data || {};
+  record.data = data;
+  return record;
+}
+
+// 차트에 요청자 이름을 붙인 응답용 사본
+export function withName(chart, name) {
+  return { ...chart, data: { ...(chart.data || {}), name: name || '익명' } };
+}
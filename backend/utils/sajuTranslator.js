@@ -87,6 +87,20 @@ const lunarMonthMap = {
   '腊月': '섣달'
 };
 
+// 십신 번역
+const tenGodMap = {
+  '比肩': '비견',
+  '劫财': '겁재',
+  '食神': '식신',
+  '伤官': '상관',
+  '偏财': '편재',
+  '正财': '정재',
+  '七杀': '편관',
+  '正官': '정관',
+  '偏印': '편인',
+  '正印': '정인'
+};
+
 // 천간지지 조합 번역
 function translateGanZhi(ganZhi) {
   if (!ganZhi || ganZhi.length !== 2) return ganZhi;
@@ -132,6 +146,9 @@ export function translateSajuResult(mcpResult) {
         월이름: lunarMonthMap[data.農曆?.農曆月名] || data.農曆?.農曆月名
       },
       일주천간: tianganMap[data.日主] || data.日主,
+      십신: data.十神
+        ? Object.fromEntries(Object.entries(data.十神).map(([key, value]) => [key, tenGodMap[value] || value]))
+        : undefined,
       원본데이터: data
     };
   } catch (error) {
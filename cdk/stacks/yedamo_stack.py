@@ -1,20 +1,123 @@
+import os
+import subprocess
+import sys
+
+import jsii
 from aws_cdk import (
     Stack,
     aws_lambda as _lambda,
     aws_apigateway as apigw,
+    aws_applicationautoscaling as appscaling,
     aws_iam as iam,
     aws_elasticache as elasticache,
     aws_ec2 as ec2,
+    aws_ecs as ecs,
+    aws_ecs_patterns as ecs_patterns,
+    BundlingOptions,
     Duration,
     CfnOutput,
+    ILocalBundling,
 )
 from constructs import Construct
 
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lambda')
+
+# SajuLambda warm 용량 기본값 (cdk deploy -c 키=값으로 변경)
+# - saju_provisioned_concurrency: 평시 provisioned concurrency (0이면 사용 안 함)
+# - saju_peak_concurrency: 오전 트래픽 증가 구간 provisioned concurrency
+# - saju_scale_up_cron / saju_scale_down_cron: 구간 시작/종료 (UTC, 기본 KST 06:45 / 10:30)
+SAJU_CAPACITY_DEFAULTS = {
+    "saju_memory_size": 256,
+    "saju_provisioned_concurrency": 1,
+    "saju_peak_concurrency": 5,
+    "saju_scale_up_cron": "45 21 * * ? *",
+    "saju_scale_down_cron": "30 1 * * ? *",
+}
+
+# Backend 서비스 용량 기본값 (cdk deploy -c 키=값으로 변경)
+# - backend_cpu / backend_memory_mib: Fargate 태스크 크기 (1024 = 1 vCPU, 크레딧 없는 고정 성능)
+# - backend_min_tasks / backend_max_tasks: 태스크 수 범위 (최소 2개로 AZ 장애/배포 중에도 처리)
+# - backend_requests_per_target: 태스크당 분당 요청 수 목표, backend_cpu_target: CPU 사용률 목표(%)
+BACKEND_CAPACITY_DEFAULTS = {
+    "backend_cpu": 1024,
+    "backend_memory_mib": 2048,
+    "backend_min_tasks": 2,
+    "backend_max_tasks": 10,
+    "backend_requests_per_target": 600,
+    "backend_cpu_target": 60,
+}
+
+# Redis 토폴로지 기본값 (cdk deploy -c 키=값으로 변경)
+# - redis_topology: single(노드 1개) / replication(primary + 읽기 복제본, 두 AZ에 분산) /
+#   cluster(클러스터 모드 샤딩, 샤드마다 복제본)
+# - redis_replicas: primary(샤드)당 읽기 복제본 수, redis_shards: cluster 모드 샤드 수
+REDIS_DEFAULTS = {
+    "redis_topology": "single",
+    "redis_node_type": "cache.t3.micro",
+    "redis_replicas": 1,
+    "redis_shards": 2,
+}
+REDIS_TOPOLOGIES = ("single", "replication", "cluster")
+
+# API Gateway 스테이지 캐시 경로별 정책 (cdk deploy -c api_cache=true일 때만, 기본 꺼짐)
+# - ttl: 캐시 유지 초 (0이면 캐시 안 함), -c api_cache_ttl_saju_basic=600처럼 경로별 변경
+# - key_headers: 캐시 키 요청 헤더 {헤더: 필수 여부} - POST 본문은 캐시 키가 될 수 없어
+#   클라이언트가 본문의 정규화 해시(lambda/saju_api.py saju_request_hash)를 헤더로 보내고 Lambda가 검증
+# 이미지 API(cloudformation/image-generator.yaml)는 응답이 캐시 항목 한도(1MB)를 넘을 수 있어 S3 이미지 캐시만 사용
+API_CACHE_POLICIES = {
+    # 응답의 세션 키(cache_key)가 Redis 세션 TTL(1800초) 안에 유효하도록 더 짧게
+    "/saju/basic": {"ttl": 300, "key_headers": {"X-Saju-Request-Hash": True, "Accept-Encoding": False}},
+    # 상담 답변은 세션/질문마다 달라 Lambda의 차트+질문 의도 캐시(Redis)에서만 처리
+    "/saju/consultation": {"ttl": 0},
+}
+API_CACHE_MAX_TTL = 1800
+
+
+@jsii.implements(ILocalBundling)
+class LocalLambdaBundle:
+    """lambda/bundles.py를 로컬 Python으로 실행 (실패하면 Docker 번들링 이미지로 재시도)"""
+
+    def __init__(self, bundle: str):
+        self.bundle = bundle
+
+    def try_bundle(self, output_dir: str, options: BundlingOptions) -> bool:
+        result = subprocess.run([sys.executable, os.path.join(LAMBDA_DIR, 'bundles.py'), self.bundle, output_dir])
+        return result.returncode == 0
+
+
+def lambda_code(bundle: str, slim: bool) -> _lambda.Code:
+    """slim이면 함수별 최소 번들(필요 모듈/의존성 + 미리 컴파일한 바이트코드), 아니면 ../lambda 전체"""
+    if not slim:
+        return _lambda.Code.from_asset("../lambda")
+    return _lambda.Code.from_asset(
+        "../lambda",
+        bundling=BundlingOptions(
+            image=_lambda.Runtime.PYTHON_3_11.bundling_image,
+            command=["bash", "-c", f"python bundles.py {bundle} /asset-output"],
+            local=LocalLambdaBundle(bundle)
+        )
+    )
+
+
+def context_settings(scope, defaults):
+    """기본값 사전의 키마다 cdk context 값(있으면)으로 덮어쓴 설정"""
+    settings = {}
+    for key, default in defaults.items():
+        value = scope.node.try_get_context(key)
+        settings[key] = default if value is None else value
+    return settings
+
 
 class YedamoStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
+        # Lambda 패키징 - cdk deploy -c lambda_bundle=slim이면 함수별 최소 번들 + 표준 라이브러리 HTTP 전송
+        slim_bundle = self.node.try_get_context("lambda_bundle") == "slim"
+        capacity = context_settings(self, SAJU_CAPACITY_DEFAULTS)
+        backend = context_settings(self, BACKEND_CAPACITY_DEFAULTS)
+        redis_settings = context_settings(self, REDIS_DEFAULTS)
+
         # VPC 생성
         vpc = ec2.Vpc(
             self, "YedamoVpc",
@@ -49,33 +152,78 @@ class YedamoStack(Stack):
             allow_all_outbound=False
         )
 
-        # ElastiCache Redis 클러스터
-        redis_cluster = elasticache.CfnCacheCluster(
-            self, "YedamoRedisCluster",
-            cache_node_type="cache.t3.micro",
-            engine="redis",
-            num_cache_nodes=1,
-            cache_subnet_group_name=cache_subnet_group.ref,
-            vpc_security_group_ids=[cache_security_group.security_group_id]
-        )
+        # ElastiCache Redis - 쓰기는 primary(또는 클러스터 구성 엔드포인트), 읽기는 복제본
+        redis_topology = redis_settings["redis_topology"]
+        redis_node_type = redis_settings["redis_node_type"]
+        redis_replicas = int(redis_settings["redis_replicas"])
+        if redis_topology not in REDIS_TOPOLOGIES:
+            raise ValueError(f"지원하지 않는 redis_topology입니다: {redis_topology} (사용 가능: {', '.join(REDIS_TOPOLOGIES)})")
+        if redis_topology != "single" and redis_replicas < 1:
+            raise ValueError(f"{redis_topology} 토폴로지는 읽기 복제본이 1개 이상 필요합니다")
+
+        redis_reader_host = None
+        redis_cluster_mode = redis_topology == "cluster"
+        if redis_topology == "single":
+            redis_cluster = elasticache.CfnCacheCluster(
+                self, "YedamoRedisCluster",
+                cache_node_type=redis_node_type,
+                engine="redis",
+                num_cache_nodes=1,
+                cache_subnet_group_name=cache_subnet_group.ref,
+                vpc_security_group_ids=[cache_security_group.security_group_id]
+            )
+            redis_host = redis_cluster.attr_redis_endpoint_address
+        else:
+            # 노드를 두 AZ에 번갈아 배치 (primary 장애 시 다른 AZ 복제본으로 자동 승격)
+            zones = [subnet.availability_zone for subnet in vpc.private_subnets]
+            replication_options = {}
+            if redis_cluster_mode:
+                shards = int(redis_settings["redis_shards"])
+                replication_options["cache_parameter_group_name"] = "default.redis7.cluster.on"
+                replication_options["num_node_groups"] = shards
+                replication_options["node_group_configuration"] = [
+                    elasticache.CfnReplicationGroup.NodeGroupConfigurationProperty(
+                        primary_availability_zone=zones[shard % len(zones)],
+                        replica_availability_zones=[zones[(shard + i + 1) % len(zones)]
+                                                    for i in range(redis_replicas)],
+                        replica_count=redis_replicas
+                    )
+                    for shard in range(shards)
+                ]
+            else:
+                replication_options["replicas_per_node_group"] = redis_replicas
+                replication_options["preferred_cache_cluster_a_zs"] = [
+                    zones[i % len(zones)] for i in range(redis_replicas + 1)]
+
+            redis_cluster = elasticache.CfnReplicationGroup(
+                self, "YedamoRedisReplicationGroup",
+                replication_group_description="Yedamo saju cache",
+                engine="redis",
+                engine_version="7.1",
+                cache_node_type=redis_node_type,
+                automatic_failover_enabled=True,
+                multi_az_enabled=True,
+                cache_subnet_group_name=cache_subnet_group.ref,
+                security_group_ids=[cache_security_group.security_group_id],
+                **replication_options
+            )
+            if redis_cluster_mode:
+                redis_host = redis_cluster.attr_configuration_end_point_address
+            else:
+                redis_host = redis_cluster.attr_primary_end_point_address
+                redis_reader_host = redis_cluster.attr_reader_end_point_address
+
+        redis_environment = {"REDIS_HOST": redis_host, "REDIS_PORT": "6379"}
+        if redis_reader_host:
+            redis_environment["REDIS_READER_HOST"] = redis_reader_host
+        if redis_cluster_mode:
+            redis_environment["REDIS_CLUSTER_MODE"] = "true"
 
-        # Backend EC2 보안 그룹
+        # Backend 태스크 보안 그룹 (내부 ALB에서만 3001 접근)
         backend_security_group = ec2.SecurityGroup(
             self, "YedamoBackendSecurityGroup",
             vpc=vpc,
-            description="Security group for Backend EC2"
-        )
-
-        # HTTP 및 SSH 접근 허용
-        backend_security_group.add_ingress_rule(
-            peer=ec2.Peer.any_ipv4(),
-            connection=ec2.Port.tcp(3001),
-            description="HTTP access to backend"
-        )
-        backend_security_group.add_ingress_rule(
-            peer=ec2.Peer.any_ipv4(),
-            connection=ec2.Port.tcp(22),
-            description="SSH access"
+            description="Security group for Backend tasks"
         )
 
         # Backend에서 Redis 접근 허용
@@ -85,13 +233,10 @@ class YedamoStack(Stack):
             description="Allow backend to access Redis"
         )
 
-        # Backend EC2 IAM 역할 (Bedrock 권한 포함)
+        # Backend 태스크 IAM 역할 (Bedrock 권한 포함)
         backend_role = iam.Role(
             self, "YedamoBackendRole",
-            assumed_by=iam.ServicePrincipal("ec2.amazonaws.com"),
-            managed_policies=[
-                iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSSMManagedInstanceCore")
-            ],
+            assumed_by=iam.ServicePrincipal("ecs-tasks.amazonaws.com"),
             inline_policies={
                 "BedrockAccess": iam.PolicyDocument(
                     statements=[
@@ -108,58 +253,59 @@ class YedamoStack(Stack):
             }
         )
 
-        # Backend EC2 인스턴스 프로파일
-        backend_instance_profile = iam.InstanceProfile(
-            self, "YedamoBackendInstanceProfile",
-            role=backend_role
+        # Backend 서비스 (Node.js + Bedrock + MCP) - backend/Dockerfile 이미지를 Fargate 태스크로 실행
+        # NAT 게이트웨이가 없으므로 태스크는 퍼블릭 서브넷 + 퍼블릭 IP로 이미지/MCP 패키지/Bedrock에 접근
+        backend_cluster = ecs.Cluster(self, "YedamoBackendCluster", vpc=vpc)
+        backend_service = ecs_patterns.ApplicationLoadBalancedFargateService(
+            self, "YedamoBackendService",
+            cluster=backend_cluster,
+            cpu=int(backend["backend_cpu"]),
+            memory_limit_mib=int(backend["backend_memory_mib"]),
+            desired_count=int(backend["backend_min_tasks"]),
+            public_load_balancer=False,
+            open_listener=False,
+            listener_port=80,
+            task_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PUBLIC),
+            assign_public_ip=True,
+            security_groups=[backend_security_group],
+            circuit_breaker=ecs.DeploymentCircuitBreaker(rollback=True),
+            task_image_options=ecs_patterns.ApplicationLoadBalancedTaskImageOptions(
+                image=ecs.ContainerImage.from_asset("../backend"),
+                container_port=3001,
+                task_role=backend_role,
+                environment={
+                    "NODE_ENV": "production",
+                    "PORT": "3001",
+                    **redis_environment,
+                    "AWS_REGION": self.region
+                },
+                log_driver=ecs.LogDrivers.aws_logs(stream_prefix="backend")
+            )
         )
 
-        # Backend EC2 인스턴스 (Node.js + Bedrock + MCP)
-        backend_instance = ec2.Instance(
-            self, "YedamoBackendInstance",
-            instance_type=ec2.InstanceType.of(
-                ec2.InstanceClass.T3, ec2.InstanceSize.SMALL),
-            machine_image=ec2.AmazonLinuxImage(
-                generation=ec2.AmazonLinuxGeneration.AMAZON_LINUX_2),
-            vpc=vpc,
-            vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PUBLIC),
-            security_group=backend_security_group,
-            key_name="yedamo-key-pair",
-            role=backend_role,
-            user_data=ec2.UserData.custom(
-                "#!/bin/bash\n"
-                "yum update -y\n"
-                "yum install -y git aws-cli\n"
-                
-                # Node.js 18 설치
-                "curl -fsSL https://rpm.nodesource.com/setup_18.x | bash -\n"
-                "yum install -y nodejs\n"
-                "npm install -g pm2\n"
-                
-                # 환경변수 설정
-                f"echo 'export REDIS_HOST={redis_cluster.attr_redis_endpoint_address}' >> /home/ec2-user/.bashrc\n"
-                "echo 'export REDIS_PORT=6379' >> /home/ec2-user/.bashrc\n"
-                "echo 'export AWS_REGION=us-east-1' >> /home/ec2-user/.bashrc\n"
-                "echo 'export PORT=3001' >> /home/ec2-user/.bashrc\n"
-                
-                # 백엔드 시작 스크립트 생성 (MCP 지원)
-                "cat > /home/ec2-user/start-backend.sh << 'EOF'\n"
-                "#!/bin/bash\n"
-                "cd /home/ec2-user/yedamo-aws-hackathon/backend\n"
-                f"export REDIS_HOST={redis_cluster.attr_redis_endpoint_address}\n"
-                "export REDIS_PORT=6379\n"
-                "export AWS_REGION=us-east-1\n"
-                "export PORT=3001\n"
-                "npm install\n"
-                "pm2 start server.js --name yedamo-backend\n"
-                "pm2 save\n"
-                "pm2 startup\n"
-                "EOF\n"
-                "chmod +x /home/ec2-user/start-backend.sh\n"
-                "chown ec2-user:ec2-user /home/ec2-user/start-backend.sh\n"
-                
-                "echo 'Backend setup completed with Bedrock IAM role. Run start-backend.sh after git clone.' > /home/ec2-user/backend-ready.txt\n"
-            )
+        # ALB 헬스 체크 - 비정상 태스크는 교체, 배포 시 연결 정리 대기 단축
+        backend_service.target_group.configure_health_check(
+            path="/health",
+            healthy_http_codes="200",
+            interval=Duration.seconds(15),
+            healthy_threshold_count=2,
+            unhealthy_threshold_count=3
+        )
+        backend_service.target_group.set_attribute("deregistration_delay.timeout_seconds", "30")
+
+        # 태스크 수 자동 조정 - 대상당 요청 수와 CPU 중 더 많이 필요한 쪽을 따름
+        backend_scaling = backend_service.service.auto_scale_task_count(
+            min_capacity=int(backend["backend_min_tasks"]),
+            max_capacity=int(backend["backend_max_tasks"])
+        )
+        backend_scaling.scale_on_request_count(
+            "BackendRequestScaling",
+            requests_per_target=int(backend["backend_requests_per_target"]),
+            target_group=backend_service.target_group
+        )
+        backend_scaling.scale_on_cpu_utilization(
+            "BackendCpuScaling",
+            target_utilization_percent=int(backend["backend_cpu_target"])
         )
 
         # Lambda 역할 (프록시용)
@@ -168,49 +314,161 @@ class YedamoStack(Stack):
             assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
             managed_policies=[
                 iam.ManagedPolicy.from_aws_managed_policy_name(
-                    "service-role/AWSLambdaBasicExecutionRole")
+                    "service-role/AWSLambdaBasicExecutionRole"),
+                # VPC 연결 (ENI 생성/삭제)
+                iam.ManagedPolicy.from_aws_managed_policy_name(
+                    "service-role/AWSLambdaVPCAccessExecutionRole")
             ]
         )
 
+        # Lambda 보안 그룹 - Lambda는 VPC 프라이빗 서브넷에서 내부 ALB와 Redis로만 연결 (인터넷 경유 없음)
+        lambda_security_group = ec2.SecurityGroup(
+            self, "YedamoLambdaSecurityGroup",
+            vpc=vpc,
+            description="Security group for Saju Lambda"
+        )
+        backend_service.load_balancer.connections.allow_from(
+            lambda_security_group,
+            ec2.Port.tcp(80),
+            "Allow saju Lambda to reach backend load balancer"
+        )
+        # Lambda가 Redis 차트를 직접 조회/세션 저장 (캐시 적중 시 Backend 홉 생략)
+        cache_security_group.add_ingress_rule(
+            peer=lambda_security_group,
+            connection=ec2.Port.tcp(6379),
+            description="Allow saju Lambda to access Redis"
+        )
+
         # Lambda 함수 (프록시만)
         saju_lambda = _lambda.Function(
             self, "SajuLambda",
             runtime=_lambda.Runtime.PYTHON_3_11,
             handler="index.handler",
-            code=_lambda.Code.from_asset("../lambda"),
+            code=lambda_code("saju", slim_bundle),
             role=lambda_role,
             timeout=Duration.seconds(60),  # API Gateway 504 오류 방지
-            memory_size=256,
+            memory_size=int(capacity["saju_memory_size"]),
+            vpc=vpc,
+            vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+            security_groups=[lambda_security_group],
             environment={
-                "BACKEND_URL": f"http://{backend_instance.instance_public_ip}:3001"
+                "BACKEND_URL": f"http://{backend_service.load_balancer.load_balancer_dns_name}",
+                **redis_environment,
+                # 최소 번들에는 requests가 없으므로 http.client 전송 사용
+                "BACKEND_TRANSPORT": "http.client" if slim_bundle else "requests"
             }
         )
 
+        # 버전 고정 별칭 - API Gateway는 별칭을 호출하고 provisioned concurrency도 별칭에 할당
+        # (init 단계에서 index.prewarm()이 간지 테이블/Backend·Redis 연결을 미리 준비)
+        provisioned = int(capacity["saju_provisioned_concurrency"])
+        peak = max(int(capacity["saju_peak_concurrency"]), provisioned)
+        saju_alias = _lambda.Alias(
+            self, "SajuLambdaLive",
+            alias_name="live",
+            version=saju_lambda.current_version,
+            provisioned_concurrent_executions=provisioned or None
+        )
+
+        # 오전 트래픽 증가 구간 예약 확장 + 구간 내 사용률 기반 조정
+        if provisioned:
+            saju_scaling = saju_alias.add_auto_scaling(min_capacity=provisioned, max_capacity=peak)
+            saju_scaling.scale_on_utilization(utilization_target=0.7)
+            saju_scaling.scale_on_schedule(
+                "SajuMorningRampUp",
+                schedule=appscaling.Schedule.expression(f"cron({capacity['saju_scale_up_cron']})"),
+                min_capacity=peak
+            )
+            saju_scaling.scale_on_schedule(
+                "SajuMorningRampDown",
+                schedule=appscaling.Schedule.expression(f"cron({capacity['saju_scale_down_cron']})"),
+                min_capacity=provisioned
+            )
+
+        # API Gateway 스테이지 캐시 - 켜면 경로별 정책을 메서드 설정으로 적용
+        api_cache = str(self.node.try_get_context("api_cache")).lower() == "true"
+        cache_ttls = {}
+        for path, policy in API_CACHE_POLICIES.items():
+            value = self.node.try_get_context("api_cache_ttl" + path.replace("/", "_"))
+            cache_ttls[path] = int(policy["ttl"] if value is None else value)
+            if not 0 <= cache_ttls[path] <= API_CACHE_MAX_TTL:
+                raise ValueError(f"{path} 캐시 TTL은 0-{API_CACHE_MAX_TTL}초여야 합니다: {cache_ttls[path]}")
+
+        deploy_options = None
+        if api_cache:
+            deploy_options = apigw.StageOptions(
+                stage_name="prod",
+                cache_cluster_enabled=True,
+                cache_cluster_size=str(self.node.try_get_context("api_cache_size") or "0.5"),
+                method_options={
+                    f"{path}/POST": apigw.MethodDeploymentOptions(
+                        caching_enabled=ttl > 0,
+                        cache_ttl=Duration.seconds(ttl) if ttl else None,
+                        cache_data_encrypted=True if ttl else None
+                    )
+                    for path, ttl in cache_ttls.items()
+                }
+            )
+
         # API Gateway
         api = apigw.RestApi(
             self, "YedamoApi",
             rest_api_name="Yedamo Saju Service",
             description="AI 사주 상담 서비스",
+            # /saju/basic의 gzip/br 압축 응답(isBase64Encoded)을 바이트 그대로 전달 - 응답 변환은 요청
+            # Accept 헤더 기준이라 특정 타입으로 좁힐 수 없음 (JSON 요청 본문도 base64로 전달되며
+            # Lambda handler의 request_body가 복원, CORS 프리플라이트는 아래에서 텍스트 변환)
+            binary_media_types=["*/*"],
+            deploy_options=deploy_options,
             default_cors_preflight_options=apigw.CorsOptions(
                 allow_origins=apigw.Cors.ALL_ORIGINS,
                 allow_methods=apigw.Cors.ALL_METHODS,
-                allow_headers=["Content-Type", "Authorization"]
+                allow_headers=["Content-Type", "Authorization", "X-Saju-Request-Hash"]
             )
         )
 
         # API 리소스
         saju_resource = api.root.add_resource("saju")
-        lambda_integration = apigw.LambdaIntegration(saju_lambda)
-        
+        lambda_integration = apigw.LambdaIntegration(saju_alias)
+        cache_key_validator = api.add_request_validator(
+            "CacheKeyValidator", validate_request_parameters=True) if api_cache else None
+
+        def add_post_method(resource, path):
+            """캐시하는 경로는 캐시 키 헤더를 메서드 요청 파라미터로 선언 (필수 헤더 없으면 400)"""
+            key_headers = API_CACHE_POLICIES[path].get("key_headers") if api_cache and cache_ttls[path] else None
+            if not key_headers:
+                return resource.add_method("POST", lambda_integration)
+
+            parameters = {f"method.request.header.{header}": required for header, required in key_headers.items()}
+            return resource.add_method(
+                "POST",
+                apigw.LambdaIntegration(saju_alias, cache_key_parameters=list(parameters)),
+                request_parameters=parameters,
+                request_validator=cache_key_validator
+            )
+
         # 모든 요청을 Lambda로 (Lambda가 EC2로 프록시)
         basic_resource = saju_resource.add_resource("basic")
-        basic_resource.add_method("POST", lambda_integration)
+        add_post_method(basic_resource, "/saju/basic")
         
         consultation_resource = saju_resource.add_resource("consultation")
-        consultation_resource.add_method("POST", lambda_integration)
+        add_post_method(consultation_resource, "/saju/consultation")
+
+        # 스트리밍 상담(SSE)은 API Gateway REST + Lambda 프록시가 응답을 버퍼링하므로 제공하지 않음
+        # (ASGI 서버 lambda/asgi_app.py 또는 Backend /saju/consultation/stream을 직접 사용)
+
+        # binary_media_types="*/*"에서는 본문 없는 프리플라이트도 바이너리로 취급되어 MOCK 요청 템플릿이
+        # 적용되지 않으므로, OPTIONS 통합은 텍스트로 변환해 처리
+        for method in api.methods:
+            if method.http_method == "OPTIONS":
+                method.node.default_child.add_property_override(
+                    "Integration.ContentHandling", "CONVERT_TO_TEXT")
 
         # 출력
         CfnOutput(self, "ApiGatewayUrl", value=api.url)
-        CfnOutput(self, "RedisHost", value=redis_cluster.attr_redis_endpoint_address)
-        CfnOutput(self, "BackendUrl", value=f"http://{backend_instance.instance_public_ip}:3001")
-        CfnOutput(self, "BackendPublicIP", value=backend_instance.instance_public_ip)
+        CfnOutput(self, "SajuLambdaAlias", value=saju_alias.function_arn)
+        CfnOutput(self, "RedisHost", value=redis_host)
+        if redis_reader_host:
+            CfnOutput(self, "RedisReaderHost", value=redis_reader_host)
+        CfnOutput(self, "BackendUrl", value=f"http://{backend_service.load_balancer.load_balancer_dns_name}")
+        CfnOutput(self, "BackendService", value=backend_service.service.service_name)
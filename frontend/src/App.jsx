@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import apiClient from './api/client'
+import { requestBasicSaju } from './api/client'
 import PersonalInfoForm from './components/PersonalInfoForm'
 import SajuResult from './components/SajuResult'
 import ChatInterface from './components/ChatInterface'
@@ -28,7 +28,7 @@ function App() {
         }
       }
 
-      const response = await apiClient.post('/saju/basic', requestData)
+      const response = await requestBasicSaju(requestData)
 
       setPersonalInfo(info)
       setSajuData(response.data.saju_analysis)
@@ -7,4 +7,84 @@ const apiClient = axios.create({
   }
 })
 
-export default apiClient
\ No newline at end of file
+export default apiClient
+
+// 스트리밍 상담 서버 (ASGI 서버 또는 Backend) - API Gateway는 SSE를 버퍼링하므로 설정된 경우만 스트리밍
+const STREAM_BASE_URL = import.meta.env.VITE_STREAM_API_URL || ''
+export const streamingAvailable = Boolean(STREAM_BASE_URL)
+
+// lambda/saju_api.py saju_request_hash와 같은 정규화 - API Gateway 캐시 키로 쓰이는 요청 해시
+export async function sajuRequestHash(requestData) {
+  const birth = requestData.birth_info || {}
+  const fields = typeof requestData.fields === 'string'
+    ? requestData.fields.split(',').map((field) => field.trim()).filter(Boolean)
+    : requestData.fields || []
+  const canonical = JSON.stringify([
+    Math.trunc(Number(birth.year)),
+    Math.trunc(Number(birth.month)),
+    Math.trunc(Number(birth.day)),
+    Math.trunc(Number(birth.hour)),
+    Boolean(birth.isLunar),
+    (birth.gender || 'male').toLowerCase(),
+    String(birth.region || ''),
+    requestData.name ?? '',
+    [...fields].sort(),
+    ['true', '1', 'yes'].includes(String(requestData.debug ?? '').toLowerCase())
+  ])
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(canonical))
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('').slice(0, 32)
+}
+
+// 기본 사주 요청 - 같은 입력은 API Gateway 캐시에서 응답 (캐시 사용 시 해시 헤더 필수)
+export async function requestBasicSaju(requestData) {
+  return apiClient.post('/saju/basic', requestData, {
+    headers: { 'X-Saju-Request-Hash': await sajuRequestHash(requestData) }
+  })
+}
+
+// SSE 메시지 블록("event: ...\ndata: ...") 파싱
+function parseServerEvent(block) {
+  let type = 'message'
+  const data = []
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) type = line.slice(6).trim()
+    else if (line.startsWith('data:')) data.push(line.slice(5).trim())
+  }
+  return { type, data: data.length ? JSON.parse(data.join('\n')) : null }
+}
+
+// 상담 스트리밍 요청 - delta 이벤트마다 onDelta 호출, 완료(done) 이벤트 데이터 반환
+export async function streamConsultation(requestData, onDelta) {
+  const response = await fetch(`${STREAM_BASE_URL}/saju/consultation/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify(requestData)
+  })
+  if (!response.ok || !response.body) {
+    throw new Error(`스트리밍 상담 요청 실패: ${response.status}`)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  let result = null
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, '\n')
+
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const event = parseServerEvent(buffer.slice(0, boundary))
+      buffer = buffer.slice(boundary + 2)
+      if (event.type === 'delta') onDelta(event.data.text)
+      else if (event.type === 'done') result = event.data
+      else if (event.type === 'error') throw new Error(event.data.error)
+    }
+  }
+
+  if (!result) {
+    throw new Error('스트리밍 상담 응답이 완료되지 않았습니다.')
+  }
+  return result
+}
\ No newline at end of file
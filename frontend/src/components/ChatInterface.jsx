@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import apiClient from '../api/client'
+import apiClient, { streamConsultation, streamingAvailable } from '../api/client'
 
 function ChatInterface({ personalInfo, sajuData, cacheKey, onGoHome }) {
   const [messages, setMessages] = useState([
@@ -21,17 +21,46 @@ function ChatInterface({ personalInfo, sajuData, cacheKey, onGoHome }) {
     setInputMessage('')
     setIsLoading(true)
 
+    const requestData = {
+      cache_key: cacheKey,
+      question: currentQuestion
+    }
+    let streamed = ''
+
+    // 스트리밍 중인 AI 답변(마지막 메시지) 갱신
+    const updateAiMessage = (content) => {
+      setMessages(prev => {
+        const last = prev[prev.length - 1]
+        if (last && last.type === 'ai' && last.streaming) {
+          return [...prev.slice(0, -1), { ...last, content }]
+        }
+        return [...prev, { type: 'ai', content, streaming: true }]
+      })
+    }
+
     try {
-      const requestData = {
-        cache_key: cacheKey,
-        question: currentQuestion
+      // 스트리밍 서버가 없으면(API Gateway만 사용) 바로 일반 상담 요청
+      if (streamingAvailable) {
+        try {
+          await streamConsultation(requestData, (text) => {
+            streamed += text
+            setIsLoading(false)
+            updateAiMessage(streamed)
+          })
+          setMessages(prev => prev.map(message => (message.streaming ? { ...message, streaming: false } : message)))
+          return
+        } catch (streamError) {
+          // 답변 일부를 이미 보여줬다면 일반 요청으로 다시 받지 않음
+          if (streamed) throw streamError
+          console.warn('스트리밍 상담 실패, 일반 요청으로 재시도:', streamError)
+        }
       }
 
       const response = await apiClient.post('/saju/consultation', requestData)
 
       const aiResponse = {
         type: 'ai',
-        content: response.data.answer || response.data.message || '답변을 받지 못했습니다.'
+        content: response.data.consultation || response.data.answer || response.data.message || '답변을 받지 못했습니다.'
       }
       setMessages(prev => [...prev, aiResponse])
     } catch (error) {
@@ -0,0 +1,302 @@
+"""
+프록시 계층 자체 호스팅용 ASGI 서버
+
+사주 API(saju_api.py)와 이미지 API(image_generator.py)의 로직을 API Gateway 이벤트 변환 없이
+직접 서빙한다. Backend 프록시는 비동기 HTTP 클라이언트, boto3/Pillow 작업은 스레드 풀에서 실행.
+
+실행:
+    pip install -r requirements_server.txt
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8080 --workers 4
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from async_image_service import AsyncImageService
+from image_cache import S3ImageCache
+from image_generator import (
+    ImageGenerationError, ImageRequestError, binary_image_headers, image_body,
+    iter_batch_results, negotiate_format, prepare_batch, prepare_image_request,
+    render_batch_result
+)
+from index import BACKEND_CONNECT_TIMEOUT, BACKEND_MAX_RETRIES, BACKEND_READ_TIMEOUT, BACKEND_URL
+from saju_api import (
+    BACKEND_CONNECT_FAILED, BACKEND_SAJU_HEADERS, BACKEND_SERVER_FAILED, SAJU_EXPOSE_HEADERS,
+    SAJU_REQUEST_HASH_HEADER, SajuApiError, backend_saju_data, error_body, find_saju_data,
+    prepare_basic_request, render_basic_saju, saju_cache
+)
+from saju_bulk import INPUT_COLUMNS, compute_birth_columns
+
+# 워커 프로세스당 Backend 커넥션 풀 크기 (Lambda보다 동시 요청이 훨씬 많음)
+SERVER_BACKEND_POOL_SIZE = int(os.environ.get('SERVER_BACKEND_POOL_SIZE', '100'))
+
+NDJSON = 'application/x-ndjson'
+
+# /saju/bulk 요청당 최대 행 수 (더 큰 코호트는 saju_bulk.py CLI 사용)
+SAJU_BULK_MAX_ROWS = int(os.environ.get('SAJU_BULK_MAX_ROWS', '100000'))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워커 프로세스마다 커넥션 풀과 이미지 스레드 풀을 한 번만 생성
+    transport = httpx.AsyncHTTPTransport(
+        retries=BACKEND_MAX_RETRIES,
+        limits=httpx.Limits(
+            max_connections=SERVER_BACKEND_POOL_SIZE,
+            max_keepalive_connections=SERVER_BACKEND_POOL_SIZE
+        )
+    )
+    app.state.backend = httpx.AsyncClient(
+        base_url=BACKEND_URL,
+        transport=transport,
+        timeout=httpx.Timeout(BACKEND_READ_TIMEOUT, connect=BACKEND_CONNECT_TIMEOUT)
+    )
+    app.state.images = AsyncImageService()
+    try:
+        yield
+    finally:
+        await app.state.backend.aclose()
+        app.state.images.close()
+
+
+app = FastAPI(title='yedamo proxy', lifespan=lifespan)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=['*'],
+    allow_methods=['GET', 'POST', 'OPTIONS'],
+    allow_headers=['Content-Type', 'Authorization', 'Accept', 'If-None-Match', SAJU_REQUEST_HASH_HEADER],
+    expose_headers=['ETag', 'X-Image-Cache', *SAJU_EXPOSE_HEADERS]
+)
+
+
+async def read_json(request: Request) -> Dict[str, Any]:
+    """요청 본문 파싱 (본문이 없으면 빈 객체)"""
+    return json.loads(await request.body() or b'{}')
+
+
+@app.post('/saju/basic')
+async def saju_basic(request: Request):
+    """기본 사주 정보 - warm 캐시/Redis/로컬 엔진 우선, 미스 시 Backend 비동기 호출"""
+    try:
+        saju_request = prepare_basic_request(await read_json(request),
+                                             request.headers.get(SAJU_REQUEST_HASH_HEADER, ''))
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+    def respond(data, cache_status):
+        content, headers = render_basic_saju(saju_request, data, cache_status,
+                                             request.headers.get('accept-encoding', ''))
+        return Response(content, headers=headers)
+
+    # 세션/차트 Redis 저장·조회가 블로킹 호출이므로 스레드에서 실행
+    found = await run_in_threadpool(find_saju_data, saju_request)
+    if found is not None:
+        return respond(*found)
+
+    try:
+        response = await request.app.state.backend.post('/saju/basic', json=saju_request['backend_payload'],
+                                                     headers=BACKEND_SAJU_HEADERS)
+    except httpx.HTTPError as e:
+        return JSONResponse(error_body(BACKEND_SERVER_FAILED, e), status_code=500)
+
+    try:
+        backend_data = backend_saju_data(saju_request, response.status_code, response.headers.get('Content-Type'),
+                                         response.content, response.text)
+    except SajuApiError as e:
+        return JSONResponse({'error': str(e)}, status_code=500)
+    return respond(backend_data, 'MISS')
+
+
+@app.post('/saju/bulk')
+async def saju_bulk(request: Request):
+    """대량 사주 계산 - birth_info 배열을 받아 열 단위(년주/월주/일주/시주, 오행 개수) 결과 반환"""
+    try:
+        body = await read_json(request)
+    except ValueError:
+        return JSONResponse({'error': '요청 본문이 올바른 JSON이 아닙니다.'}, status_code=400)
+    rows = body.get('birth_infos') if isinstance(body, dict) else None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return JSONResponse({'error': 'birth_infos 배열이 필요합니다.'}, status_code=400)
+    if len(rows) > SAJU_BULK_MAX_ROWS:
+        return JSONResponse({'error': f'birth_infos는 최대 {SAJU_BULK_MAX_ROWS}건입니다.'}, status_code=413)
+
+    columns = {name: [row.get(name) for row in rows] for name in INPUT_COLUMNS}
+    columns['isLunar'] = [row.get('isLunar', False) for row in rows]
+    result = await run_in_threadpool(compute_birth_columns, columns)
+    return JSONResponse({
+        'success': True,
+        'count': len(rows),
+        'columns': {name: values.tolist() for name, values in result.items()}
+    })
+
+
+@app.post('/saju/consultation')
+async def saju_consultation(request: Request):
+    """상담 API - 요청/응답 본문을 다시 직렬화하지 않고 Backend로 그대로 전달"""
+    try:
+        response = await request.app.state.backend.post(
+            '/saju/consultation',
+            content=await request.body(),
+            headers={'Content-Type': 'application/json'}
+        )
+    except httpx.HTTPError as e:
+        return JSONResponse(error_body(BACKEND_CONNECT_FAILED, e), status_code=500)
+
+    return Response(response.content, status_code=response.status_code, media_type='application/json')
+
+
+@app.post('/saju/consultation/stream')
+async def saju_consultation_stream(request: Request):
+    """스트리밍 상담 API - Backend SSE 이벤트를 도착하는 즉시 클라이언트로 전달"""
+    backend: httpx.AsyncClient = request.app.state.backend
+    try:
+        upstream = await backend.send(
+            backend.build_request(
+                'POST', '/saju/consultation/stream',
+                content=await request.body(),
+                headers={'Content-Type': 'application/json', 'Accept': 'text/event-stream'}
+            ),
+            stream=True
+        )
+    except httpx.HTTPError as e:
+        return JSONResponse(error_body(BACKEND_CONNECT_FAILED, e), status_code=500)
+
+    if upstream.status_code != 200:
+        # 검증 오류 등은 스트림이 아닌 JSON 응답
+        content = await upstream.aread()
+        await upstream.aclose()
+        return Response(content, status_code=upstream.status_code,
+                        media_type=upstream.headers.get('content-type', 'application/json'))
+
+    async def relay() -> AsyncIterator[bytes]:
+        # 클라이언트가 끊기면 upstream을 닫아 Backend의 Bedrock 스트림도 중단
+        try:
+            async for chunk in upstream.aiter_raw():
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(relay(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.post('/image')
+async def generate_image(request: Request):
+    """단건 이미지 생성 - 동일 요청은 진행 중인 생성을 공유, 형식은 ?format= / Accept로 결정"""
+    images_service: AsyncImageService = request.app.state.images
+    try:
+        prepared = prepare_image_request(await read_json(request), request.query_params)
+    except ImageRequestError as e:
+        return JSONResponse(e.payload, status_code=e.status_code)
+    except Exception as e:
+        return JSONResponse({'error': f'서버 오류: {str(e)}'}, status_code=500)
+
+    response_format = negotiate_format(request.query_params.get('format'), request.headers.get('accept'))
+    etag = prepared['etag']
+    if response_format == 'binary' and request.headers.get('if-none-match', '').strip('"') == etag:
+        return Response(status_code=304, headers={'ETag': f'"{etag}"'})
+
+    try:
+        images, status = await images_service.load(prepared)
+        if response_format == 'binary':
+            first = images[0]
+            return Response(first['data'], headers=binary_image_headers(first, status))
+        # format=url은 S3 업로드/서명이 필요하므로 스레드 풀에서 생성
+        body = await images_service.run(image_body, response_format, prepared['metadata'],
+                                        images, status, prepared['cache_key'])
+    except ImageRequestError as e:
+        return JSONResponse(e.payload, status_code=e.status_code)
+    except ImageGenerationError as e:
+        return JSONResponse({'error': '이미지 생성에 실패했습니다.', 'details': e.details}, status_code=500)
+    except Exception as e:
+        return JSONResponse({'error': f'서버 오류: {str(e)}'}, status_code=500)
+    return JSONResponse(body)
+
+
+@app.post('/image/batch')
+async def generate_image_batch(request: Request):
+    """배치 이미지 생성 - Accept: application/x-ndjson이면 완료되는 순서대로 한 줄씩 전송"""
+    images_service: AsyncImageService = request.app.state.images
+    accept = request.headers.get('accept', '')
+    use_url = negotiate_format(request.query_params.get('format'), accept) == 'url'
+    try:
+        specs, store = prepare_batch(await read_json(request), use_url)
+    except ImageRequestError as e:
+        return JSONResponse(e.payload, status_code=e.status_code)
+    except Exception as e:
+        return JSONResponse({'error': f'서버 오류: {str(e)}'}, status_code=500)
+
+    if NDJSON in accept:
+        return StreamingResponse(stream_batch(images_service, specs, store), media_type=NDJSON)
+
+    def collect() -> List[Dict[str, Any]]:
+        return [render_batch_result(result, store) for result in iter_batch_results(specs)]
+
+    try:
+        results = await images_service.run(collect)
+    except Exception as e:
+        return JSONResponse({'error': f'서버 오류: {str(e)}'}, status_code=500)
+    return JSONResponse({
+        'success': all(result['success'] for result in results),
+        'count': len(results),
+        'format': 'url' if use_url else 'base64',
+        'results': results
+    })
+
+
+async def stream_batch(images_service: AsyncImageService, specs: List[Any],
+                       store: Optional[S3ImageCache]) -> AsyncIterator[str]:
+    """배치 결과를 스레드 풀에서 생성하며 NDJSON 줄로 전달"""
+    loop = asyncio.get_running_loop()
+    queue: 'asyncio.Queue[Optional[Dict[str, Any]]]' = asyncio.Queue()
+
+    def produce():
+        # 클라이언트 연결이 끊겨도 남은 생성은 끝까지 진행해 캐시에 저장
+        try:
+            for result in iter_batch_results(specs):
+                loop.call_soon_threadsafe(queue.put_nowait, render_batch_result(result, store))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, {'success': False, 'error': f'서버 오류: {str(e)}'})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    images_service.executor.submit(produce)
+    while True:
+        result = await queue.get()
+        if result is None:
+            break
+        yield json.dumps(result, ensure_ascii=False) + '\n'
+
+
+@app.get('/health')
+async def health():
+    return {'status': 'ok'}
+
+
+@app.get('/metrics')
+async def metrics(request: Request):
+    """워커 프로세스별 캐시/생성 합치기 지표"""
+    return {
+        'pid': os.getpid(),
+        'saju_cache': saju_cache.snapshot(),
+        'images': request.app.state.images.metrics()
+    }
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(
+        'asgi_app:app',
+        host=os.environ.get('SERVER_HOST', '0.0.0.0'),
+        port=int(os.environ.get('SERVER_PORT', '8080')),
+        workers=int(os.environ.get('SERVER_WORKERS', str(os.cpu_count() or 1)))
+    )
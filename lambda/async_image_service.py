@@ -0,0 +1,40 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from image_generator import image_metrics, load_request_images
+from single_flight import AsyncSingleFlight
+
+# 장기 실행 서버에서 boto3/Pillow 작업을 돌릴 스레드 수
+IMAGE_SERVER_WORKERS = int(os.environ.get('IMAGE_SERVER_WORKERS', '16'))
+
+
+class AsyncImageService:
+    """장기 실행 비동기 서버용 이미지 서비스 - 블로킹 작업을 스레드 풀에서 실행하고 동일 요청을 합침"""
+
+    def __init__(self, max_workers: int = IMAGE_SERVER_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image')
+        self.flight = AsyncSingleFlight()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """boto3/Pillow 등 블로킹 호출을 이미지 스레드 풀에서 실행"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def load(self, prepared: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
+        """prepare_image_request 결과로 이미지 로드 (동일 프롬프트/변형 요청은 진행 중인 로드를 공유)"""
+        key = (prepared['cache_key'], tuple(prepared['sizes']),
+               prepared['variant_format'], prepared['include_original'])
+        (images, status), shared = await self.flight.do(key, lambda: self.run(load_request_images, prepared))
+        # 응답 생성 시 이미지 항목에 필드를 추가하므로 요청마다 사본 사용
+        return [dict(image) for image in images], 'COALESCED' if shared else status
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """요청 단위(async) / 생성 단위(thread) 합치기 지표"""
+        return {
+            'requests': self.flight.stats.snapshot(),
+            'generations': image_metrics()
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,245 @@
+"""
+Backend 호출 HTTP 전송 계층
+
+- requests: requests.Session + urllib3 Retry (기본, 기존 동작)
+- http.client: 표준 라이브러리만 사용하는 keep-alive 세션 (requests/urllib3 import 비용 없음, cold start용)
+
+두 세션 모두 post(url, json=, headers=, timeout=(연결, 읽기))만 지원하고,
+응답은 status_code/headers/content/text/json()으로 읽는다.
+http.client(email 파서 포함 ~50ms)는 첫 요청 시 import - 로컬 엔진/warm 캐시 경로는 import하지 않음.
+"""
+import json as jsonlib
+import select
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+TRANSPORTS = ('requests', 'http.client')
+
+
+class BackendConnectionError(OSError):
+    """Backend 연결/전송 실패 (http.client 전송)"""
+
+
+def keepalive_socket_options():
+    """TCP keep-alive 소켓 옵션 (유휴 60초 후 10초 간격 확인)"""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10))
+    return options
+
+
+def create_backend_session(transport='requests', pool_size=10, max_retries=2, backoff_factor=0.2,
+                           keepalive=True):
+    """Backend 호출용 세션 생성 (커넥션 풀 + 연결 실패 재시도)"""
+    if transport == 'http.client':
+        return StdlibSession(pool_size, max_retries, backoff_factor, keepalive)
+    if transport != 'requests':
+        raise ValueError(f"지원하지 않는 BACKEND_TRANSPORT입니다: {transport} (사용 가능: {', '.join(TRANSPORTS)})")
+    return create_requests_session(pool_size, max_retries, backoff_factor, keepalive)
+
+
+def backend_errors(transport='requests'):
+    """전송 방식별 연결 실패 예외 (except 절에 사용)"""
+    if transport == 'http.client':
+        return (BackendConnectionError,)
+    import requests
+    return (requests.exceptions.RequestException,)
+
+
+def preconnect(session, base_url, count=1, timeout=(1, 2)):
+    """Backend 연결을 미리 열어 풀에 보관 - 연 연결 수 (실패는 무시, 첫 요청에서 다시 연결)"""
+    try:
+        if isinstance(session, StdlibSession):
+            return session.preconnect(base_url, count, timeout)
+        # requests는 연결만 열 수 없어 헬스 체크 요청으로 풀에 연결 1개를 남김
+        session.get(f'{base_url}/health', timeout=timeout)
+        return 1
+    except Exception as e:
+        print(f"Backend 사전 연결 실패: {str(e)}")
+        return 0
+
+
+def create_requests_session(pool_size, max_retries, backoff_factor, keepalive):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    from urllib3.util.retry import Retry
+
+    class KeepAliveAdapter(HTTPAdapter):
+        """TCP keep-alive 소켓 옵션을 적용하는 HTTPAdapter"""
+
+        def init_poolmanager(self, *args, **kwargs):
+            socket_options = list(HTTPConnection.default_socket_options)
+            if keepalive:
+                socket_options.extend(keepalive_socket_options())
+            kwargs['socket_options'] = socket_options
+            super().init_poolmanager(*args, **kwargs)
+
+    # 연결 단계 실패만 재시도 (요청이 전송되지 않았으므로 POST도 안전)
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=backoff_factor,
+        raise_on_status=False
+    )
+    adapter = KeepAliveAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if keepalive:
+        session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+class StdlibResponse:
+    """requests.Response와 같은 이름의 최소 응답"""
+
+    def __init__(self, status_code: int, headers: 'http.client.HTTPMessage', content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.content)
+
+
+class StdlibSession:
+    """http.client 기반 keep-alive 세션 - 호스트별 유휴 연결 풀, 요청 전송 전 실패만 재시도"""
+
+    def __init__(self, pool_size=10, max_retries=2, backoff_factor=0.2, keepalive=True):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.keepalive = keepalive
+        self._idle: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def post(self, url: str, json: Any = None, headers: Optional[Dict[str, str]] = None,
+             timeout: Tuple[float, float] = (3, 30)) -> StdlibResponse:
+        import http.client
+
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        request_headers = {'Content-Type': 'application/json', 'Accept': '*/*',
+                           'Connection': 'keep-alive' if self.keepalive else 'close', **(headers or {})}
+        body = jsonlib.dumps(json).encode('utf-8') if json is not None else b''
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+
+        # 새 연결의 연결/전송 실패만 재시도 횟수에 포함 (유휴 연결 재사용 실패는 풀 정리로 보고 다시 시도)
+        attempt = 0
+        while True:
+            connection = self._acquire(key)
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = self._connect(key, timeout)
+                connection.request('POST', path, body=body, headers=request_headers)
+            except OSError as e:
+                # 요청을 끝까지 보내지 못했으므로 Backend가 처리하지 않음 - 새 연결로 다시 시도
+                if connection is not None:
+                    connection.close()
+                if reused:
+                    continue
+                if attempt >= self.max_retries:
+                    raise BackendConnectionError(f'{url} 연결 실패: {e}') from e
+                time.sleep(self.backoff_factor * (2 ** attempt))
+                attempt += 1
+                continue
+            except http.client.HTTPException as e:
+                connection.close()
+                raise BackendConnectionError(f'{url} 요청 실패: {e}') from e
+
+            try:
+                response = connection.getresponse()
+                content = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                # 요청은 이미 전송되어 Backend가 처리했을 수 있으므로 POST를 다시 보내지 않음
+                connection.close()
+                raise BackendConnectionError(f'{url} 요청 실패: {e}') from e
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return StdlibResponse(response.status, response.headers, content)
+
+    def preconnect(self, base_url: str, count: int = 1, timeout: Tuple[float, float] = (1, 2)) -> int:
+        """base_url 호스트로 연결 count개를 열어 유휴 풀에 추가 - 연 연결 수"""
+        parts = urlsplit(base_url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        opened = 0
+        for _ in range(min(count, self.pool_size)):
+            try:
+                connection = self._connect(key, timeout)
+            except OSError as e:
+                raise BackendConnectionError(f'{base_url} 연결 실패: {e}') from e
+            self._release(key, connection)
+            opened += 1
+        return opened
+
+    def _connect(self, key, timeout) -> 'http.client.HTTPConnection':
+        import http.client
+
+        scheme, host, port = key
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        connection = cls(host, port, timeout=connect_timeout)
+        connection.connect()
+        if self.keepalive:
+            for option in keepalive_socket_options():
+                connection.sock.setsockopt(*option)
+        connection.sock.settimeout(read_timeout)
+        return connection
+
+    def _acquire(self, key) -> Optional['http.client.HTTPConnection']:
+        """유휴 연결 하나 (서버가 이미 닫은 연결은 버리고 다음 연결 확인)"""
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    return None
+                connection = idle.pop()
+            if not connection_dropped(connection):
+                return connection
+            connection.close()
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+
+def connection_dropped(connection) -> bool:
+    """유휴 연결이 끊겼는지 - 요청 전에 읽을 수 있으면 서버가 닫았거나(EOF) 예상치 못한 데이터"""
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        if hasattr(select, 'poll'):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
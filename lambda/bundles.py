@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Lambda 함수별 최소 배포 번들 생성
+
+../lambda 전체(이미지/ASGI/대량 계산 모듈, 모든 의존성)를 한 asset으로 올리는 대신
+함수마다 필요한 모듈/데이터/의존성만 담고, 바이트코드를 미리 컴파일한다.
+(/var/task는 읽기 전용이라 __pycache__를 쓸 수 없어 매 cold start마다 컴파일됨)
+
+- boto3/botocore는 Lambda Python 런타임에 포함되어 있어 번들에서 제외
+- 바이트코드는 unchecked-hash pyc (소스 mtime 검사 없음) - 빌드 Python이 런타임(3.11)과 같을 때만 생성
+
+사용 예:
+    python bundles.py saju build/saju
+    python bundles.py image build/image --no-install
+"""
+import argparse
+import compileall
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_VERSION = (3, 11)
+
+# 런타임에 포함된 패키지 (requirements에 있어도 설치하지 않음)
+RUNTIME_PROVIDED = ('boto3', 'botocore')
+
+BUNDLES = {
+    'saju': {
+        'handler': 'index.handler',
+        'modules': ('index.py', 'saju_api.py', 'backend_http.py', 'saju_codec.py', 'saju_engine.py',
+                    'saju_store.py', 'pillar_table.py'),
+        'data': ('data/saju_pillars.bin',),
+        'requirements': 'requirements_saju.txt',
+    },
+    'image': {
+        'handler': 'image_generator.lambda_handler',
+        'modules': ('image_generator.py', 'image_cache.py', 'image_variants.py', 'prompt_builder.py',
+                    'single_flight.py'),
+        'data': (),
+        'requirements': 'requirements_image.txt',
+    },
+}
+
+
+def bundle_requirements(name):
+    """번들에 설치할 requirements 줄 (런타임 포함 패키지 제외)"""
+    path = os.path.join(LAMBDA_DIR, BUNDLES[name]['requirements'])
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return [line for line in lines if line.split('=')[0].split('[')[0].strip().lower() not in RUNTIME_PROVIDED]
+
+
+def build_bundle(name, output, install=True, platform='manylinux2014_x86_64'):
+    """output 디렉터리를 비우고 번들 구성 - 파일 수 반환"""
+    spec = BUNDLES[name]
+    if os.path.isdir(output):
+        shutil.rmtree(output)
+    os.makedirs(output)
+
+    for relative in spec['modules'] + spec['data']:
+        target = os.path.join(output, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(LAMBDA_DIR, relative), target)
+
+    requirements = bundle_requirements(name)
+    if install and requirements:
+        command = [sys.executable, '-m', 'pip', 'install', '--quiet', '--target', output,
+                   '--no-compile', *requirements]
+        if platform:
+            # 빌드 환경과 무관하게 Lambda(리눅스 x86_64, CPython 3.11) 휠 설치
+            command += ['--platform', platform, '--implementation', 'cp', '--only-binary=:all:',
+                        '--python-version', '.'.join(map(str, RUNTIME_VERSION))]
+        subprocess.run(command, check=True)
+
+    for root, dirs, _ in os.walk(output):
+        for directory in [d for d in dirs if d == '__pycache__']:
+            shutil.rmtree(os.path.join(root, directory))
+            dirs.remove(directory)
+
+    if sys.version_info[:2] == RUNTIME_VERSION:
+        compileall.compile_dir(output, quiet=1, invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    else:
+        print(f"⚠️  빌드 Python {sys.version_info[0]}.{sys.version_info[1]}이 런타임과 달라 바이트코드를 생성하지 않습니다")
+
+    return sum(len(files) for _, _, files in os.walk(output))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lambda 함수별 최소 배포 번들 생성')
+    parser.add_argument('bundle', choices=sorted(BUNDLES), help='번들 이름')
+    parser.add_argument('output', help='출력 디렉터리 (기존 내용은 삭제)')
+    parser.add_argument('--no-install', action='store_true', help='의존성 설치 생략 (모듈/데이터만)')
+    parser.add_argument('--platform', default='manylinux2014_x86_64',
+                        help="설치할 휠 플랫폼 (빈 값이면 빌드 환경 기준)")
+    args = parser.parse_args(argv)
+
+    files = build_bundle(args.bundle, args.output, install=not args.no_install, platform=args.platform)
+    size = sum(os.path.getsize(os.path.join(root, f)) for root, _, names in os.walk(args.output) for f in names)
+    print(f"✅ {args.bundle} 번들 ({BUNDLES[args.bundle]['handler']}): {files}개 파일, {size / 1024 / 1024:.1f}MB → {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
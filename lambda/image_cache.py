@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def image_cache_key(request_body: Dict[str, Any], model_id: str = '') -> str:
+    """최종 프롬프트 + imageGenerationConfig 기준 콘텐츠 주소 키 생성"""
+    params = request_body.get('textToImageParams', {})
+    canonical = json.dumps({
+        'modelId': model_id,
+        'taskType': request_body.get('taskType'),
+        'text': params.get('text'),
+        'negativeText': params.get('negativeText'),
+        'imageGenerationConfig': request_body.get('imageGenerationConfig', {})
+    }, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# 키에 확장자가 포함된 변형 이미지(예: <hash>_256.webp)용 Content-Type
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp'
+}
+
+
+def variant_cache_key(cache_key: str, size: int, image_format: str) -> str:
+    """원본 캐시 키에서 파생된 리사이즈 변형 키"""
+    return f"{cache_key}_{size}.{image_format}"
+
+
+def _with_suffix(key: str, suffix: str) -> str:
+    # 변형 키는 자체 확장자를 가지므로 기본 확장자를 붙이지 않음
+    return key if '.' in key else key + suffix
+
+
+class ImageCache:
+    """이미지 바이트 캐시 백엔드 인터페이스"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def put(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+
+class MemoryImageCache(ImageCache):
+    """프로세스 메모리 LRU 캐시 (warm 컨테이너 내 재사용)"""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._items: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+class FileSystemImageCache(ImageCache):
+    """로컬 파일시스템 캐시 (키 앞 2자리로 디렉토리 분산)"""
+
+    def __init__(self, root: str, suffix: str = '.png'):
+        self.root = root
+        self.suffix = suffix
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], _with_suffix(key, self.suffix))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 동시 쓰기 시 부분 파일이 읽히지 않도록 임시 파일 후 교체
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class S3ImageCache(ImageCache):
+    """S3 (또는 S3 호환 스토리지) 캐시 - get_object/put_object 클라이언트 주입 가능"""
+
+    def __init__(self, bucket: str, prefix: str = 'images/', client=None,
+                 content_type: str = 'image/png', suffix: str = '.png'):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.content_type = content_type
+        self.suffix = suffix
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            endpoint_url = os.environ.get('IMAGE_CACHE_S3_ENDPOINT') or None
+            self._client = boto3.client('s3', endpoint_url=endpoint_url)
+        return self._client
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}{_with_suffix(key, self.suffix)}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        except Exception as e:
+            # NoSuchKey 등 조회 실패는 캐시 미스로 처리
+            if _is_missing_key_error(e):
+                return None
+            raise
+        return response['Body'].read()
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.object_key(key),
+            Body=data,
+            ContentType=CONTENT_TYPES.get(key.rsplit('.', 1)[-1], self.content_type)
+        )
+
+    def presigned_url(self, key: str, expires_in: int = 300) -> str:
+        """저장된 객체에 대한 단기 GET URL 생성"""
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': self.object_key(key)},
+            ExpiresIn=expires_in
+        )
+
+
+class TieredImageCache(ImageCache):
+    """앞단(메모리) → 뒷단(영구 저장소) 순서로 조회하고 상위 계층을 채우는 캐시"""
+
+    def __init__(self, *layers: ImageCache):
+        self.layers = layers
+
+    def get(self, key: str) -> Optional[bytes]:
+        for index, layer in enumerate(self.layers):
+            data = layer.get(key)
+            if data is not None:
+                for upper in self.layers[:index]:
+                    upper.put(key, data)
+                return data
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        for layer in self.layers:
+            layer.put(key, data)
+
+
+def find_store(cache: ImageCache, store_type: type) -> Optional[ImageCache]:
+    """캐시 구성(계층 포함)에서 특정 타입의 저장소 검색"""
+    if isinstance(cache, store_type):
+        return cache
+    for layer in getattr(cache, 'layers', ()):
+        found = find_store(layer, store_type)
+        if found is not None:
+            return found
+    return None
+
+
+def _is_missing_key_error(error: Exception) -> bool:
+    response = getattr(error, 'response', None) or {}
+    code = str(response.get('Error', {}).get('Code', ''))
+    return code in ('NoSuchKey', '404', 'NotFound') or isinstance(error, KeyError)
+
+
+def create_image_cache_from_env() -> ImageCache:
+    """환경변수 설정으로 캐시 구성 (memory | fs | s3, 메모리 LRU는 항상 앞단)"""
+    backend = os.environ.get('IMAGE_CACHE_BACKEND', 'memory').lower()
+    memory = MemoryImageCache(int(os.environ.get('IMAGE_CACHE_MAX_ENTRIES', '64')))
+
+    if backend == 'fs':
+        root = os.environ.get('IMAGE_CACHE_DIR', '/tmp/yedamo-image-cache')
+        return TieredImageCache(memory, FileSystemImageCache(root))
+    if backend == 's3':
+        bucket = os.environ['IMAGE_CACHE_BUCKET']
+        prefix = os.environ.get('IMAGE_CACHE_PREFIX', 'images/')
+        return TieredImageCache(memory, S3ImageCache(bucket, prefix))
+    return memory
@@ -1,7 +1,20 @@
 import json
-import boto3
+import os
 import base64
-from typing import Dict, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from image_cache import (
+    CONTENT_TYPES, S3ImageCache, create_image_cache_from_env, find_store,
+    image_cache_key, variant_cache_key
+)
+from image_variants import (
+    make_variants, parse_sizes, parse_variant_format, variants_supported
+)
+from prompt_builder import build_prompt, build_request_body
+from single_flight import SingleFlight
 
 # 12지신 동물 목록
 ZODIAC_ANIMALS = [
@@ -9,6 +22,458 @@ ZODIAC_ANIMALS = [
     "말", "양", "원숭이", "닭", "개", "돼지"
 ]
 
+IMAGE_MODEL_ID = 'amazon.nova-canvas-v1:0'
+
+# 생성 이미지 캐시 (프롬프트 + 생성 설정 해시 기준)
+image_cache = create_image_cache_from_env()
+
+# format=url 응답용 단기 URL 유효 시간(초)
+IMAGE_URL_TTL = int(os.environ.get('IMAGE_URL_TTL', '300'))
+
+# /image/batch 설정 - 요청당 최대 스펙 수, 동시 Bedrock 호출 수
+IMAGE_BATCH_MAX_SPECS = int(os.environ.get('IMAGE_BATCH_MAX_SPECS', '20'))
+IMAGE_BATCH_CONCURRENCY = int(os.environ.get('IMAGE_BATCH_CONCURRENCY', '4'))
+# 배치 스펙 필드 - 모두 문자열 (프롬프트 생성이 입력 조합을 캐시 키로 사용)
+BATCH_SPEC_FIELDS = ('color', 'animal', 'gender', 'dominant_element')
+
+# Nova Canvas 1회 호출당 최대 numberOfImages
+MAX_IMAGES_PER_CALL = 5
+
+# Bedrock 클라이언트 - 자격 증명/엔드포인트 해석 비용을 warm invocation 간 재사용
+_bedrock_client = None
+_bedrock_client_lock = threading.Lock()
+
+_url_store = None
+
+# 동일 프롬프트 동시 생성 합치기 (같은 워커 내 스레드 간)
+image_flight = SingleFlight()
+
+
+class ImageRequestError(Exception):
+    """요청 검증 실패 - 응답 상태 코드와 오류 본문을 함께 전달"""
+
+    def __init__(self, status_code: int, payload: Dict[str, Any]):
+        super().__init__(payload.get('error', ''))
+        self.status_code = status_code
+        self.payload = payload
+
+
+class ImageGenerationError(Exception):
+    """Bedrock 응답에 이미지가 없을 때 발생"""
+
+    def __init__(self, details):
+        super().__init__('이미지 생성에 실패했습니다.')
+        self.details = details
+
+
+def get_bedrock_client():
+    """프로세스 전역 Bedrock 클라이언트 (최초 사용 시 한 번만 생성)"""
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _bedrock_client_lock:
+            if _bedrock_client is None:
+                # boto3 import(~0.3s)는 실제 Bedrock 호출 시점으로 미룸 - 검증 오류/304 응답은 import 없이 처리
+                import boto3
+                _bedrock_client = boto3.client('bedrock-runtime', region_name='us-east-1')
+    return _bedrock_client
+
+
+def invoke_image_model(request_body: Dict[str, Any], bedrock=None) -> bytes:
+    """Nova Canvas 호출 후 첫 번째 이미지 바이트 반환"""
+    return invoke_image_model_all(request_body, bedrock)[0]
+
+
+def invoke_image_model_all(request_body: Dict[str, Any], bedrock=None) -> List[bytes]:
+    """Nova Canvas 호출 후 생성된 모든 이미지(numberOfImages개) 바이트 반환"""
+    if bedrock is None:
+        bedrock = get_bedrock_client()
+    
+    response = bedrock.invoke_model(
+        modelId=IMAGE_MODEL_ID,
+        body=json.dumps(request_body),
+        contentType='application/json'
+    )
+    
+    response_body = json.loads(response['body'].read())
+    if not response_body.get('images'):
+        raise ImageGenerationError(response_body)
+    
+    return [base64.b64decode(image) for image in response_body['images']]
+
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """응답 형식 결정 - ?format= 값 우선, 없으면 Accept 헤더 (기본 json)"""
+    requested = (requested or '').lower()
+    if requested in ('png', 'binary'):
+        return 'binary'
+    if requested in ('url', 'json'):
+        return requested
+    
+    if (accept or '').lower().startswith('image/'):
+        return 'binary'
+    return 'json'
+
+
+def select_response_format(event: Dict[str, Any]) -> str:
+    """API Gateway 이벤트의 응답 형식 결정"""
+    params = event.get('queryStringParameters') or {}
+    return negotiate_format(params.get('format'), get_header(event, 'accept'))
+
+
+def get_header(event: Dict[str, Any], name: str) -> str:
+    """대소문자 구분 없이 요청 헤더 조회"""
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value or ''
+    return ''
+
+
+def get_url_store() -> Optional[S3ImageCache]:
+    """단기 URL 발급용 S3 저장소 (S3 캐시 계층 또는 IMAGE_URL_BUCKET)"""
+    global _url_store
+    if _url_store is None:
+        _url_store = find_store(image_cache, S3ImageCache)
+        if _url_store is None and os.environ.get('IMAGE_URL_BUCKET'):
+            _url_store = S3ImageCache(
+                os.environ['IMAGE_URL_BUCKET'],
+                os.environ.get('IMAGE_CACHE_PREFIX', 'images/')
+            )
+    return _url_store
+
+
+def load_images(cache_key: str, request_body: Dict[str, Any], sizes: List[int],
+                variant_format: str, include_original: bool) -> Tuple[List[Dict[str, Any]], bool]:
+    """캐시 우선으로 원본/리사이즈 변형 이미지 로드 (작은 크기부터 정렬, 캐시 상태 HIT/MISS/COALESCED 반환)"""
+    variant_keys = {size: variant_cache_key(cache_key, size, variant_format) for size in sizes}
+    variants = {size: image_cache.get(key) for size, key in variant_keys.items()}
+    missing = [size for size, data in variants.items() if data is None]
+    
+    image_bytes = None
+    status = 'HIT'
+    if include_original or missing:
+        image_bytes = image_cache.get(cache_key)
+        if image_bytes is None:
+            # 진행 중인 동일 생성이 있으면 결과를 공유
+            image_bytes, shared = image_flight.do(
+                cache_key, lambda: generate_original(cache_key, request_body))
+            status = 'COALESCED' if shared else 'MISS'
+    
+    # 한 번의 생성 결과에서 누락된 크기만 축소해 원본과 함께 캐시
+    if missing:
+        for size, data in make_variants(image_bytes, missing, variant_format).items():
+            image_cache.put(variant_keys[size], data)
+            variants[size] = data
+    
+    images = [
+        {'key': variant_keys[size], 'size': size, 'format': variant_format, 'data': variants[size]}
+        for size in sizes
+    ]
+    if include_original:
+        original_size = request_body['imageGenerationConfig']['width']
+        images.append({'key': cache_key, 'size': original_size, 'format': 'png', 'data': image_bytes})
+    return images, status
+
+
+def generate_original(cache_key: str, request_body: Dict[str, Any]) -> bytes:
+    """원본 이미지 생성 후 캐시 저장 (single-flight leader에서만 실행)"""
+    # 직전 leader가 방금 저장했을 수 있으므로 한 번 더 확인
+    image_bytes = image_cache.get(cache_key)
+    if image_bytes is None:
+        image_bytes = invoke_image_model(request_body)
+        image_cache.put(cache_key, image_bytes)
+    return image_bytes
+
+
+def image_metrics() -> Dict[str, int]:
+    """생성 합치기 지표 - leaders: Bedrock 생성 수, coalesced: 합류한 중복 요청 수"""
+    return image_flight.stats.snapshot()
+
+
+URL_STORE_REQUIRED = 'format=url은 S3 이미지 저장소(IMAGE_CACHE_BACKEND=s3 또는 IMAGE_URL_BUCKET) 설정이 필요합니다.'
+
+
+def publish_url(store: S3ImageCache, key: str, data: bytes) -> str:
+    """이미지 단기 URL 발급 (S3 캐시 계층이 아닌 저장소면 먼저 업로드)"""
+    if find_store(image_cache, S3ImageCache) is not store:
+        store.put(key, data)
+    return store.presigned_url(key, IMAGE_URL_TTL)
+
+
+def error_response(headers: Dict[str, str], error: ImageRequestError) -> Dict[str, Any]:
+    """요청 검증 실패 응답 (API Gateway 형식)"""
+    return {
+        'statusCode': error.status_code,
+        'headers': headers,
+        'body': json.dumps(error.payload)
+    }
+
+
+def binary_image_headers(image: Dict[str, Any], status: str) -> Dict[str, str]:
+    """이미지 바이트 응답 헤더 (콘텐츠 주소 키가 곧 ETag이므로 영구 캐시 가능)"""
+    return {
+        'Content-Type': CONTENT_TYPES[image['format']],
+        'Cache-Control': 'public, max-age=31536000, immutable',
+        'ETag': f'"{image["key"]}"',
+        'X-Image-Cache': status,
+        'Access-Control-Expose-Headers': 'ETag, X-Image-Cache'
+    }
+
+
+def image_body(response_format: str, metadata: Dict[str, Any], images: List[Dict[str, Any]],
+               status: str, cache_key: str) -> Dict[str, Any]:
+    """json/url 형식 성공 응답 본문 생성 (url: 단기 URL, json: base64)"""
+    body = {'success': True, **metadata, 'cached': status != 'MISS',
+            'coalesced': status == 'COALESCED', 'cache_key': cache_key}
+    
+    if response_format == 'url':
+        store = get_url_store()
+        if store is None:
+            raise ImageRequestError(400, {'error': URL_STORE_REQUIRED})
+        for image in images:
+            image['url'] = publish_url(store, image['key'], image['data'])
+        body.update({'expires_in': IMAGE_URL_TTL, 'format': 'url'})
+    else:
+        for image in images:
+            image['image'] = base64.b64encode(image['data']).decode('ascii')
+        body['format'] = 'base64'
+    
+    # 원본(마지막 항목)은 기존 필드(image/url)로, 변형은 작은 크기부터 variants로 전달
+    value_field = 'url' if response_format == 'url' else 'image'
+    if images[-1]['key'] == cache_key:
+        body[value_field] = images[-1][value_field]
+    variants = [image for image in images if image['key'] != cache_key]
+    if variants:
+        body['variants'] = [
+            {'size': image['size'], 'format': image['format'], value_field: image[value_field]}
+            for image in variants
+        ]
+    return body
+
+
+def image_response(response_format: str, headers: Dict[str, str], metadata: Dict[str, Any],
+                   images: List[Dict[str, Any]], status: str, cache_key: str) -> Dict[str, Any]:
+    """형식별 성공 응답 생성 (binary: 가장 작은 이미지 바이트, url: 단기 URL, json: base64)"""
+    if response_format == 'binary':
+        # API Gateway binaryMediaTypes(image/png, image/webp)에 의해 원본 바이트로 전달됨
+        first = images[0]
+        return {
+            'statusCode': 200,
+            'headers': {**headers, **binary_image_headers(first, status)},
+            'body': base64.b64encode(first['data']).decode('ascii'),
+            'isBase64Encoded': True
+        }
+    
+    try:
+        body = image_body(response_format, metadata, images, status, cache_key)
+    except ImageRequestError as e:
+        return error_response(headers, e)
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps(body)
+    }
+
+
+def validate_spec(spec: Any) -> Optional[str]:
+    """배치 스펙 검증 - 오류 메시지 반환 (정상이면 None)"""
+    if not isinstance(spec, dict):
+        return '스펙은 객체여야 합니다.'
+    invalid = [field for field in BATCH_SPEC_FIELDS
+               if spec.get(field) is not None and not isinstance(spec[field], str)]
+    if invalid:
+        return f"{', '.join(invalid)} 파라미터는 문자열이어야 합니다."
+    if not str(spec.get('color', '')).strip() or not str(spec.get('animal', '')).strip():
+        return 'color와 animal 파라미터가 필요합니다.'
+    if str(spec['animal']).strip() not in ZODIAC_ANIMALS:
+        return '유효하지 않은 동물입니다. 12지신 중 하나를 선택해주세요.'
+    return None
+
+
+def generate_prompt_group(prompt: str, count: int, seed: Optional[int] = None) -> Tuple[List[Tuple[str, bytes]], str]:
+    """동일 프롬프트 count장을 numberOfImages 한 번의 호출로 생성 (캐시 우선)"""
+    request_body = build_request_body(prompt)
+    config = request_body['imageGenerationConfig']
+    config['numberOfImages'] = count
+    if seed is not None:
+        config['seed'] = seed
+    
+    # 단일 이미지는 /image 단건 요청과 같은 캐시 키를 공유
+    base_key = image_cache_key(request_body, IMAGE_MODEL_ID)
+    keys = [base_key] if count == 1 else [f"{base_key}-{i}" for i in range(count)]
+    
+    stored = [image_cache.get(key) for key in keys]
+    if all(data is not None for data in stored):
+        return list(zip(keys, stored)), 'HIT'
+    
+    def generate():
+        images = invoke_image_model_all(request_body)
+        for key, data in zip(keys, images):
+            image_cache.put(key, data)
+        return images
+    
+    # 단건 경로(load_images)는 bytes, 여기는 List[bytes]를 반환하므로 키 공간을 분리
+    images, shared = image_flight.do(('group', base_key, count), generate)
+    return list(zip(keys, images)), 'COALESCED' if shared else 'MISS'
+
+
+def iter_batch_results(specs: List[Any]) -> Iterator[Dict[str, Any]]:
+    """배치 스펙을 프롬프트 기준으로 묶어 병렬 생성, 완료되는 순서대로 결과 반환"""
+    groups: 'OrderedDict[str, List[Tuple[int, Dict[str, str]]]]' = OrderedDict()
+    for index, spec in enumerate(specs):
+        error = validate_spec(spec)
+        if error:
+            yield {'index': index, 'success': False, 'error': error}
+            continue
+        normalized = {
+            'color': str(spec['color']).strip(),
+            'animal': str(spec['animal']).strip(),
+            'gender': spec.get('gender', 'neutral'),
+            'dominant_element': spec.get('dominant_element', '')
+        }
+        prompt = build_prompt(normalized['color'], normalized['animal'],
+                              normalized['gender'], normalized['dominant_element'])
+        groups.setdefault(prompt, []).append((index, normalized))
+    
+    # 동일 프롬프트는 numberOfImages로 묶고, 최대치를 넘으면 seed를 달리해 나눔
+    jobs = []
+    for prompt, members in groups.items():
+        for chunk_no, start in enumerate(range(0, len(members), MAX_IMAGES_PER_CALL)):
+            chunk = members[start:start + MAX_IMAGES_PER_CALL]
+            jobs.append((prompt, chunk, start, chunk_no or None))
+    
+    with ThreadPoolExecutor(max_workers=max(1, IMAGE_BATCH_CONCURRENCY)) as executor:
+        futures = {
+            executor.submit(generate_prompt_group, prompt, len(chunk), seed): (prompt, chunk, start)
+            for prompt, chunk, start, seed in jobs
+        }
+        for future in as_completed(futures):
+            prompt, chunk, start = futures[future]
+            try:
+                images, status = future.result()
+            except Exception as e:
+                details = e.details if isinstance(e, ImageGenerationError) else str(e)
+                for index, spec in chunk:
+                    yield {'index': index, 'success': False, **spec,
+                           'error': '이미지 생성에 실패했습니다.', 'details': details}
+                continue
+            for variant, ((index, spec), (key, data)) in enumerate(zip(chunk, images), start):
+                yield {'index': index, 'success': True, **spec, 'prompt': prompt,
+                       'variant': variant, 'cached': status != 'MISS',
+                       'coalesced': status == 'COALESCED', 'cache_key': key, 'data': data}
+
+
+def prepare_batch(body: Dict[str, Any], use_url: bool) -> Tuple[List[Any], Optional[S3ImageCache]]:
+    """배치 요청 검증 - 스펙 목록과 (format=url이면) URL 발급 저장소 반환"""
+    specs = body.get('specs')
+    if not isinstance(specs, list) or not specs:
+        raise ImageRequestError(400, {'error': 'specs 목록이 필요합니다.'})
+    if len(specs) > IMAGE_BATCH_MAX_SPECS:
+        raise ImageRequestError(400, {'error': f'specs는 최대 {IMAGE_BATCH_MAX_SPECS}개까지 요청할 수 있습니다.'})
+    
+    store = get_url_store() if use_url else None
+    if use_url and store is None:
+        raise ImageRequestError(400, {'error': URL_STORE_REQUIRED})
+    return specs, store
+
+
+def render_batch_result(result: Dict[str, Any], store: Optional[S3ImageCache]) -> Dict[str, Any]:
+    """배치 결과의 이미지 바이트를 단기 URL 또는 base64로 변환"""
+    data = result.pop('data', None)
+    if data is not None:
+        if store is not None:
+            result['url'] = publish_url(store, result['cache_key'], data)
+        else:
+            result['image'] = base64.b64encode(data).decode('ascii')
+    return result
+
+
+def handle_batch(event: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    """/image/batch - 여러 스펙을 한 요청으로 생성 (결과는 완료 순서, index로 요청 순서 매핑)
+
+    API Gateway 프록시 통합은 응답을 한 번에 반환하므로 모든 그룹이 끝날 때까지 결과를 모아 둠 -
+    첫 결과도 가장 느린 그룹의 생성 시간(최대 Bedrock 호출 시간 x ceil(그룹 수 / IMAGE_BATCH_CONCURRENCY))
+    뒤에 도착하고, 응답 크기는 전체 결과 합. 완료 순서대로 받아야 하면 ASGI 서버의 NDJSON 스트리밍 사용
+    """
+    body = json.loads(event.get('body') or '{}')
+    use_url = select_response_format(event) == 'url'
+    try:
+        specs, store = prepare_batch(body, use_url)
+    except ImageRequestError as e:
+        return error_response(headers, e)
+    
+    results = [render_batch_result(result, store) for result in iter_batch_results(specs)]
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps({
+            'success': all(result['success'] for result in results),
+            'count': len(results),
+            'format': 'url' if use_url else 'base64',
+            'results': results
+        })
+    }
+
+
+def prepare_image_request(body: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """단건 요청 검증 후 프롬프트/캐시 키/변형 설정 계산 (Lambda 핸들러와 ASGI 서버 공용)"""
+    color = body.get('color', '').strip()
+    animal = body.get('animal', '').strip()
+    gender = body.get('gender', 'neutral')
+    dominant_element = body.get('dominant_element', '')
+    
+    # 입력 검증
+    if not color or not animal:
+        raise ImageRequestError(400, {
+            'error': 'color와 animal 파라미터가 필요합니다.',
+            'required_animals': ZODIAC_ANIMALS
+        })
+    
+    if animal not in ZODIAC_ANIMALS:
+        raise ImageRequestError(400, {
+            'error': f'유효하지 않은 동물입니다. 12지신 중 하나를 선택해주세요.',
+            'valid_animals': ZODIAC_ANIMALS
+        })
+    
+    # 프롬프트 생성
+    prompt = build_prompt(color, animal, gender, dominant_element)
+    request_body = build_request_body(prompt)
+    
+    # 리사이즈 변형 요청 (예: sizes=[512, 256, 128], 작은 크기가 먼저 반환됨)
+    try:
+        sizes = parse_sizes(body.get('sizes', params.get('sizes')))
+        variant_format = parse_variant_format(body.get('variant_format', params.get('variant_format')))
+    except ValueError as e:
+        raise ImageRequestError(400, {'error': str(e)})
+    if sizes and not variants_supported():
+        raise ImageRequestError(501, {'error': '이 배포에서는 sizes 변형을 지원하지 않습니다.'})
+    
+    cache_key = image_cache_key(request_body, IMAGE_MODEL_ID)
+    return {
+        'request_body': request_body,
+        'cache_key': cache_key,
+        'sizes': sizes,
+        'variant_format': variant_format,
+        'include_original': not sizes or bool(body.get('include_original', False)),
+        # 콘텐츠 주소 키가 곧 ETag - 바이너리 응답은 가장 작은 이미지
+        'etag': variant_cache_key(cache_key, sizes[0], variant_format) if sizes else cache_key,
+        'metadata': {
+            'prompt': prompt,
+            'color': color,
+            'animal': animal,
+            'gender': gender,
+            'dominant_element': dominant_element
+        }
+    }
+
+
+def load_request_images(prepared: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
+    """prepare_image_request 결과로 이미지 로드"""
+    return load_images(prepared['cache_key'], prepared['request_body'], prepared['sizes'],
+                       prepared['variant_format'], prepared['include_original'])
+
+
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     try:
         # CORS 헤더
@@ -16,7 +481,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Methods': 'POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization'
+            'Access-Control-Allow-Headers': 'Content-Type, Authorization, Accept, If-None-Match'
         }
         
         # OPTIONS 요청 처리
@@ -27,144 +492,42 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 'body': json.dumps({'message': 'OK'})
             }
         
-        # 요청 본문 파싱
+        # 배치 생성 요청
+        if (event.get('path') or '').rstrip('/').endswith('/batch'):
+            return handle_batch(event, headers)
+        
+        # 요청 본문 파싱 및 검증
         body = json.loads(event.get('body', '{}'))
-        color = body.get('color', '').strip()
-        animal = body.get('animal', '').strip()
-        gender = body.get('gender', 'neutral')
-        dominant_element = body.get('dominant_element', '')
+        try:
+            prepared = prepare_image_request(body, event.get('queryStringParameters') or {})
+        except ImageRequestError as e:
+            return error_response(headers, e)
         
-        # 입력 검증
-        if not color or not animal:
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
-                    'error': 'color와 animal 파라미터가 필요합니다.',
-                    'required_animals': ZODIAC_ANIMALS
-                })
-            }
+        response_format = select_response_format(event)
         
-        if animal not in ZODIAC_ANIMALS:
+        # 클라이언트가 이미 가진 이미지면 본문 생략
+        etag = prepared['etag']
+        if response_format == 'binary' and get_header(event, 'if-none-match').strip('"') == etag:
             return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
-                    'error': f'유효하지 않은 동물입니다. 12지신 중 하나를 선택해주세요.',
-                    'valid_animals': ZODIAC_ANIMALS
-                })
-            }
-        
-        # 동물 매핑 (한국어 -> 영어)
-        animal_mapping = {
-            '쥐': 'mouse', '소': 'ox', '호랑이': 'tiger', '토끼': 'rabbit',
-            '용': 'dragon', '뱀': 'snake', '말': 'horse', '양': 'sheep',
-            '원숭이': 'monkey', '닭': 'rooster', '개': 'dog', '돼지': 'pig'
-        }
-        
-        # 오행별 배경 컨셉 매핑
-        element_backgrounds = {
-            'wood': 'lush green forest background with ancient trees and glowing leaves',
-            'fire': 'volcanic landscape with glowing lava and flame effects in background',
-            'earth': 'mountain cave with crystal formations and earthy stone textures',
-            'metal': 'shimmering metallic temple with golden reflections and sharp geometric patterns',
-            'water': 'serene lake with waterfalls and misty clouds in mystical blue atmosphere',
-            'balanced': 'harmonious mystical landscape with elements of all five elements'
-        }
-        
-        # 오행별 동물 스타일 매핑
-        element_styles = {
-            'wood': 'nature-infused, with leaf patterns on fur/scales',
-            'fire': 'flame-like markings, glowing ember effects',
-            'earth': 'rocky texture, crystal embedded',
-            'metal': 'metallic sheen, armor-like scales',
-            'water': 'flowing, translucent, bubble effects',
-            'balanced': 'harmonious blend of all elemental features'
-        }
-        
-        # 성별 스타일 매핑
-        gender_styles = {
-            'male': 'strong, powerful',
-            'female': 'elegant, graceful',
-            'neutral': 'balanced'
-        }
-        
-        # 프롬프트 생성
-        english_animal = animal_mapping.get(animal, animal)
-        
-        # 포켓몬 스타일 기본 프롬프트
-        base_prompt = f"Cute chibi-style {english_animal} pokemon-like creature with {color} coloring"
-        
-        # 배경 설정
-        background = element_backgrounds.get(dominant_element, 'mystical fantasy background')
-        
-        # 동물 스타일 요소들
-        style_elements = []
-        
-        if dominant_element and dominant_element in element_styles:
-            style_elements.append(element_styles[dominant_element])
-            
-        if gender in gender_styles:
-            style_elements.append(gender_styles[gender])
-        
-        # 최종 프롬프트 조합
-        style_part = ', '.join(style_elements) if style_elements else 'adorable'
-        prompt = f"{base_prompt}, {style_part}, {background}, kawaii anime art style, highly detailed, soft lighting, no humans"
-        
-        # Bedrock 클라이언트 생성
-        bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
-        
-        # Nova Canvas 모델 호출
-        request_body = {
-            "taskType": "TEXT_IMAGE",
-            "textToImageParams": {
-                "text": prompt,
-                "negativeText": "human, person, people, man, woman, face, hands, realistic, dark, scary, ugly"
-            },
-            "imageGenerationConfig": {
-                "numberOfImages": 1,
-                "height": 1024,
-                "width": 1024,
-                "cfgScale": 8.0
+                'statusCode': 304,
+                'headers': {**headers, 'ETag': f'"{etag}"'},
+                'body': ''
             }
-        }
-        
-        response = bedrock.invoke_model(
-            modelId='amazon.nova-canvas-v1:0',
-            body=json.dumps(request_body),
-            contentType='application/json'
-        )
         
-        # 응답 처리
-        response_body = json.loads(response['body'].read())
-        
-        if 'images' in response_body and len(response_body['images']) > 0:
-            # Base64 인코딩된 이미지 데이터
-            image_data = response_body['images'][0]
-            
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': True,
-                    'prompt': prompt,
-                    'color': color,
-                    'animal': animal,
-                    'gender': gender,
-                    'dominant_element': dominant_element,
-                    'image': image_data,
-                    'format': 'base64'
-                })
-            }
-        else:
+        try:
+            images, status = load_request_images(prepared)
+        except ImageGenerationError as e:
             return {
                 'statusCode': 500,
                 'headers': headers,
                 'body': json.dumps({
                     'error': '이미지 생성에 실패했습니다.',
-                    'details': response_body
+                    'details': e.details
                 })
             }
+        
+        return image_response(response_format, headers, prepared['metadata'], images, status,
+                              prepared['cache_key'])
             
     except Exception as e:
         return {
@@ -0,0 +1,67 @@
+import importlib.util
+import io
+from typing import Dict, Iterable, List
+
+# Pillow는 리사이즈 변형 요청 시에만 필요 (requirements_image.txt) - import(~30ms)도 그때 수행
+_PILLOW_AVAILABLE = importlib.util.find_spec('PIL') is not None
+
+VARIANT_FORMATS = ('webp', 'png')
+MIN_VARIANT_SIZE = 16
+MAX_VARIANT_SIZE = 1024
+MAX_VARIANTS = 4
+
+
+def variants_supported() -> bool:
+    return _PILLOW_AVAILABLE
+
+
+def parse_sizes(value) -> List[int]:
+    """sizes 파라미터(리스트 또는 '512,256,128') 검증 후 오름차순 반환"""
+    if value in (None, '', []):
+        return []
+    if isinstance(value, str):
+        value = [part for part in value.split(',') if part.strip()]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError('sizes는 정수 목록이어야 합니다.')
+
+    sizes = set()
+    for item in value:
+        try:
+            size = int(item)
+        except (TypeError, ValueError):
+            raise ValueError(f'유효하지 않은 크기입니다: {item}')
+        if not (MIN_VARIANT_SIZE <= size <= MAX_VARIANT_SIZE):
+            raise ValueError(f'크기는 {MIN_VARIANT_SIZE}-{MAX_VARIANT_SIZE} 사이여야 합니다: {size}')
+        sizes.add(size)
+
+    if len(sizes) > MAX_VARIANTS:
+        raise ValueError(f'sizes는 최대 {MAX_VARIANTS}개까지 요청할 수 있습니다.')
+    return sorted(sizes)
+
+
+def parse_variant_format(value) -> str:
+    image_format = (value or 'webp').lower()
+    if image_format not in VARIANT_FORMATS:
+        raise ValueError(f'variant_format은 {", ".join(VARIANT_FORMATS)} 중 하나여야 합니다.')
+    return image_format
+
+
+def make_variants(image_bytes: bytes, sizes: Iterable[int], image_format: str) -> Dict[int, bytes]:
+    """원본 이미지 한 장에서 크기별 축소본 생성 (큰 크기부터 단계적으로 축소)"""
+    if not _PILLOW_AVAILABLE:
+        raise RuntimeError('Pillow가 설치되지 않아 리사이즈 변형을 생성할 수 없습니다.')
+    from PIL import Image
+
+    variants = {}
+    with Image.open(io.BytesIO(image_bytes)) as original:
+        current = original.convert('RGB')
+        for size in sorted(sizes, reverse=True):
+            if current.width > size or current.height > size:
+                current = current.resize((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            if image_format == 'webp':
+                current.save(buffer, format='WEBP', quality=80, method=4)
+            else:
+                current.save(buffer, format='PNG', optimize=True)
+            variants[size] = buffer.getvalue()
+    return variants
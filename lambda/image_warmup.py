@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+12지신 이미지 사전 생성 (캐시 워밍업) 작업
+
+lambda_handler와 동일한 프롬프트 빌더로 모든 조합을 렌더링해 이미지 캐시에 저장한다.
+매니페스트(JSON Lines)에 조합별 결과를 기록하므로 중단 후 재실행하면 이어서 진행한다.
+
+사용 예:
+    IMAGE_CACHE_BACKEND=s3 IMAGE_CACHE_BUCKET=yedamo-images \\
+        python image_warmup.py --colors 청색,적색,황색,백색,흑색 --concurrency 4
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Set
+
+import boto3
+from botocore.config import Config
+
+from image_cache import image_cache_key
+from image_generator import (
+    IMAGE_MODEL_ID, ZODIAC_ANIMALS, image_cache, invoke_image_model
+)
+from prompt_builder import (
+    ELEMENT_BACKGROUNDS, GENDER_STYLES, build_prompt, build_request_body
+)
+
+# 프론트엔드 천간 색상 매핑(SajuResult.jsx)과 동일한 기본 팔레트
+DEFAULT_COLORS = ['청색', '적색', '황색', '백색', '흑색']
+
+# 오행 미지정('')은 현재 프론트엔드 기본 요청과 동일
+DEFAULT_ELEMENTS = [''] + list(ELEMENT_BACKGROUNDS)
+
+
+def iter_combinations(colors: List[str], elements: List[str],
+                      genders: List[str]) -> Iterator[Dict[str, str]]:
+    """색상 × 동물 × 성별 × 오행 전체 조합 (중복 프롬프트 제거)"""
+    seen = set()
+    for color, animal, gender, element in itertools.product(
+            colors, ZODIAC_ANIMALS, genders, elements):
+        prompt = build_prompt(color, animal, gender, element)
+        if prompt in seen:
+            continue
+        seen.add(prompt)
+        yield {
+            'color': color,
+            'animal': animal,
+            'gender': gender,
+            'dominant_element': element,
+            'prompt': prompt
+        }
+
+
+def load_completed(manifest_path: str) -> Set[str]:
+    """매니페스트에서 완료된 캐시 키 목록 로드 (재개용)"""
+    completed = set()
+    if not os.path.exists(manifest_path):
+        return completed
+    with open(manifest_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 중단 시 마지막 줄이 잘렸을 수 있음
+                continue
+            if entry.get('status') in ('generated', 'cached'):
+                completed.add(entry['cache_key'])
+    return completed
+
+
+def render(combo: Dict[str, str], bedrock) -> Dict[str, object]:
+    """조합 하나를 렌더링해 캐시에 저장"""
+    request_body = build_request_body(combo['prompt'])
+    cache_key = combo['cache_key']
+    entry = {key: combo[key] for key in ('color', 'animal', 'gender', 'dominant_element')}
+    entry['cache_key'] = cache_key
+
+    if image_cache.get(cache_key) is not None:
+        entry['status'] = 'cached'
+        return entry
+
+    started = time.monotonic()
+    try:
+        image_bytes = invoke_image_model(request_body, bedrock)
+        image_cache.put(cache_key, image_bytes)
+        entry['status'] = 'generated'
+        entry['bytes'] = len(image_bytes)
+    except Exception as e:
+        entry['status'] = 'failed'
+        entry['error'] = str(e)
+    entry['elapsed_ms'] = round((time.monotonic() - started) * 1000)
+    return entry
+
+
+def run(colors: List[str], elements: List[str], genders: List[str],
+        manifest_path: str, concurrency: int, limit: int = 0) -> Dict[str, int]:
+    completed = load_completed(manifest_path)
+    pending = []
+    for combo in iter_combinations(colors, elements, genders):
+        combo['cache_key'] = image_cache_key(build_request_body(combo['prompt']), IMAGE_MODEL_ID)
+        if combo['cache_key'] not in completed:
+            pending.append(combo)
+    if limit:
+        pending = pending[:limit]
+
+    print(f"🎨 대상 {len(pending)}개 (완료 {len(completed)}개 건너뜀), 동시성 {concurrency}")
+
+    # boto3 클라이언트는 스레드 간 공유 가능, 스로틀링은 adaptive 재시도로 흡수
+    bedrock = boto3.client(
+        'bedrock-runtime',
+        region_name='us-east-1',
+        config=Config(
+            max_pool_connections=concurrency,
+            retries={'max_attempts': 8, 'mode': 'adaptive'}
+        )
+    )
+
+    counts = {'generated': 0, 'cached': 0, 'failed': 0}
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+
+    with open(manifest_path, 'a', encoding='utf-8') as manifest, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(render, combo, bedrock) for combo in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            counts[entry['status']] += 1
+            manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            manifest.flush()
+            print(f"[{done}/{len(pending)}] {entry['status']:9s} "
+                  f"{entry['color']} {entry['animal']} {entry['gender']} "
+                  f"{entry['dominant_element'] or '-'}")
+
+    return counts
+
+
+def main(argv=None):
+    if os.environ.get('IMAGE_CACHE_BACKEND', 'memory').lower() == 'memory':
+        print("⚠️  IMAGE_CACHE_BACKEND가 memory입니다. 사전 생성 결과를 보존하려면 fs 또는 s3를 사용하세요.")
+
+    parser = argparse.ArgumentParser(description='12지신 이미지 캐시 사전 생성')
+    parser.add_argument('--colors', default=','.join(DEFAULT_COLORS),
+                        help='쉼표로 구분한 색상 팔레트')
+    parser.add_argument('--elements', default=','.join(DEFAULT_ELEMENTS),
+                        help="쉼표로 구분한 오행 목록 (빈 값 = 오행 미지정)")
+    parser.add_argument('--genders', default=','.join(GENDER_STYLES),
+                        help='쉼표로 구분한 성별 목록')
+    parser.add_argument('--manifest', default='image-warmup-manifest.jsonl',
+                        help='결과 매니페스트 경로 (재실행 시 이어서 진행)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='동시 Bedrock 호출 수')
+    parser.add_argument('--limit', type=int, default=0,
+                        help='이번 실행에서 렌더링할 최대 개수 (0 = 전체)')
+    args = parser.parse_args(argv)
+
+    counts = run(
+        colors=[c.strip() for c in args.colors.split(',') if c.strip()],
+        elements=[e.strip() for e in args.elements.split(',')],
+        genders=[g.strip() for g in args.genders.split(',') if g.strip()],
+        manifest_path=args.manifest,
+        concurrency=max(1, args.concurrency),
+        limit=args.limit
+    )
+
+    print(f"✅ 완료: 생성 {counts['generated']}, 캐시 {counts['cached']}, 실패 {counts['failed']}")
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
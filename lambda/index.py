@@ -1,18 +1,72 @@
+import base64
 import json
 import os
-import requests
+import time
+
+from backend_http import backend_errors, create_backend_session, preconnect
+from pillar_table import pillar_table
+from saju_api import (
+    BACKEND_CONNECT_FAILED, BACKEND_SAJU_HEADERS, BACKEND_SERVER_FAILED, JSON_HEADERS, SAJU_REQUEST_HASH_HEADER,
+    SajuApiError, backend_saju_data, error_body, find_saju_data, prepare_basic_request, render_basic_saju
+)
+from saju_codec import decode_chart, encode_chart
+from saju_engine import compute_saju_analysis
+from saju_store import ping_redis
 
 # Backend API URL
 BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:3001')
 
+# Backend 커넥션 풀 설정 (warm 컨테이너에서 재사용)
+BACKEND_POOL_SIZE = int(os.environ.get('BACKEND_POOL_SIZE', '10'))
+BACKEND_CONNECT_TIMEOUT = float(os.environ.get('BACKEND_CONNECT_TIMEOUT', '3'))
+BACKEND_READ_TIMEOUT = float(os.environ.get('BACKEND_READ_TIMEOUT', '30'))
+BACKEND_MAX_RETRIES = int(os.environ.get('BACKEND_MAX_RETRIES', '2'))
+BACKEND_BACKOFF_FACTOR = float(os.environ.get('BACKEND_BACKOFF_FACTOR', '0.2'))
+BACKEND_KEEPALIVE = os.environ.get('BACKEND_KEEPALIVE', 'true').lower() == 'true'
+# Backend 전송 방식 - requests (기본) 또는 http.client (표준 라이브러리만, cold start 단축)
+BACKEND_TRANSPORT = os.environ.get('BACKEND_TRANSPORT', 'requests').lower()
+
+# init 단계 사전 준비 (Lambda 실행 환경에서만) - 미리 열어 둘 Backend 연결 수와 연결 대기 시간
+SAJU_PREWARM = os.environ.get('SAJU_PREWARM', 'true').lower() == 'true'
+BACKEND_PREWARM_CONNECTIONS = int(os.environ.get('BACKEND_PREWARM_CONNECTIONS', '2'))
+BACKEND_PREWARM_TIMEOUT = float(os.environ.get('BACKEND_PREWARM_TIMEOUT', '1'))
+
+
+# 모듈 스코프 세션 - warm invocation 간 TCP 연결 재사용
+backend_session = create_backend_session(
+    BACKEND_TRANSPORT, BACKEND_POOL_SIZE, BACKEND_MAX_RETRIES, BACKEND_BACKOFF_FACTOR, BACKEND_KEEPALIVE
+)
+BACKEND_ERRORS = backend_errors(BACKEND_TRANSPORT)
+BACKEND_TIMEOUT = (BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT)
+
+
+def prewarm():
+    """init 단계 사전 준비 - 간지 테이블 페이지 로드, 계산/직렬화 경로 실행, Backend/Redis 연결 미리 열기
+    (Provisioned Concurrency에서는 요청 전에 init이 끝나므로 첫 요청에서 이 비용이 사라짐)"""
+    started = time.perf_counter()
+    if pillar_table is not None:
+        pillar_table.prefetch()
+    decode_chart(encode_chart(compute_saju_analysis(2000, 1, 1, 0)))
+    connections = preconnect(backend_session, BACKEND_URL, BACKEND_PREWARM_CONNECTIONS,
+                             (BACKEND_PREWARM_TIMEOUT, BACKEND_PREWARM_TIMEOUT))
+    redis_ready = ping_redis()
+    print(f"init 사전 준비 완료 ({(time.perf_counter() - started) * 1000:.0f}ms, "
+          f"Backend 연결 {connections}개, Redis {'연결' if redis_ready else '미사용'})")
+
+
+# Lambda init 단계에서 실행 (ASGI 서버/테스트에서 import할 때는 실행하지 않음)
+if SAJU_PREWARM and os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    prewarm()
+
 
 def handler(event, context):
     try:
         path = event.get('path', '')
-        body = json.loads(event['body'])
+        body = json.loads(request_body(event))
 
         if path == '/saju/basic':
-            return handle_basic_saju(body)
+            return handle_basic_saju(body, header_value(event, 'Accept-Encoding'),
+                                     header_value(event, SAJU_REQUEST_HASH_HEADER))
         elif path == '/saju/consultation':
             return handle_consultation_proxy(body)
         else:
@@ -24,117 +78,84 @@ def handler(event, context):
     except Exception as e:
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
+            'headers': JSON_HEADERS,
             'body': json.dumps({'error': str(e)}, ensure_ascii=False)
         }
 
 
-def handle_basic_saju(body):
-    """기본 사주 정보 반환 API - Backend 서버 호출"""
-    birth_info = validate_birth_info(body)
-    name = body.get('name', '')
+def request_body(event):
+    """API Gateway 이벤트 본문 (binaryMediaTypes로 base64 인코딩된 경우 복원)"""
+    body = event.get('body') or '{}'
+    if event.get('isBase64Encoded'):
+        return base64.b64decode(body).decode('utf-8')
+    return body
+
+
+def header_value(event, name):
+    """대소문자 구분 없는 요청 헤더 조회"""
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return ''
+
 
-    if not name:
-        raise ValueError('name이 필요합니다')
+def handle_basic_saju(body, accept_encoding='', request_hash=''):
+    """기본 사주 정보 반환 API - warm 캐시/Redis/로컬 엔진 우선, 없으면 Backend 서버 호출"""
+    request = prepare_basic_request(body, request_hash)
+    found = find_saju_data(request)
+    if found is not None:
+        return basic_saju_response(request, *found, accept_encoding)
 
     # Backend API 호출
     try:
-        # birth_info를 backend 형식으로 변환
-        backend_payload = {
-            'birthDate': f"{birth_info['year']}-{birth_info['month']:02d}-{birth_info['day']:02d}",
-            'birthTime': f"{birth_info['hour']:02d}:00",
-            'isLunar': birth_info.get('isLunar', False),
-            'gender': birth_info.get('gender', 'male'),
-            'name': name
-        }
-
-        response = requests.post(
+        response = backend_session.post(
             f"{BACKEND_URL}/saju/basic",
-            json=backend_payload,
-            timeout=30
+            json=request['backend_payload'],
+            headers=BACKEND_SAJU_HEADERS,
+            timeout=BACKEND_TIMEOUT
         )
+    except BACKEND_ERRORS as e:
+        raise SajuApiError(f"{BACKEND_SERVER_FAILED}: {str(e)}")
 
-        if response.status_code == 200:
-            backend_data = response.json()
+    backend_data = backend_saju_data(request, response.status_code, response.headers.get('Content-Type'),
+                                     response.content, response.text)
+    return basic_saju_response(request, backend_data, 'MISS', accept_encoding)
 
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'cache_key': backend_data.get('cache_key'),
-                    'birth_info': birth_info,
-                    'saju_analysis': backend_data.get('data', {}),
-                    'backend_response': backend_data
-                }, ensure_ascii=False)
-            }
-        else:
-            raise Exception(
-                f"Backend API 오류: {response.status_code} - {response.text}")
 
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Backend 서버 연결 실패: {str(e)}")
-    except Exception as e:
-        raise Exception(f"사주 데이터 처리 실패: {str(e)}")
+def basic_saju_response(request, data, cache_status, accept_encoding=''):
+    """기본 사주 API 응답 (API Gateway 형식) - 압축 본문은 base64로 전달"""
+    content, headers = render_basic_saju(request, data, cache_status, accept_encoding)
+    if 'Content-Encoding' not in headers:
+        return {'statusCode': 200, 'headers': headers, 'body': content.decode('utf-8')}
+
+    # API Gateway binaryMediaTypes(*/*)에 의해 압축 바이트 그대로 전달됨
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': base64.b64encode(content).decode('ascii'),
+        'isBase64Encoded': True
+    }
 
 
 def handle_consultation_proxy(body):
     """상담 API - EC2 Backend로 프록시"""
     try:
-        response = requests.post(
+        response = backend_session.post(
             f"{BACKEND_URL}/saju/consultation",
             json=body,
-            timeout=30
+            timeout=BACKEND_TIMEOUT
         )
 
         return {
             'statusCode': response.status_code,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
+            'headers': JSON_HEADERS,
             'body': json.dumps(response.json(), ensure_ascii=False)
         }
 
-    except requests.exceptions.RequestException as e:
+    except BACKEND_ERRORS as e:
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': f'Backend 연결 실패: {str(e)}'}, ensure_ascii=False)
+            'headers': JSON_HEADERS,
+            'body': json.dumps(error_body(BACKEND_CONNECT_FAILED, e), ensure_ascii=False)
         }
-
-
-def validate_birth_info(body):
-    """사용자 정보 검증 (기본 사주 API용)"""
-    birth_info = body.get('birth_info', {})
-
-    # 필수 필드 검증
-    required_fields = ['year', 'month', 'day', 'hour']
-    for field in required_fields:
-        if field not in birth_info:
-            raise ValueError(f'{field}가 필요합니다')
-
-    # 범위 검증
-    year = birth_info['year']
-    month = birth_info['month']
-    day = birth_info['day']
-    hour = birth_info['hour']
-
-    if not (1900 <= year <= 2100):
-        raise ValueError('연도는 1900-2100 사이여야 합니다')
-    if not (1 <= month <= 12):
-        raise ValueError('월은 1-12 사이여야 합니다')
-    if not (1 <= day <= 31):
-        raise ValueError('일은 1-31 사이여야 합니다')
-    if not (0 <= hour <= 23):
-        raise ValueError('시간은 0-23 사이여야 합니다')
-
-    return birth_info
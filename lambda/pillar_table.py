@@ -0,0 +1,164 @@
+"""
+사전 계산된 사주 간지 테이블 (1900-2100)
+
+날짜별 4바이트 레코드(연주/월주/일주 60갑자 순번 + 절입 시)와 일간×시각 시주 표를
+하나의 바이너리 파일로 만들어 두고, import 시 mmap으로 열어 O(1)로 조회한다.
+
+파일 형식 (little-endian):
+    [0:32)    헤더 - magic 'SJPT', version, start_year, end_year, epoch ordinal, 일 수
+    [32:272)  시주 표 - 일간(10) × 시각(24) → 시주 60갑자 순번
+    [272:)    일별 레코드 - (연주, 월주, 일주, 절입 시) 각 1바이트
+              절입 시: 그 날 해당 시각부터 다음 절월(입춘이면 다음 해)로 바뀜, 255면 없음
+
+빌드:
+    python pillar_table.py --output data/saju_pillars.bin
+"""
+import argparse
+import mmap
+import os
+import struct
+from datetime import date
+from typing import Optional, Tuple
+
+MAGIC = b'SJPT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHII')
+HEADER_SIZE = 32
+HOUR_TABLE_OFFSET = HEADER_SIZE
+HOUR_TABLE_SIZE = 10 * 24
+RECORDS_OFFSET = HOUR_TABLE_OFFSET + HOUR_TABLE_SIZE
+RECORD_SIZE = 4
+NO_SWITCH = 255
+
+# 寅월 지지 순번 - 이 달로 바뀌면 연주도 바뀜 (입춘)
+_YIN = 2
+
+DEFAULT_START_YEAR = 1900
+DEFAULT_END_YEAR = 2100
+PILLAR_TABLE_PATH = os.environ.get(
+    'SAJU_PILLAR_TABLE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'saju_pillars.bin')
+)
+
+
+def sexagenary_index(stem: int, branch: int) -> int:
+    """천간/지지 순번 → 60갑자 순번"""
+    return (6 * stem - 5 * branch) % 60
+
+
+class PillarTable:
+    """mmap으로 연 간지 테이블 - (연, 월, 일, 시) → 연주/월주/일주/시주 60갑자 순번"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.start_year, self.end_year, self.epoch_ordinal, self.day_count = \
+            HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'지원하지 않는 간지 테이블 형식입니다: {path}')
+        if len(self._buffer) < RECORDS_OFFSET + self.day_count * RECORD_SIZE:
+            raise ValueError(f'간지 테이블 파일이 손상되었습니다: {path}')
+
+    @property
+    def buffer(self) -> mmap.mmap:
+        """읽기 전용 매핑 (대량 조회 시 NumPy 등에서 복사 없이 사용)"""
+        return self._buffer
+
+    def covers(self, year: int) -> bool:
+        return self.start_year <= year <= self.end_year
+
+    def lookup(self, year: int, month: int, day: int, hour: int) -> Tuple[int, int, int, int]:
+        """연주/월주/일주/시주 60갑자 순번"""
+        offset = date(year, month, day).toordinal() - self.epoch_ordinal
+        if not 0 <= offset < self.day_count:
+            raise ValueError(f'간지 테이블 범위({self.start_year}-{self.end_year}) 밖의 날짜입니다')
+        if not 0 <= hour <= 23:
+            raise ValueError('시간은 0-23 사이여야 합니다')
+
+        base = RECORDS_OFFSET + offset * RECORD_SIZE
+        year_index, month_index, day_index, switch_hour = self._buffer[base:base + RECORD_SIZE]
+        if hour >= switch_hour:
+            month_index = (month_index + 1) % 60
+            if month_index % 12 == _YIN:
+                year_index = (year_index + 1) % 60
+        hour_index = self._buffer[HOUR_TABLE_OFFSET + day_index % 10 * 24 + hour]
+        return year_index, month_index, day_index, hour_index
+
+    def prefetch(self) -> None:
+        """테이블 전체를 페이지 캐시에 올림 (init 단계에서 호출해 첫 조회의 page fault 제거)"""
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            self._buffer.madvise(mmap.MADV_WILLNEED)
+        for offset in range(0, len(self._buffer), mmap.PAGESIZE):
+            self._buffer[offset]
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def load_pillar_table(path: str = PILLAR_TABLE_PATH) -> Optional[PillarTable]:
+    """간지 테이블 로드 (파일이 없거나 형식이 다르면 None - 호출 측은 직접 계산)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return PillarTable(path)
+    except (OSError, ValueError) as e:
+        print(f"간지 테이블 로드 실패: {str(e)}")
+        return None
+
+
+def build_table(path: str, start_year: int = DEFAULT_START_YEAR, end_year: int = DEFAULT_END_YEAR) -> int:
+    """saju_engine 계산으로 간지 테이블 파일 생성 - 파일 크기(바이트) 반환"""
+    from saju_engine import compute_four_pillars
+
+    epoch = date(start_year, 1, 1)
+    day_count = date(end_year, 12, 31).toordinal() - epoch.toordinal() + 1
+
+    def indices(day: date, hour: int) -> Tuple[int, int, int, int]:
+        pillars = compute_four_pillars(day.year, day.month, day.day, hour)
+        return tuple(sexagenary_index(*pillars[key]) for key in ('year', 'month', 'day', 'hour'))
+
+    buffer = bytearray(RECORDS_OFFSET + day_count * RECORD_SIZE)
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, start_year, end_year, epoch.toordinal(), day_count)
+
+    # 시주는 일간과 시각으로만 결정 (23시는 다음 날 일간 기준)
+    for day_stem in range(10):
+        for hour in range(24):
+            branch = (hour + 1) // 2 % 12
+            stem = ((day_stem + (1 if hour == 23 else 0)) % 5 * 2 + branch) % 10
+            buffer[HOUR_TABLE_OFFSET + day_stem * 24 + hour] = sexagenary_index(stem, branch)
+
+    for offset in range(day_count):
+        day = date.fromordinal(epoch.toordinal() + offset)
+        year_index, month_index, day_index, _ = indices(day, 0)
+        switch_hour = NO_SWITCH
+        # 절입이 있는 날만 시각별로 확인 (월주가 바뀌는 첫 시각)
+        if indices(day, 23)[1] != month_index:
+            switch_hour = next(hour for hour in range(1, 24) if indices(day, hour)[1] != month_index)
+        base = RECORDS_OFFSET + offset * RECORD_SIZE
+        buffer[base:base + RECORD_SIZE] = bytes((year_index, month_index, day_index, switch_hour))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer)
+    os.replace(tmp_path, path)
+    return len(buffer)
+
+
+# import 시 한 번 매핑 - warm 컨테이너/워커 간 페이지 캐시 공유
+pillar_table = load_pillar_table()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='사주 간지 조회 테이블 생성')
+    parser.add_argument('--output', default=PILLAR_TABLE_PATH)
+    parser.add_argument('--start-year', type=int, default=DEFAULT_START_YEAR)
+    parser.add_argument('--end-year', type=int, default=DEFAULT_END_YEAR)
+    args = parser.parse_args()
+
+    size = build_table(args.output, args.start_year, args.end_year)
+    print(f"✅ 간지 테이블 생성: {args.output} ({size:,} bytes, {args.start_year}-{args.end_year})")
+
+
+if __name__ == '__main__':
+    main()
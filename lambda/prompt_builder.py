@@ -0,0 +1,87 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict
+
+# 동물 매핑 (한국어 -> 영어)
+ANIMAL_MAPPING = MappingProxyType({
+    '쥐': 'mouse', '소': 'ox', '호랑이': 'tiger', '토끼': 'rabbit',
+    '용': 'dragon', '뱀': 'snake', '말': 'horse', '양': 'sheep',
+    '원숭이': 'monkey', '닭': 'rooster', '개': 'dog', '돼지': 'pig'
+})
+
+# 오행별 배경 컨셉 매핑
+ELEMENT_BACKGROUNDS = MappingProxyType({
+    'wood': 'lush green forest background with ancient trees and glowing leaves',
+    'fire': 'volcanic landscape with glowing lava and flame effects in background',
+    'earth': 'mountain cave with crystal formations and earthy stone textures',
+    'metal': 'shimmering metallic temple with golden reflections and sharp geometric patterns',
+    'water': 'serene lake with waterfalls and misty clouds in mystical blue atmosphere',
+    'balanced': 'harmonious mystical landscape with elements of all five elements'
+})
+
+# 오행별 동물 스타일 매핑
+ELEMENT_STYLES = MappingProxyType({
+    'wood': 'nature-infused, with leaf patterns on fur/scales',
+    'fire': 'flame-like markings, glowing ember effects',
+    'earth': 'rocky texture, crystal embedded',
+    'metal': 'metallic sheen, armor-like scales',
+    'water': 'flowing, translucent, bubble effects',
+    'balanced': 'harmonious blend of all elemental features'
+})
+
+# 성별 스타일 매핑
+GENDER_STYLES = MappingProxyType({
+    'male': 'strong, powerful',
+    'female': 'elegant, graceful',
+    'neutral': 'balanced'
+})
+
+DEFAULT_BACKGROUND = 'mystical fantasy background'
+DEFAULT_STYLE = 'adorable'
+PROMPT_SUFFIX = 'kawaii anime art style, highly detailed, soft lighting, no humans'
+NEGATIVE_PROMPT = "human, person, people, man, woman, face, hands, realistic, dark, scary, ugly"
+
+# 기본 생성 설정 (1024x1024 단일 이미지)
+IMAGE_GENERATION_CONFIG = MappingProxyType({
+    "numberOfImages": 1,
+    "height": 1024,
+    "width": 1024,
+    "cfgScale": 8.0
+})
+
+
+@lru_cache(maxsize=4096)
+def build_prompt(color: str, animal: str, gender: str, dominant_element: str) -> str:
+    """Nova Canvas 프롬프트 생성 (입력 조합별 메모이제이션)"""
+    english_animal = ANIMAL_MAPPING.get(animal, animal)
+
+    # 포켓몬 스타일 기본 프롬프트
+    base_prompt = f"Cute chibi-style {english_animal} pokemon-like creature with {color} coloring"
+
+    # 배경 설정
+    background = ELEMENT_BACKGROUNDS.get(dominant_element, DEFAULT_BACKGROUND)
+
+    # 동물 스타일 요소들
+    style_elements = []
+
+    if dominant_element and dominant_element in ELEMENT_STYLES:
+        style_elements.append(ELEMENT_STYLES[dominant_element])
+
+    if gender in GENDER_STYLES:
+        style_elements.append(GENDER_STYLES[gender])
+
+    # 최종 프롬프트 조합
+    style_part = ', '.join(style_elements) if style_elements else DEFAULT_STYLE
+    return f"{base_prompt}, {style_part}, {background}, {PROMPT_SUFFIX}"
+
+
+def build_request_body(prompt: str) -> Dict[str, Any]:
+    """Nova Canvas TEXT_IMAGE 요청 본문 생성"""
+    return {
+        "taskType": "TEXT_IMAGE",
+        "textToImageParams": {
+            "text": prompt,
+            "negativeText": NEGATIVE_PROMPT
+        },
+        "imageGenerationConfig": dict(IMAGE_GENERATION_CONFIG)
+    }
@@ -0,0 +1,415 @@
+"""
+사주 API 공용 요청 검증/응답 생성
+
+Lambda handler(index.py)와 ASGI 서버(asgi_app.py)가 같은 요청 검증, Backend 없이 차트를 얻는 경로
+(warm 캐시 → Redis → 로컬 엔진), 응답 본문/헤더/압축, 오류 메시지를 사용한다.
+진입점은 Backend 호출(동기 세션 / 비동기 클라이언트)과 응답 객체 변환만 담당.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from saju_codec import SAJU_CODEC_MEDIA_TYPE, decode_chart
+from saju_engine import compute_saju_analysis
+from saju_store import (
+    SAJU_STORE_TTL, chart_key, chart_record, load_chart, local_chart_key, new_session_key, store_chart,
+    with_name
+)
+
+# 사주 결과 캐시 설정 (Backend 캐시 TTL 30분보다 짧게 유지)
+SAJU_CACHE_MAX_ENTRIES = int(os.environ.get('SAJU_CACHE_MAX_ENTRIES', '512'))
+SAJU_CACHE_TTL = int(os.environ.get('SAJU_CACHE_TTL', '600'))
+# Backend와 같은 갱신 임계값 - 저장 후 (TTL - 임계값)이 지나면 stale (needsRefresh)
+SAJU_REFRESH_THRESHOLD = 300
+
+# /saju/basic 응답 압축 - 이 크기 이상이고 클라이언트가 허용하면 br(brotli 패키지 있을 때)/gzip
+RESPONSE_COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+
+# /saju/basic fields 투영 그룹 - saju_analysis 안의 같은 위치만 남김 (name은 항상 포함)
+SAJU_FIELD_GROUPS = {
+    'pillars': (('translatedData', '사주팔자'), ('translatedData', '일주천간')),
+    'wuxing': (('translatedData', '오행'), ('wuxingAnalysis',)),
+    'zodiac': (('translatedData', '띠'), ('translatedData', '별자리')),
+    'tengods': (('translatedData', '십신'),),
+    'lunar': (('translatedData', '음력정보'),),
+    'raw': (('translatedData', '원본데이터'),),
+}
+
+# /saju/basic 요청 해시 헤더 - API Gateway 스테이지 캐시 키 (클라이언트가 같은 방식으로 계산해 전송)
+SAJU_REQUEST_HASH_HEADER = 'X-Saju-Request-Hash'
+
+# 사주 계산 위치 - backend: EC2/MCP 호출, local: 프로세스 내 엔진 (양력 입력만, 실패 시 backend)
+SAJU_ENGINE = os.environ.get('SAJU_ENGINE', 'backend').lower()
+
+# /saju/basic 응답은 바이너리 차트 형식 우선 (JSON 대비 수 배 작음)
+BACKEND_SAJU_HEADERS = {'Accept': f'{SAJU_CODEC_MEDIA_TYPE}, application/json;q=0.5'}
+
+# JSON 응답 공통 헤더 (Lambda 응답에 직접 포함, ASGI 서버는 CORS 미들웨어가 추가)
+JSON_HEADERS = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+# 브라우저에서 읽을 수 있게 노출하는 /saju/basic 응답 헤더
+SAJU_EXPOSE_HEADERS = ('X-Cache', 'X-Cache-Hits', 'X-Cache-Misses', SAJU_REQUEST_HASH_HEADER)
+
+# Backend 호출 실패 오류 메시지 (원인은 ": " 뒤에 붙임)
+BACKEND_SERVER_FAILED = 'Backend 서버 연결 실패'
+BACKEND_CONNECT_FAILED = 'Backend 연결 실패'
+SAJU_DATA_FAILED = '사주 데이터 처리 실패'
+
+
+class SajuApiError(Exception):
+    """Backend 호출/응답 처리 실패 (오류 응답의 error 메시지)"""
+
+
+def error_body(message, error):
+    """오류 응답 본문"""
+    return {'error': f'{message}: {str(error)}'}
+
+
+class TTLCache:
+    """크기 제한 LRU + TTL 캐시 (warm 컨테이너 내 프로세스 캐시)"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._items[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl=None):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def snapshot(self):
+        """적중/미스 수와 항목 수를 같은 시점에 읽은 값 (다른 스레드의 get과 섞이지 않음)"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._items)}
+
+    def __len__(self):
+        return len(self._items)
+
+
+saju_cache = TTLCache(SAJU_CACHE_MAX_ENTRIES, SAJU_CACHE_TTL)
+
+
+def prepare_basic_request(body, request_hash=''):
+    """/saju/basic 요청 검증 - birth_info, cache_key(차트 키), backend_payload, fields, debug, request_hash"""
+    birth_info, cache_key, backend_payload = prepare_basic_saju(body)
+    fields, debug = basic_saju_options(body)
+    return {
+        'birth_info': birth_info,
+        'cache_key': cache_key,
+        'backend_payload': backend_payload,
+        'fields': fields,
+        'debug': debug,
+        'request_hash': check_request_hash(body, fields, debug, request_hash)
+    }
+
+
+def find_saju_data(request):
+    """Backend 호출 없이 차트 응답 데이터 - (데이터, 캐시 상태) 또는 None (Redis 호출이 있어 블로킹)"""
+    cache_key = request['cache_key']
+    backend_payload = request['backend_payload']
+
+    # warm 컨테이너 캐시 확인 (차트 키는 Backend 왕복 없이 계산)
+    cached = saju_cache.get(cache_key)
+    if cached is not None:
+        return session_response(cache_key, cached, backend_payload), 'HIT'
+
+    # Redis 차트 직접 조회 (Backend 홉 생략)
+    stored = load_fresh_chart(cache_key)
+    if stored is not None:
+        cache_chart(cache_key, stored)
+        return session_response(cache_key, stored, backend_payload), 'HIT'
+
+    # 로컬 엔진 계산 (Backend/MCP 홉 생략) - MCP 차트 키의 warm 캐시에는 넣지 않음
+    local_data = compute_local_saju(request['birth_info'], backend_payload)
+    if local_data is not None:
+        return local_data, 'MISS'
+    return None
+
+
+def backend_saju_data(request, status_code, content_type, content, text):
+    """Backend /saju/basic 응답에서 차트 응답 데이터를 읽어 warm 캐시에 저장 (실패는 SajuApiError)"""
+    try:
+        if status_code != 200:
+            raise Exception(f"Backend API 오류: {status_code} - {text}")
+        backend_data = read_saju_response(content_type, content)
+    except Exception as e:
+        raise SajuApiError(f'{SAJU_DATA_FAILED}: {str(e)}') from e
+    # Backend가 간지 테이블로 계산한 차트(로컬 엔진 차트 키)는 MCP 차트 키의 warm 캐시에 넣지 않음
+    if backend_data.get('chart_key', request['cache_key']) == request['cache_key']:
+        cache_chart(request['cache_key'], backend_data)
+    return backend_data
+
+
+def render_basic_saju(request, data, cache_status, accept_encoding=''):
+    """/saju/basic 응답 (본문 바이트, 헤더) - 클라이언트가 허용하면 압축하고 Content-Encoding 추가"""
+    body = basic_saju_body(request['birth_info'], data, request['fields'], request['debug'])
+    content, encoding = compress_body(json.dumps(body, ensure_ascii=False).encode('utf-8'), accept_encoding)
+    headers = basic_saju_headers(cache_status, request['request_hash'])
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+    return content, headers
+
+
+def prepare_basic_saju(body):
+    """기본 사주 요청 검증 후 (birth_info, 차트 키, Backend 요청 본문) 반환"""
+    birth_info = validate_birth_info(body)
+    name = body.get('name', '')
+
+    if not name:
+        raise ValueError('name이 필요합니다')
+
+    # birth_info를 backend 형식으로 변환 - 세션 키는 여기서 발급해 Backend가 같은 키로 저장
+    backend_payload = {
+        'birthDate': f"{birth_info['year']}-{birth_info['month']:02d}-{birth_info['day']:02d}",
+        'birthTime': f"{birth_info['hour']:02d}:00",
+        'isLunar': birth_info.get('isLunar', False),
+        'gender': birth_info.get('gender', 'male'),
+        'name': name,
+        'cacheKey': new_session_key()
+    }
+    return birth_info, chart_key(birth_info), backend_payload
+
+
+def basic_saju_options(body):
+    """응답 옵션 (fields 투영 그룹 또는 None, debug 여부)"""
+    fields = body.get('fields') or None
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    if fields is not None:
+        unknown = [field for field in fields if field not in SAJU_FIELD_GROUPS]
+        if unknown:
+            raise ValueError(f"알 수 없는 fields입니다: {', '.join(map(str, unknown))} "
+                             f"(사용 가능: {', '.join(SAJU_FIELD_GROUPS)})")
+    debug = str(body.get('debug', '')).lower() in ('true', '1', 'yes')
+    return fields, debug
+
+
+def saju_request_hash(body, fields=None, debug=False):
+    """응답을 결정하는 요청 값(정규화한 출생 정보, 이름, 응답 옵션)의 해시"""
+    birth_info = body.get('birth_info', {})
+    canonical = json.dumps([
+        int(birth_info['year']),
+        int(birth_info['month']),
+        int(birth_info['day']),
+        int(birth_info['hour']),
+        bool(birth_info.get('isLunar', False)),
+        (birth_info.get('gender') or 'male').lower(),
+        str(birth_info.get('region') or ''),
+        body.get('name', ''),
+        sorted(fields or []),
+        debug
+    ], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def check_request_hash(body, fields, debug, request_hash=''):
+    """요청 해시 헤더 검증 - 본문과 다른 해시로 다른 사람의 응답이 캐시되지 않도록 불일치는 거부"""
+    expected = saju_request_hash(body, fields, debug)
+    if request_hash and request_hash.lower() != expected:
+        raise ValueError(f'{SAJU_REQUEST_HASH_HEADER}가 요청 본문과 일치하지 않습니다 (기대값: {expected})')
+    return expected
+
+
+def read_saju_response(content_type, content):
+    """Backend /saju/basic 응답 본문 (바이너리 차트 형식 또는 JSON)"""
+    if (content_type or '').startswith(SAJU_CODEC_MEDIA_TYPE):
+        return decode_chart(content)
+    return json.loads(content)
+
+
+def load_fresh_chart(cache_key):
+    """Redis에 저장된 차트 - 없거나 갱신 임박(stale)이면 None (Backend가 반환 후 백그라운드 갱신)"""
+    chart = load_chart(cache_key)
+    if chart is None or chart.get('needsRefresh'):
+        return None
+    if int(time.time()) - chart.get('timestamp', 0) > SAJU_STORE_TTL - SAJU_REFRESH_THRESHOLD:
+        return None
+    return chart
+
+
+def cache_chart(cache_key, saju_data):
+    """차트를 신선 구간 동안만 warm 캐시에 저장 - Backend가 stale로 표시한 차트는 저장하지 않음"""
+    if saju_data.get('needsRefresh'):
+        return
+    fresh_until = saju_data.get('timestamp', 0) + SAJU_STORE_TTL - SAJU_REFRESH_THRESHOLD
+    ttl = min(SAJU_CACHE_TTL, fresh_until - int(time.time()))
+    if ttl > 0:
+        saju_cache.set(cache_key, chart_record(saju_data), ttl)
+
+
+def session_response(cache_key, chart, backend_payload):
+    """캐시된 차트로 요청자 응답 생성 - 세션 저장 실패 시 차트 키를 cache_key로 반환"""
+    name = backend_payload['name']
+    session_key = backend_payload['cacheKey']
+    # 차트도 함께 다시 저장해 세션이 만료된 차트를 가리키지 않도록 함
+    stored = store_chart(cache_key, chart, session_key, name)
+    return {
+        'cache_key': session_key if stored else cache_key,
+        'chart_key': cache_key,
+        'cached': True,
+        'needsRefresh': False,
+        **with_name(chart, name)
+    }
+
+
+def compute_local_saju(birth_info, backend_payload):
+    """로컬 엔진으로 Backend /saju/basic과 같은 형태의 응답 생성 (사용할 수 없으면 None)
+
+    MCP 결과와 대조되지 않은 차트이므로 공유 MCP 차트 키가 아닌 로컬 엔진 차트 키에 저장한다.
+    """
+    if SAJU_ENGINE != 'local' or birth_info.get('isLunar', False):
+        return None
+
+    name = backend_payload['name']
+    saju_analysis = compute_saju_analysis(
+        int(birth_info['year']), int(birth_info['month']),
+        int(birth_info['day']), int(birth_info['hour']), name
+    )
+
+    # 상담 API가 세션 키로 조회하므로 Backend와 같은 형식으로 차트/세션을 Redis에 저장
+    session_key = backend_payload['cacheKey']
+    local_key = local_chart_key(birth_info)
+    if not store_chart(local_key, chart_record(saju_analysis), session_key, name):
+        return None
+
+    return {
+        'cache_key': session_key,
+        'chart_key': local_key,
+        'cached': False,
+        'needsRefresh': False,
+        'redis_connected': True,
+        **saju_analysis
+    }
+
+
+def basic_saju_headers(cache_status, request_hash=None):
+    stats = saju_cache.snapshot()
+    headers = {
+        **JSON_HEADERS,
+        'Access-Control-Expose-Headers': ', '.join(SAJU_EXPOSE_HEADERS),
+        'Vary': 'Accept-Encoding',
+        'X-Cache': cache_status,
+        'X-Cache-Hits': str(stats['hits']),
+        'X-Cache-Misses': str(stats['misses'])
+    }
+    if request_hash:
+        headers[SAJU_REQUEST_HASH_HEADER] = request_hash
+    return headers
+
+
+def basic_saju_body(birth_info, backend_data, fields=None, debug=False):
+    """기본 응답은 saju_analysis만 (rawData 사본 제외), debug면 Backend 응답 전체 포함"""
+    analysis = backend_data.get('data', {})
+    body = {
+        'cache_key': backend_data.get('cache_key'),
+        'chart_key': backend_data.get('chart_key'),
+        'birth_info': birth_info,
+        'saju_analysis': analysis if debug else project_analysis(analysis, fields)
+    }
+    if debug:
+        body['backend_response'] = backend_data
+    return body
+
+
+def project_analysis(analysis, fields=None):
+    """saju_analysis에서 rawData(원본데이터의 JSON 문자열 사본)를 빼고, fields가 있으면 해당 그룹만 남김"""
+    if not fields:
+        return {key: value for key, value in analysis.items() if key != 'rawData'}
+
+    projected = {'name': analysis.get('name')}
+    for field in fields:
+        for path in SAJU_FIELD_GROUPS[field]:
+            source, target = analysis, projected
+            for key in path[:-1]:
+                source = source.get(key) or {}
+                target = target.setdefault(key, {})
+            if path[-1] in source:
+                target[path[-1]] = source[path[-1]]
+    return projected
+
+
+def compress_body(content, accept_encoding):
+    """Accept-Encoding에 따라 br/gzip 압축 - (본문, Content-Encoding 또는 None)"""
+    if len(content) < RESPONSE_COMPRESS_MIN_BYTES or not accept_encoding:
+        return content, None
+    accepted = {}
+    for item in accept_encoding.lower().split(','):
+        name, _, params = item.strip().partition(';')
+        quality = params.strip()[2:] if params.strip().startswith('q=') else '1'
+        try:
+            accepted[name.strip()] = float(quality)
+        except ValueError:
+            accepted[name.strip()] = 0.0
+
+    def allowed(encoding):
+        return accepted.get(encoding, accepted.get('*', 0.0)) > 0
+
+    if allowed('br'):
+        try:
+            import brotli
+        except ImportError:
+            pass
+        else:
+            return brotli.compress(content, quality=5), 'br'
+    if allowed('gzip'):
+        return gzip.compress(content, compresslevel=6), 'gzip'
+    return content, None
+
+
+def validate_birth_info(body):
+    """사용자 정보 검증 (기본 사주 API용)"""
+    birth_info = body.get('birth_info', {})
+
+    # 필수 필드 검증
+    required_fields = ['year', 'month', 'day', 'hour']
+    for field in required_fields:
+        if field not in birth_info:
+            raise ValueError(f'{field}가 필요합니다')
+
+    # 범위 검증
+    year = birth_info['year']
+    month = birth_info['month']
+    day = birth_info['day']
+    hour = birth_info['hour']
+
+    if not (1900 <= year <= 2100):
+        raise ValueError('연도는 1900-2100 사이여야 합니다')
+    if not (1 <= month <= 12):
+        raise ValueError('월은 1-12 사이여야 합니다')
+    if not (1 <= day <= 31):
+        raise ValueError('일은 1-31 사이여야 합니다')
+    if not (0 <= hour <= 23):
+        raise ValueError('시간은 0-23 사이여야 합니다')
+
+    return birth_info
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+대량 사주 계산 (코호트 분석용)
+
+birth_info 행(year, month, day, hour, isLunar)을 열 단위 NumPy 배열로 받아
+간지 테이블(pillar_table) 조회와 오행 집계를 벡터 연산으로 처리한다.
+결과는 열 단위(년주/월주/일주/시주 + 오행 개수 + valid)로 반환/저장한다.
+
+- 음력 입력(isLunar)과 존재하지 않는 날짜/시각은 valid=False (간지 빈 값, 오행 0)
+- 테이블 범위(1900-2100) 밖의 양력 날짜는 saju_engine 직접 계산으로 처리
+
+사용 예:
+    python saju_bulk.py births.csv charts.parquet
+    python saju_bulk.py births.parquet charts.csv --keep-columns id,gender
+"""
+import argparse
+import csv
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from pillar_table import (
+    HOUR_TABLE_OFFSET, NO_SWITCH, RECORD_SIZE, RECORDS_OFFSET, pillar_table, sexagenary_index
+)
+from saju_engine import BRANCH_ELEMENTS, BRANCHES, ELEMENTS, STEM_ELEMENTS, STEMS, compute_four_pillars
+
+PILLAR_COLUMNS = ('year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar')
+# 오행 열 - MCP 五行 키와 같은 순서/이름
+WUXING_COLUMNS = tuple(ELEMENTS)
+INPUT_COLUMNS = ('year', 'month', 'day', 'hour')
+
+# 1970-01-01의 date.toordinal()
+_UNIX_EPOCH_ORDINAL = 719163
+_YIN = 2
+
+# 60갑자 순번 → 간지 문자열, 오행 순번 (-1은 계산 불가 행)
+_SEXAGENARY = np.array([STEMS[i % 10] + BRANCHES[i % 12] for i in range(60)] + [''])
+_STEM_ELEMENT_INDEX = np.array([ELEMENTS.index(e) for e in STEM_ELEMENTS])
+_BRANCH_ELEMENT_INDEX = np.array([ELEMENTS.index(e) for e in BRANCH_ELEMENTS])
+
+
+def _table_arrays():
+    """mmap된 간지 테이블을 복사 없이 NumPy 배열로 본다"""
+    if pillar_table is None:
+        return None
+    records = np.frombuffer(pillar_table.buffer, dtype=np.uint8, count=pillar_table.day_count * RECORD_SIZE,
+                            offset=RECORDS_OFFSET).reshape(-1, RECORD_SIZE)
+    hours = np.frombuffer(pillar_table.buffer, dtype=np.uint8, count=10 * 24,
+                          offset=HOUR_TABLE_OFFSET).reshape(10, 24)
+    return records, hours
+
+
+def bulk_pillar_indices(year: Sequence[int], month: Sequence[int], day: Sequence[int], hour: Sequence[int],
+                        is_lunar: Optional[Sequence[bool]] = None) -> np.ndarray:
+    """행별 연주/월주/일주/시주 60갑자 순번 (N×4, 계산 불가 행은 -1)"""
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+    hour = np.asarray(hour, dtype=np.int64)
+    count = len(year)
+    result = np.full((count, 4), -1, dtype=np.int16)
+
+    # 날짜 검증 - datetime64로 조립한 뒤 월이 넘어가면(2월 30일 등) 무효
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (hour >= 0) & (hour <= 23) \
+        & (year >= 1) & (year <= 9999)
+    if is_lunar is not None:
+        valid &= ~np.asarray(is_lunar, dtype=bool)
+    months = ((np.where(valid, year, 1970) - 1970) * 12 + np.where(valid, month, 1) - 1).astype('datetime64[M]')
+    dates = months.astype('datetime64[D]') + (np.where(valid, day, 1) - 1)
+    valid &= dates.astype('datetime64[M]') == months
+    ordinal = dates.astype(np.int64) + _UNIX_EPOCH_ORDINAL
+
+    tables = _table_arrays()
+    in_table = np.zeros(count, dtype=bool)
+    if tables is not None:
+        records, hour_table = tables
+        offset = ordinal - pillar_table.epoch_ordinal
+        in_table = valid & (offset >= 0) & (offset < pillar_table.day_count)
+        rows = np.nonzero(in_table)[0]
+        record = records[offset[rows]].astype(np.int16)
+        row_hour = hour[rows]
+
+        # 절입 시각 이후면 다음 절월, 인월로 바뀌면 연주도 다음 해
+        switched = (record[:, 3] != NO_SWITCH) & (row_hour >= record[:, 3])
+        month_index = np.where(switched, (record[:, 1] + 1) % 60, record[:, 1])
+        year_index = np.where(switched & (month_index % 12 == _YIN), (record[:, 0] + 1) % 60, record[:, 0])
+        result[rows, 0] = year_index
+        result[rows, 1] = month_index
+        result[rows, 2] = record[:, 2]
+        result[rows, 3] = hour_table[record[:, 2] % 10, row_hour]
+
+    # 테이블 범위 밖(또는 테이블 없음)은 행 단위 직접 계산
+    for row in np.nonzero(valid & ~in_table)[0]:
+        pillars = compute_four_pillars(int(year[row]), int(month[row]), int(day[row]), int(hour[row]))
+        result[row] = [sexagenary_index(*pillars[key]) for key in ('year', 'month', 'day', 'hour')]
+    return result
+
+
+def bulk_wuxing(indices: np.ndarray) -> np.ndarray:
+    """행별 오행 개수 (N×5, 木火土金水 순) - 천간 4자 + 지지 4자"""
+    count = len(indices)
+    valid = indices[:, 0] >= 0
+    elements = np.concatenate([
+        _STEM_ELEMENT_INDEX[indices % 10],
+        _BRANCH_ELEMENT_INDEX[indices % 12]
+    ], axis=1)
+    flat = (np.arange(count)[:, None] * len(ELEMENTS) + elements)[valid].ravel()
+    return np.bincount(flat, minlength=count * len(ELEMENTS)).reshape(count, len(ELEMENTS))
+
+
+def compute_bulk(year, month, day, hour, is_lunar=None) -> Dict[str, np.ndarray]:
+    """birth_info 열 → 사주 열 (년주/월주/일주/시주, 木火土金水 개수, valid)"""
+    indices = bulk_pillar_indices(year, month, day, hour, is_lunar)
+    wuxing = bulk_wuxing(indices)
+    columns = {name: _SEXAGENARY[indices[:, i]] for i, name in enumerate(PILLAR_COLUMNS)}
+    columns.update({name: wuxing[:, i] for i, name in enumerate(WUXING_COLUMNS)})
+    columns['valid'] = indices[:, 0] >= 0
+    return columns
+
+
+def parse_flags(values: Sequence[Any]) -> np.ndarray:
+    """isLunar 열 (true/1/yes, 빈 값은 False)"""
+    array = np.asarray(values)
+    if array.dtype.kind == 'b':
+        return array
+    return np.isin(np.char.lower(np.char.strip(array.astype(str))), ('true', '1', 'yes', 'y'))
+
+
+def parse_ints(values: Sequence[Any]) -> np.ndarray:
+    """정수 열 (빈 값/숫자가 아닌 값은 -1 → valid=False)"""
+    array = np.asarray(values)
+    if array.dtype.kind in 'iub':
+        return array.astype(np.int64)
+    if array.dtype.kind == 'f':
+        return np.where(np.isfinite(array), array, -1).astype(np.int64)
+    try:
+        return array.astype(np.int64)
+    except (TypeError, ValueError):
+        parsed = []
+        for value in array.tolist():
+            try:
+                parsed.append(int(float(value)))
+            except (TypeError, ValueError):
+                parsed.append(-1)
+        return np.array(parsed, dtype=np.int64)
+
+
+def compute_birth_columns(columns: Dict[str, Sequence[Any]]) -> Dict[str, np.ndarray]:
+    """birth_info 열 이름(year/month/day/hour/isLunar) 그대로의 입력으로 계산"""
+    missing = [name for name in INPUT_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"필수 열이 없습니다: {', '.join(missing)}")
+    is_lunar = parse_flags(columns['isLunar']) if 'isLunar' in columns else None
+    return compute_bulk(*(parse_ints(columns[name]) for name in INPUT_COLUMNS), is_lunar=is_lunar)
+
+
+def read_columns(path: str) -> Dict[str, Sequence[Any]]:
+    """CSV/Parquet 파일을 열 단위로 읽기 (pyarrow가 있으면 CSV도 pyarrow로 파싱)"""
+    try:
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError:
+        if path.endswith('.parquet'):
+            raise
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            values = list(zip(*reader)) or [()] * len(header)
+        return {name: list(column) for name, column in zip(header, values)}
+
+    table = pq.read_table(path) if path.endswith('.parquet') else pa_csv.read_csv(path)
+    return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+
+def write_columns(path: str, columns: Dict[str, Sequence[Any]]) -> None:
+    """열 단위 결과 저장 (.parquet, .npz, 그 외 CSV)"""
+    arrays = {name: np.asarray(values) for name, values in columns.items()}
+    if path.endswith('.npz'):
+        np.savez_compressed(path, **arrays)
+        return
+
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError:
+        if path.endswith('.parquet'):
+            raise
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(arrays)
+            writer.writerows(zip(*(values.tolist() for values in arrays.values())))
+        return
+
+    table = pa.table(arrays)
+    if path.endswith('.parquet'):
+        pq.write_table(table, path)
+    else:
+        pa_csv.write_csv(table, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CSV/Parquet birth_info 행의 대량 사주 계산')
+    parser.add_argument('input', help='입력 파일 (.csv/.parquet, year/month/day/hour[/isLunar] 열)')
+    parser.add_argument('output', help='출력 파일 (.parquet/.npz/.csv)')
+    parser.add_argument('--keep-columns', default='',
+                        help='결과에 그대로 포함할 입력 열 (쉼표 구분, 기본은 전체)')
+    args = parser.parse_args(argv)
+
+    if pillar_table is None:
+        print("⚠️  간지 테이블이 없어 행 단위로 직접 계산합니다 (python pillar_table.py로 생성)")
+
+    columns = read_columns(args.input)
+    started = time.perf_counter()
+    result = compute_birth_columns(columns)
+    elapsed = time.perf_counter() - started
+
+    keep = [c.strip() for c in args.keep_columns.split(',') if c.strip()] or list(columns)
+    write_columns(args.output, {**{name: columns[name] for name in keep}, **result})
+
+    rows = len(result['valid'])
+    invalid = rows - int(result['valid'].sum())
+    rate = rows / elapsed * 60 if elapsed else 0
+    print(f"✅ {rows:,}건 계산 ({elapsed:.2f}s, 분당 {rate:,.0f}건), 계산 불가 {invalid:,}건 → {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+사주 차트 캐시/전송 바이너리 형식 (backend/utils/sajuCodec.js와 동일)
+
+[0:3) magic b'SJC'  [3] 버전  [4] 압축 (0 없음, 1 deflate, 2 zstd)  [5:) MessagePack 본문
+본문에서는 data.rawData(translatedData.원본데이터를 다시 JSON 문자열로 담은 사본)를 빼고
+디코딩 시 원본데이터로 다시 만든다. b'SJC'로 시작하지 않는 값은 기존 JSON으로 읽는다.
+"""
+import json
+import os
+import zlib
+
+import msgpack
+
+SAJU_CODEC_MEDIA_TYPE = 'application/x-saju-chart'
+
+MAGIC = b'SJC'
+VERSION = 1
+COMPRESSION = {'none': 0, 'deflate': 1, 'zstd': 2}
+
+# 기본 압축 - zstd는 zstandard 패키지가 있을 때만 사용
+SAJU_CODEC_COMPRESSION = os.environ.get('SAJU_CACHE_COMPRESSION', 'deflate')
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError('zstd 압축을 사용하려면 zstandard 패키지가 필요합니다')
+    return zstandard
+
+
+def _compact_chart(chart):
+    """rawData 제거 (원본데이터에서 다시 만들 수 있음)"""
+    data = chart.get('data') if isinstance(chart, dict) else None
+    if not isinstance(data, dict) or not data.get('rawData') \
+            or '원본데이터' not in (data.get('translatedData') or {}):
+        return chart
+    return {**chart, 'data': {key: value for key, value in data.items() if key != 'rawData'}}
+
+
+def _expand_chart(chart):
+    data = chart.get('data') if isinstance(chart, dict) else None
+    if not isinstance(data, dict) or data.get('rawData') \
+            or '원본데이터' not in (data.get('translatedData') or {}):
+        return chart
+    text = json.dumps(data['translatedData']['원본데이터'], ensure_ascii=False, indent=2)
+    return {**chart, 'data': {**data, 'rawData': {'content': [{'type': 'text', 'text': text}], 'isError': False}}}
+
+
+def encode_chart(chart, compression=None):
+    """차트 → SJC 바이트"""
+    compression = compression or SAJU_CODEC_COMPRESSION
+    if compression not in COMPRESSION:
+        raise ValueError(f'지원하지 않는 압축 방식입니다: {compression}')
+
+    body = msgpack.packb(_compact_chart(chart), use_bin_type=True)
+    if compression == 'deflate':
+        body = zlib.compress(body)
+    elif compression == 'zstd':
+        body = _zstd().ZstdCompressor().compress(body)
+    return MAGIC + bytes((VERSION, COMPRESSION[compression])) + body
+
+
+def decode_chart(value):
+    """SJC 바이트(또는 기존 JSON 문자열/바이트) → 차트"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    if len(value) < 5 or value[:3] != MAGIC:
+        # 기존 JSON 형식
+        return json.loads(value)
+    if value[3] != VERSION:
+        raise ValueError(f'지원하지 않는 차트 형식 버전입니다: {value[3]}')
+
+    body = value[5:]
+    if value[4] == COMPRESSION['deflate']:
+        body = zlib.decompress(body)
+    elif value[4] == COMPRESSION['zstd']:
+        # 프레임에 원본 크기가 없을 수 있어 스트림 방식으로 해제
+        body = _zstd().ZstdDecompressor().decompressobj().decompress(body)
+    elif value[4] != COMPRESSION['none']:
+        raise ValueError(f'지원하지 않는 압축 방식입니다: {value[4]}')
+
+    return _expand_chart(msgpack.unpackb(body, raw=False, strict_map_key=False))
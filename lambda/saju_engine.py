@@ -0,0 +1,322 @@
+"""
+프로세스 내 사주 계산 엔진
+
+MCP get_bazi_details와 같은 형태(四柱/五行/十神/生肖/星座/日主)의 결과를 계산해
+Lambda → EC2 → MCP 홉 없이 /saju/basic 응답을 만든다.
+
+- 연주/월주: 절입 시각(태양 황경) 기준 (입춘에 해가 바뀌고 12절에 달이 바뀜)
+- 일주: 자정 기준 (23시 출생은 당일 일주, 시주 천간은 다음 날 기준 - 야자시)
+- 시각은 Asia/Seoul 고정 UTC+9 기준 (과거 서머타임/UTC+8:30 시기 보정 없음)
+- 태양 황경은 Meeus 저정밀 식(약 0.01°, 절입 시각 오차 수십 분 이내)
+- 음력 변환(農曆)은 포함하지 않음 - 음력 입력은 호출 측에서 Backend로 위임
+- 사전 계산 테이블(pillar_table, 1900-2100)이 있으면 간지는 테이블에서 O(1) 조회
+- 검증: 만세력 기준 사주(test/fixtures/saju_reference.json)로만 확인됨 - 실제 MCP 결과와의 대조는
+  backend/record-bazi-fixtures.js 녹화가 필요 (녹화 전까지 MCP와 값이 같다고 보장하지 않음)
+"""
+import json
+import math
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from pillar_table import pillar_table
+
+KST = timezone(timedelta(hours=9))
+
+# 천간/지지 (sajuTranslator.js와 같은 순서)
+STEMS = '甲乙丙丁戊己庚辛壬癸'
+BRANCHES = '子丑寅卯辰巳午未申酉戌亥'
+
+# 오행 - 천간/지지별 오행, 지지 본기(정기) 천간
+ELEMENTS = '木火土金水'
+STEM_ELEMENTS = '木木火火土土金金水水'
+BRANCH_ELEMENTS = '水土木木土火火土金金土水'
+BRANCH_MAIN_STEMS = '癸己甲乙戊丙丁己庚辛戊壬'
+
+SHENGXIAO = ('鼠', '牛', '虎', '兔', '龙', '蛇', '马', '羊', '猴', '鸡', '狗', '猪')
+
+# 12절 (인월 입춘부터) - 절입 황경은 315°부터 30°씩
+JIE_NAMES = ('立春', '驚蟄', '清明', '立夏', '芒種', '小暑', '立秋', '白露', '寒露', '立冬', '大雪', '小寒')
+LICHUN_LONGITUDE = 315.0
+
+# 십신 - [일간 대비 오행 관계][음양 같음/다름]
+# 관계: 0 같은 오행, 1 일간이 생함, 2 일간이 극함, 3 일간을 극함, 4 일간을 생함
+TEN_GODS = (
+    ('比肩', '劫财'),
+    ('食神', '伤官'),
+    ('偏财', '正财'),
+    ('七杀', '正官'),
+    ('偏印', '正印')
+)
+
+# 별자리 - (시작 월일, 이름), 양력 월일 기준
+CONSTELLATIONS = (
+    (120, '水瓶'), (219, '双鱼'), (321, '白羊'), (420, '金牛'),
+    (521, '双子'), (622, '巨蟹'), (723, '狮子'), (823, '处女'),
+    (923, '天秤'), (1024, '天蝎'), (1123, '射手'), (1222, '摩羯')
+)
+
+# 1900-01-01은 갑술(甲戌, 60갑자 10번째)일
+_DAY_PILLAR_EPOCH = date(1900, 1, 1)
+_DAY_PILLAR_EPOCH_INDEX = 10
+
+_J2000 = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+_TROPICAL_YEAR = 365.242189
+
+
+def sexagenary(index: int) -> str:
+    """60갑자 순번 → 간지 두 글자"""
+    return STEMS[index % 10] + BRANCHES[index % 12]
+
+
+def sun_longitude(moment: datetime) -> float:
+    """시각의 태양 겉보기 황경(도)"""
+    jd = moment.timestamp() / 86400.0 + _UNIX_EPOCH_JD
+    t = (jd - _J2000) / 36525.0
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = math.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    center = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * math.sin(m)
+              + (0.019993 - 0.000101 * t) * math.sin(2 * m)
+              + 0.000289 * math.sin(3 * m))
+    omega = math.radians(125.04 - 1934.136 * t)
+    return (l0 + center - 0.00569 - 0.00478 * math.sin(omega)) % 360.0
+
+
+@lru_cache(maxsize=1024)
+def solar_term(year: int, longitude: float) -> datetime:
+    """해당 연도에 태양 황경이 longitude에 도달하는 시각 (KST)"""
+    # 춘분(0°, 3월 20일경)에서 황경 차이만큼 이동한 날짜를 초기값으로 뉴턴 반복
+    offset = (longitude % 360.0) / 360.0 * _TROPICAL_YEAR
+    if longitude >= 280.0:
+        offset -= _TROPICAL_YEAR
+    moment = datetime(year, 3, 20, tzinfo=KST) + timedelta(days=offset)
+    for _ in range(6):
+        delta = (longitude - sun_longitude(moment) + 180.0) % 360.0 - 180.0
+        if abs(delta) < 1e-6:
+            break
+        moment += timedelta(days=delta / 360.0 * _TROPICAL_YEAR)
+    return moment.astimezone(KST)
+
+
+def jie_index(moment: datetime) -> int:
+    """시각이 속한 절월 순번 (0: 인월/입춘 ~ 11: 축월/소한)"""
+    return int(((sun_longitude(moment) - LICHUN_LONGITUDE) % 360.0) // 30.0)
+
+
+def ten_god(day_stem: int, stem: int) -> str:
+    """일간 대비 천간의 십신"""
+    relation = (ELEMENTS.index(STEM_ELEMENTS[stem]) - ELEMENTS.index(STEM_ELEMENTS[day_stem])) % 5
+    return TEN_GODS[relation][0 if day_stem % 2 == stem % 2 else 1]
+
+
+def constellation(month: int, day: int) -> str:
+    month_day = month * 100 + day
+    name = '摩羯'
+    for start, candidate in CONSTELLATIONS:
+        if month_day >= start:
+            name = candidate
+    return name
+
+
+def compute_four_pillars(year: int, month: int, day: int, hour: int) -> Dict[str, Any]:
+    """양력 생년월일시(KST)의 사주팔자 천간/지지 순번 (태양 황경 직접 계산)"""
+    moment = datetime(year, month, day, hour, tzinfo=KST)
+    month_no = jie_index(moment)
+
+    # 입춘 전 1-2월(자월/축월)은 전년도 간지
+    solar_year = year - 1 if month <= 2 and month_no >= 10 else year
+    year_index = (solar_year - 4) % 60
+
+    # 월간 - 연간 기준 인월 천간(甲己→丙, 乙庚→戊, ...)부터 순행
+    month_stem = (year_index % 10 * 2 + 2 + month_no) % 10
+    month_branch = (month_no + 2) % 12
+
+    day_index = (_DAY_PILLAR_EPOCH_INDEX + (date(year, month, day) - _DAY_PILLAR_EPOCH).days) % 60
+
+    # 시주 - 23시(야자시)는 다음 날 일간 기준 자시
+    hour_branch = (hour + 1) // 2 % 12
+    hour_day_stem = (day_index + (1 if hour == 23 else 0)) % 10
+    hour_stem = (hour_day_stem % 5 * 2 + hour_branch) % 10
+
+    return {
+        'year': (year_index % 10, year_index % 12),
+        'month': (month_stem, month_branch),
+        'day': (day_index % 10, day_index % 12),
+        'hour': (hour_stem, hour_branch),
+        'jie': month_no
+    }
+
+
+def four_pillars(year: int, month: int, day: int, hour: int) -> Dict[str, Any]:
+    """양력 생년월일시(KST)의 사주팔자 천간/지지 순번 - 테이블 범위 밖이면 직접 계산"""
+    if pillar_table is None or not pillar_table.covers(year):
+        return compute_four_pillars(year, month, day, hour)
+
+    indices = pillar_table.lookup(year, month, day, hour)
+    year_pillar, month_pillar, day_pillar, hour_pillar = ((index % 10, index % 12) for index in indices)
+    return {
+        'year': year_pillar,
+        'month': month_pillar,
+        'day': day_pillar,
+        'hour': hour_pillar,
+        'jie': (month_pillar[1] - 2) % 12
+    }
+
+
+def bazi_details(year: int, month: int, day: int, hour: int) -> Dict[str, Any]:
+    """MCP get_bazi_details 결과(content[0].text JSON)와 같은 키 구성의 사주 정보"""
+    pillars = four_pillars(year, month, day, hour)
+    stems = [pillars[key][0] for key in ('year', 'month', 'day', 'hour')]
+    branches = [pillars[key][1] for key in ('year', 'month', 'day', 'hour')]
+    day_stem = stems[2]
+
+    # 오행 - 천간 4자 + 지지 4자
+    wuxing = {element: 0 for element in ELEMENTS}
+    for stem in stems:
+        wuxing[STEM_ELEMENTS[stem]] += 1
+    for branch in branches:
+        wuxing[BRANCH_ELEMENTS[branch]] += 1
+
+    # 십신 - 지지는 본기 천간 기준
+    ten_gods = {
+        '年干': ten_god(day_stem, stems[0]),
+        '月干': ten_god(day_stem, stems[1]),
+        '時干': ten_god(day_stem, stems[3]),
+    }
+    for label, branch in zip(('年支', '月支', '日支', '時支'), branches):
+        ten_gods[label] = ten_god(day_stem, STEMS.index(BRANCH_MAIN_STEMS[branch]))
+
+    return {
+        '四柱': {
+            '年柱': STEMS[stems[0]] + BRANCHES[branches[0]],
+            '月柱': STEMS[stems[1]] + BRANCHES[branches[1]],
+            '日柱': STEMS[stems[2]] + BRANCHES[branches[2]],
+            '時柱': STEMS[stems[3]] + BRANCHES[branches[3]]
+        },
+        '五行': wuxing,
+        '十神': ten_gods,
+        '節氣': JIE_NAMES[pillars['jie']],
+        '生肖': SHENGXIAO[branches[0]],
+        '星座': constellation(month, day),
+        '日主': STEMS[day_stem]
+    }
+
+
+# sajuTranslator.js 번역 테이블
+TIANGAN_KO = {
+    '甲': '갑목', '乙': '을목', '丙': '병화', '丁': '정화', '戊': '무토',
+    '己': '기토', '庚': '경금', '辛': '신금', '壬': '임수', '癸': '계수'
+}
+DIZHI_KO = {
+    '子': '자(쥐)', '丑': '축(소)', '寅': '인(호랑이)', '卯': '묘(토끼)',
+    '辰': '진(용)', '巳': '사(뱀)', '午': '오(말)', '未': '미(양)',
+    '申': '신(원숭이)', '酉': '유(닭)', '戌': '술(개)', '亥': '해(돼지)'
+}
+SHENGXIAO_KO = {
+    '鼠': '쥐', '牛': '소', '虎': '호랑이', '兔': '토끼', '龙': '용', '蛇': '뱀',
+    '马': '말', '羊': '양', '猴': '원숭이', '鸡': '닭', '狗': '개', '猪': '돼지'
+}
+CONSTELLATION_KO = {
+    '水瓶': '물병자리', '双鱼': '물고기자리', '白羊': '양자리', '金牛': '황소자리',
+    '双子': '쌍둥이자리', '巨蟹': '게자리', '狮子': '사자자리', '处女': '처녀자리',
+    '天秤': '천칭자리', '天蝎': '전갈자리', '射手': '사수자리', '摩羯': '염소자리'
+}
+LUNAR_MONTH_KO = {
+    '正月': '정월', '二月': '이월', '三月': '삼월', '四月': '사월', '五月': '오월', '六月': '유월',
+    '七月': '칠월', '八月': '팔월', '九月': '구월', '十月': '시월', '十一月': '십일월', '腊月': '섣달'
+}
+TEN_GODS_KO = {
+    '比肩': '비견', '劫财': '겁재', '食神': '식신', '伤官': '상관', '偏财': '편재',
+    '正财': '정재', '七杀': '편관', '正官': '정관', '偏印': '편인', '正印': '정인'
+}
+
+
+def translate_gan_zhi(gan_zhi):
+    if not gan_zhi or len(gan_zhi) != 2:
+        return gan_zhi
+    return TIANGAN_KO.get(gan_zhi[0], gan_zhi[0]) + DIZHI_KO.get(gan_zhi[1], gan_zhi[1])
+
+
+def _defined(values: Dict[str, Any]) -> Dict[str, Any]:
+    # JSON.stringify가 undefined 필드를 생략하는 동작과 맞춤
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def translate_saju_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """sajuTranslator.js translateSajuResult의 Python 포팅 (MCP 결과 JSON → 한국어)"""
+    pillars = data.get('四柱') or {}
+    wuxing = data.get('五行') or {}
+    lunar = data.get('農曆') or {}
+    translated = {
+        '사주팔자': _defined({
+            '년주': translate_gan_zhi(pillars.get('年柱')),
+            '월주': translate_gan_zhi(pillars.get('月柱')),
+            '일주': translate_gan_zhi(pillars.get('日柱')),
+            '시주': translate_gan_zhi(pillars.get('時柱'))
+        }),
+        '오행': {
+            '목': wuxing.get('木') or 0,
+            '화': wuxing.get('火') or 0,
+            '토': wuxing.get('土') or 0,
+            '금': wuxing.get('金') or 0,
+            '수': wuxing.get('水') or 0
+        },
+        '띠': SHENGXIAO_KO.get(data.get('生肖'), data.get('生肖')),
+        '별자리': CONSTELLATION_KO.get(data.get('星座'), data.get('星座')),
+        '음력정보': _defined({
+            '음력년': lunar.get('農曆年'),
+            '음력월': lunar.get('農曆月'),
+            '음력일': lunar.get('農曆日'),
+            '윤달여부': '윤달' if lunar.get('是否閏月') else '평달',
+            '월이름': LUNAR_MONTH_KO.get(lunar.get('農曆月名'), lunar.get('農曆月名'))
+        }),
+        '일주천간': TIANGAN_KO.get(data.get('日主'), data.get('日主')),
+        '십신': ({key: TEN_GODS_KO.get(value, value) for key, value in data['十神'].items()}
+                 if data.get('十神') is not None else None),
+        '원본데이터': data
+    }
+    return _defined(translated)
+
+
+def analyze_wuxing(wuxing: Dict[str, int]) -> List[str]:
+    """sajuTranslator.js analyzeWuxing의 Python 포팅"""
+    total = sum(wuxing.values())
+    analysis = []
+    for element, count in wuxing.items():
+        percentage = f"{count / total * 100:.1f}" if total else 'NaN'
+        if count == 0:
+            strength = '부족'
+        elif count == 1:
+            strength = '약함'
+        elif count == 2:
+            strength = '보통'
+        else:
+            strength = '강함'
+        analysis.append(f"{element}: {count}개 ({percentage}%) - {strength}")
+    return analysis
+
+
+def compute_saju_analysis(year: int, month: int, day: int, hour: int, name: str = '') -> Dict[str, Any]:
+    """Backend /saju/basic의 sajuAnalysis와 같은 형태의 결과 생성"""
+    details = bazi_details(year, month, day, hour)
+    translated = translate_saju_result(details)
+    return {
+        'success': True,
+        'data': {
+            'name': name or '익명',
+            'translatedData': translated,
+            'wuxingAnalysis': analyze_wuxing(translated['오행']),
+            'rawData': {
+                'content': [
+                    {
+                        'type': 'text',
+                        'text': json.dumps(details, ensure_ascii=False, indent=2)
+                    }
+                ],
+                'isError': False
+            }
+        },
+        'timestamp': int(time.time())
+    }
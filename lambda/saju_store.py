@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import uuid
+
+from saju_codec import decode_chart, encode_chart
+
+# Backend와 같은 Redis (상담 API가 세션/차트 키로 사주 데이터를 조회)
+REDIS_HOST = os.environ.get('REDIS_HOST', '')
+REDIS_PORT = int(os.environ.get('REDIS_PORT', '6379'))
+REDIS_TIMEOUT = float(os.environ.get('REDIS_TIMEOUT', '1'))
+# 복제 그룹 읽기 엔드포인트 (차트 조회는 복제본, 저장은 primary) / 클러스터 모드 (REDIS_HOST = 구성 엔드포인트)
+REDIS_READER_HOST = os.environ.get('REDIS_READER_HOST', '')
+REDIS_CLUSTER_MODE = os.environ.get('REDIS_CLUSTER_MODE', 'false').lower() == 'true'
+
+# Backend /saju/basic 캐시 TTL과 동일
+SAJU_STORE_TTL = 1800
+
+# 키 형식 - backend/utils/sajuKeys.js와 동일
+# 차트: 정규화한 생년월일시 해시 (이름 무관, 같은 입력이면 같은 키)
+# 세션: 사용자 요청마다 발급, 차트 키와 이름을 가리킴
+CHART_KEY_PREFIX = 'saju:chart:v1:'
+# 로컬 엔진(간지 테이블) 차트 - MCP 결과와 대조되지 않았으므로 MCP 차트 키와 분리해 공유 캐시로 제공하지 않음
+LOCAL_CHART_KEY_PREFIX = 'saju:chart:local:v1:'
+SESSION_KEY_PREFIX = 'saju:session:'
+
+_RESPONSE_ONLY_FIELDS = ('cache_key', 'chart_key', 'cached', 'needsRefresh', 'redis_connected')
+
+_redis_client = None
+_reader_client = None
+
+
+def get_redis():
+    """모듈 전역 Redis 클라이언트 (REDIS_HOST 미설정 시 None)"""
+    global _redis_client
+    if _redis_client is None and REDIS_HOST:
+        if REDIS_CLUSTER_MODE:
+            # 생성 시 슬롯 정보를 조회하므로 연결 실패는 호출한 쪽에서 처리
+            from redis.cluster import RedisCluster
+            _redis_client = RedisCluster(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                read_from_replicas=True,
+                socket_connect_timeout=REDIS_TIMEOUT,
+                socket_timeout=REDIS_TIMEOUT
+            )
+        else:
+            import redis
+            _redis_client = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                socket_connect_timeout=REDIS_TIMEOUT,
+                socket_timeout=REDIS_TIMEOUT
+            )
+    return _redis_client
+
+
+def get_redis_reader():
+    """조회용 Redis 클라이언트 - 읽기 엔드포인트가 있으면 복제본, 없으면 get_redis()"""
+    global _reader_client
+    if not REDIS_READER_HOST or REDIS_CLUSTER_MODE:
+        return get_redis()
+    if _reader_client is None:
+        import redis
+        _reader_client = redis.Redis(
+            host=REDIS_READER_HOST,
+            port=REDIS_PORT,
+            socket_connect_timeout=REDIS_TIMEOUT,
+            socket_timeout=REDIS_TIMEOUT
+        )
+    return _reader_client
+
+
+def ping_redis():
+    """Redis 연결(읽기 엔드포인트 포함)을 미리 열기 (REDIS_HOST 미설정 또는 실패 시 False)"""
+    try:
+        client = get_redis()
+        if client is None:
+            return False
+        reader = get_redis_reader()
+        return bool(client.ping()) and (reader is client or bool(reader.ping()))
+    except Exception as e:
+        print(f"Redis 연결 실패: {str(e)}")
+        return False
+
+
+def load_chart(chart_cache_key):
+    """Redis에서 차트 직접 조회 (복제본 우선) - 없거나 조회 실패 시 None"""
+    try:
+        client = get_redis_reader()
+        if client is None:
+            return None
+        return decode_chart(client.get(chart_cache_key))
+    except Exception as e:
+        print(f"Redis 조회 실패: {str(e)}")
+        return None
+
+
+def chart_key(birth_info):
+    """생년월일시/음력 여부/성별로 결정되는 차트 캐시 키"""
+    canonical = '|'.join((
+        str(int(birth_info['year'])),
+        str(int(birth_info['month'])),
+        str(int(birth_info['day'])),
+        str(int(birth_info['hour'])),
+        '1' if birth_info.get('isLunar', False) else '0',
+        (birth_info.get('gender') or 'male').lower()
+    ))
+    return CHART_KEY_PREFIX + hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def local_chart_key(birth_info):
+    """로컬 엔진 차트 키 - 같은 해시를 로컬 엔진 네임스페이스에 둠"""
+    return LOCAL_CHART_KEY_PREFIX + chart_key(birth_info)[len(CHART_KEY_PREFIX):]
+
+
+def new_session_key():
+    return SESSION_KEY_PREFIX + uuid.uuid4().hex
+
+
+def chart_record(saju_analysis):
+    """차트 저장용 사본 - 이름과 응답 전용 필드(키/캐시 상태) 제거"""
+    record = {key: value for key, value in saju_analysis.items() if key not in _RESPONSE_ONLY_FIELDS}
+    record['data'] = {key: value for key, value in saju_analysis.get('data', {}).items() if key != 'name'}
+    return record
+
+
+def with_name(chart, name):
+    """차트에 요청자 이름을 붙인 응답용 사본"""
+    return {**chart, 'data': {**chart.get('data', {}), 'name': name or '익명'}}
+
+
+def store_chart(chart_cache_key, chart, session_key=None, name=''):
+    """차트와 세션 → 차트 매핑을 한 번의 왕복으로 저장 - 저장 실패 시 False"""
+    try:
+        client = get_redis()
+        if client is None:
+            return False
+        pipeline = client.pipeline(transaction=False)
+        pipeline.setex(chart_cache_key, SAJU_STORE_TTL, encode_chart(chart))
+        if session_key:
+            session = {'chart_key': chart_cache_key, 'name': name}
+            pipeline.setex(session_key, SAJU_STORE_TTL, json.dumps(session, ensure_ascii=False))
+        pipeline.execute()
+        return True
+    except Exception as e:
+        print(f"Redis 저장 실패: {str(e)}")
+        return False
@@ -0,0 +1,94 @@
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class FlightStats:
+    """single-flight 통계 - leaders: 실제 실행 수, coalesced: 합류한 중복 요청 수"""
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+
+    def record(self, shared: bool) -> None:
+        with self._lock:
+            if shared:
+                self.coalesced += 1
+            else:
+                self.leaders += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'leaders': self.leaders, 'coalesced': self.coalesced}
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """동일 키로 동시에 들어온 호출을 하나의 실행으로 합치는 스레드용 single-flight"""
+
+    def __init__(self):
+        self.stats = FlightStats()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """fn 실행 결과와 다른 호출의 결과를 공유했는지 여부 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self.stats.record(True)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        self.stats.record(False)
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class AsyncSingleFlight:
+    """이벤트 루프 내 동일 키 코루틴 호출을 하나로 합치는 asyncio용 single-flight"""
+
+    def __init__(self):
+        self.stats = FlightStats()
+        self._calls: Dict[Hashable, 'asyncio.Future'] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        # 스레드용 SingleFlight만 쓰는 Lambda에서는 asyncio import(~50ms)를 하지 않음
+        import asyncio
+
+        task = self._calls.get(key)
+        shared = task is not None
+        self.stats.record(shared)
+        if not shared:
+            # 공유 작업은 별도 태스크로 실행 - 먼저 온 요청이 취소되어도 합류한 요청은 결과를 받음
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Hashable, task: 'asyncio.Future') -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 대기하던 요청이 모두 취소된 경우 조회되지 않은 예외 경고 방지
+        if not task.cancelled():
+            task.exception()
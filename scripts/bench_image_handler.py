@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+이미지 생성 Lambda warm 호출 오버헤드 마이크로 벤치마크
+
+Bedrock 호출 자체를 제외한 호출당 준비 비용(프롬프트 테이블 구성 + Bedrock 클라이언트 생성)을
+기존 방식(매 호출마다 생성)과 현재 방식(모듈 상수 + 메모이제이션 + 전역 클라이언트)으로 비교한다.
+
+사용법:
+    python scripts/bench_image_handler.py --iterations 200
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import boto3  # noqa: E402
+
+from image_generator import ZODIAC_ANIMALS, get_bedrock_client  # noqa: E402
+from prompt_builder import build_prompt, build_request_body  # noqa: E402
+
+
+def legacy_prepare(color, animal, gender, dominant_element):
+    """변경 전 lambda_handler의 호출당 준비 과정 재현"""
+    animal_mapping = {
+        '쥐': 'mouse', '소': 'ox', '호랑이': 'tiger', '토끼': 'rabbit',
+        '용': 'dragon', '뱀': 'snake', '말': 'horse', '양': 'sheep',
+        '원숭이': 'monkey', '닭': 'rooster', '개': 'dog', '돼지': 'pig'
+    }
+    element_backgrounds = {
+        'wood': 'lush green forest background with ancient trees and glowing leaves',
+        'fire': 'volcanic landscape with glowing lava and flame effects in background',
+        'earth': 'mountain cave with crystal formations and earthy stone textures',
+        'metal': 'shimmering metallic temple with golden reflections and sharp geometric patterns',
+        'water': 'serene lake with waterfalls and misty clouds in mystical blue atmosphere',
+        'balanced': 'harmonious mystical landscape with elements of all five elements'
+    }
+    element_styles = {
+        'wood': 'nature-infused, with leaf patterns on fur/scales',
+        'fire': 'flame-like markings, glowing ember effects',
+        'earth': 'rocky texture, crystal embedded',
+        'metal': 'metallic sheen, armor-like scales',
+        'water': 'flowing, translucent, bubble effects',
+        'balanced': 'harmonious blend of all elemental features'
+    }
+    gender_styles = {
+        'male': 'strong, powerful',
+        'female': 'elegant, graceful',
+        'neutral': 'balanced'
+    }
+    english_animal = animal_mapping.get(animal, animal)
+    base_prompt = f"Cute chibi-style {english_animal} pokemon-like creature with {color} coloring"
+    background = element_backgrounds.get(dominant_element, 'mystical fantasy background')
+    style_elements = []
+    if dominant_element and dominant_element in element_styles:
+        style_elements.append(element_styles[dominant_element])
+    if gender in gender_styles:
+        style_elements.append(gender_styles[gender])
+    style_part = ', '.join(style_elements) if style_elements else 'adorable'
+    prompt = f"{base_prompt}, {style_part}, {background}, kawaii anime art style, highly detailed, soft lighting, no humans"
+    bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
+    return prompt, bedrock
+
+
+def current_prepare(color, animal, gender, dominant_element):
+    """현재 lambda_handler의 호출당 준비 과정"""
+    prompt = build_prompt(color, animal, gender, dominant_element)
+    build_request_body(prompt)
+    return prompt, get_bedrock_client()
+
+
+def measure(fn, inputs, iterations):
+    samples = []
+    for args in itertools.islice(itertools.cycle(inputs), iterations):
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'mean': sum(samples) / len(samples),
+        'p50': samples[len(samples) // 2],
+        'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이미지 Lambda warm 호출 오버헤드 벤치마크')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    inputs = [
+        (color, animal, gender, element)
+        for color in ('청색', '적색')
+        for animal in ZODIAC_ANIMALS
+        for gender in ('male', 'female')
+        for element in ('fire', 'water')
+    ]
+
+    # 첫 호출(cold) 비용은 제외하고 warm 상태만 비교
+    legacy_prepare(*inputs[0])
+    current_prepare(*inputs[0])
+
+    results = {
+        'before (per-call tables + client)': measure(legacy_prepare, inputs, args.iterations),
+        'after (module tables + memo + shared client)': measure(current_prepare, inputs, args.iterations)
+    }
+
+    print(f"⏱  warm 호출당 준비 오버헤드 ({args.iterations}회, ms)")
+    for name, stats in results.items():
+        print(f"  {name:46s} mean={stats['mean']:.3f} p50={stats['p50']:.3f} p99={stats['p99']:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Lambda handler 모듈 import 시간 벤치마크 (cold start 초기화 비용)
+
+handler 모듈마다 새 프로세스에서 `python -X importtime -c "import <모듈>"`을 반복 실행해
+전체 import 시간(중앙값)과 모듈별 누적/자체 비용 상위 항목을 출력한다.
+saju handler는 Backend 전송 방식(requests / http.client)별로 따로 측정한다.
+
+사용법:
+    python scripts/bench_lambda_imports.py --repeat 7 --top 10
+    python scripts/bench_lambda_imports.py --target saju:http.client
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda')
+
+# 이름: (모듈, 추가 환경 변수)
+TARGETS = {
+    'saju:requests': ('index', {'BACKEND_TRANSPORT': 'requests'}),
+    'saju:http.client': ('index', {'BACKEND_TRANSPORT': 'http.client'}),
+    'image': ('image_generator', {}),
+}
+
+
+def measure(module, env):
+    """한 번의 새 프로세스 import - {모듈: (자체 us, 누적 us, 깊이)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=LAMBDA_DIR, env={**os.environ, **env, 'PYTHONDONTWRITEBYTECODE': '1'},
+        capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def report(label, module, env, repeat, top):
+    runs = [measure(module, env) for _ in range(repeat)]
+    totals = [run[module][1] for run in runs]
+
+    cumulative = defaultdict(list)
+    own = defaultdict(list)
+    for run in runs:
+        for name, (self_us, cumulative_us, depth) in run.items():
+            own[name].append(self_us)
+            # handler 모듈이 직접 import한 모듈(깊이 1)만 누적 비용으로 비교
+            if depth == 1:
+                cumulative[name].append(cumulative_us)
+
+    print(f"\n📦 {label} (import {module}) - 중앙값 {statistics.median(totals) / 1000:.1f}ms "
+          f"(최소 {min(totals) / 1000:.1f}ms, {repeat}회)")
+    print("   직접 import 누적 비용:")
+    for name, values in sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))[:top]:
+        print(f"     {statistics.median(values) / 1000:8.1f}ms  {name}")
+    print("   자체 비용 상위 모듈:")
+    for name, values in sorted(own.items(), key=lambda item: -statistics.median(item[1]))[:top]:
+        print(f"     {statistics.median(values) / 1000:8.1f}ms  {name}")
+    return statistics.median(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lambda handler 모듈 import 시간 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5, help='대상별 반복 횟수 (새 프로세스)')
+    parser.add_argument('--top', type=int, default=8, help='출력할 상위 모듈 수')
+    parser.add_argument('--target', action='append', choices=sorted(TARGETS),
+                        help='측정 대상 (여러 번 지정 가능, 기본은 전체)')
+    args = parser.parse_args()
+
+    medians = {}
+    for label in args.target or TARGETS:
+        module, env = TARGETS[label]
+        try:
+            medians[label] = report(label, module, env, args.repeat, args.top)
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ {label}: import 실패\n{e.stderr.strip().splitlines()[-1]}")
+
+    print("\n📊 요약")
+    for label, median in medians.items():
+        print(f"   {label:20s} {median / 1000:8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -44,15 +44,15 @@ def deploy():
     # 출력에서 URL 추출
     api_url = None
     backend_url = None
-    backend_ip = None
+    backend_service = None
     
     for line in output.split('\n'):
         if "ApiGatewayUrl" in line and "=" in line:
             api_url = line.split("=")[1].strip()
         elif "BackendUrl" in line and "=" in line:
             backend_url = line.split("=")[1].strip()
-        elif "BackendPublicIP" in line and "=" in line:
-            backend_ip = line.split("=")[1].strip()
+        elif "BackendService" in line and "=" in line:
+            backend_service = line.split("=")[1].strip()
     
     print(f"\n✅ 배포 완료!")
     if api_url:
@@ -63,27 +63,9 @@ def deploy():
         print(f"🚀 Backend 서버: {backend_url}")
         print(f"🔍 Backend Health: {backend_url}/health")
     
-    if backend_ip:
-        print(f"\n💻 Backend 배포 대기 중... (IP: {backend_ip})")
-        print("🕰️ EC2 인스턴스가 시작되고 Docker 컴포즈가 실행될 때까지 3-5분 소요")
-        
-        # Backend 서버 상태 확인
-        import time
-        import requests
-        
-        print("🔍 Backend 서버 상태 확인 중...")
-        for i in range(30):  # 5분 대기
-            try:
-                response = requests.get(f"http://{backend_ip}:3001/health", timeout=5)
-                if response.status_code == 200:
-                    print(f"✅ Backend 서버 준비 완료! ({i*10}초 소요)")
-                    break
-            except:
-                pass
-            print(f"⏳ Backend 서버 시작 대기 중... ({i*10}/300초)")
-            time.sleep(10)
-        else:
-            print("⚠️ Backend 서버 상태 확인 시간 초과. 수동으로 확인해주세요.")
+    if backend_service:
+        # cdk deploy는 ECS 서비스가 안정 상태(헬스 체크 통과)가 될 때까지 대기
+        print(f"\n💻 Backend 서비스: {backend_service} (내부 ALB 뒤 Fargate 태스크, /health 헬스 체크)")
 
     # 테스트 예제 출력
     print("\n📋 테스트 예제:")
@@ -105,7 +87,7 @@ curl -X POST {api_url}saju/basic \\
     
     if backend_url:
         print(f"""
-# Backend 직접 테스트
+# Backend 직접 테스트 (내부 ALB - VPC 안에서만 접근 가능)
 curl -X POST {backend_url}/api/saju \\
   -H "Content-Type: application/json" \\
   -d '{{
@@ -300,25 +282,22 @@ def deploy_backend_only():
     """백엔드만 재배포 (개발용)"""
     print("🚀 Backend 서버 재배포...")
     
-    # CDK 출력에서 Backend IP 가져오기
+    # backend/ 이미지가 바뀌면 cdk deploy가 새 이미지로 태스크를 순차 교체 (실패 시 자동 롤백)
     cdk_dir = os.path.join(os.getcwd(), "cdk")
     try:
         output = run_command("cdk deploy --require-approval never --outputs-file outputs.json", cwd=cdk_dir)
         
-        # outputs.json에서 IP 추출
+        # outputs.json에서 서비스 이름 추출
         import json
         with open(os.path.join(cdk_dir, "outputs.json"), 'r') as f:
             outputs = json.load(f)
         
-        backend_ip = outputs.get('YedamoStack', {}).get('BackendPublicIP')
-        if not backend_ip:
-            print("❌ Backend IP를 찾을 수 없습니다.")
+        backend_service = outputs.get('YedamoStack', {}).get('BackendService')
+        if not backend_service:
+            print("❌ Backend 서비스를 찾을 수 없습니다.")
             return
         
-        print(f"💻 Backend IP: {backend_ip}")
-        print("🕰️ SSH로 연결하여 수동 재배포하세요:")
-        print(f"ssh -i yedamo-key-pair.pem ec2-user@{backend_ip}")
-        print("cd yedamo-aws-hackathon/backend && docker-compose down && docker-compose up -d --build")
+        print(f"✅ Backend 서비스 재배포 완료: {backend_service}")
         
     except Exception as e:
         print(f"❌ Backend 재배포 실패: {e}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+상담 답변 캐시 키 테스트 (backend/utils/answerCache.js, node 필요)
+
+- normalizeQuestion: 공백/문장부호/기호 제거, 전각·반각 통일, 소문자화
+- questionIntent: 정형 질문("[기간][주제운][조사/맺음말]")만 의도로 묶고 나머지는 정규화 원문
+- answerCacheKey: 차트별로 분리, 같은 의도는 같은 키
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = os.path.join(ROOT, 'backend', 'utils', 'answerCache.js')
+
+if shutil.which('node') is None:
+    if __name__ == '__main__':
+        print("⚠️ node가 없어 답변 캐시 테스트를 건너뜁니다")
+        exit(0)
+    pytest.skip("node가 없어 답변 캐시 테스트를 건너뜁니다", allow_module_level=True)
+
+
+def run_node(function, calls):
+    """answerCache.js의 함수를 인자 목록마다 호출한 결과"""
+    script = (
+        f"import * as cache from {json.dumps('file://' + MODULE)};"
+        "let input = '';"
+        "process.stdin.on('data', (chunk) => { input += chunk; });"
+        "process.stdin.on('end', () => {"
+        f"  const results = JSON.parse(input).map((args) => cache[{json.dumps(function)}](...args));"
+        "  process.stdout.write(JSON.stringify(results));"
+        "});"
+    )
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e', script],
+        input=json.dumps(calls, ensure_ascii=False), capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    return json.loads(result.stdout)
+
+
+def intents(*questions):
+    return run_node('questionIntent', [[question] for question in questions])
+
+
+def test_normalize_question():
+    questions = ['올해 운세는 어떤가요?', '  올해운세는, 어떤가요!! ', '올해　운세는？어떤가요', 'ＡＢＣ 운세~', '']
+    assert run_node('normalizeQuestion', [[question] for question in questions]) == [
+        '올해운세는어떤가요', '올해운세는어떤가요', '올해운세는어떤가요', 'abc운세', ''
+    ]
+
+
+def test_canonical_questions_share_intent():
+    assert intents('올해 운세는 어떤가요?', '올해 운세가 궁금해요!', '금년 운세', '올해운세 알려주세요') == \
+        ['intent:this_year:general'] * 4
+    assert intents('직장운이 궁금합니다.', '직업운은 어때요?') == ['intent:any:career'] * 2
+    assert intents('내년 재물운 알려주세요', '이번 달 연애운은 어떤가요?', '건강운') == \
+        ['intent:next_year:wealth', 'intent:this_month:love', 'intent:any:health']
+
+
+def test_specific_questions_keep_text():
+    """키워드가 겹쳐도 구체적인 질문은 서로 다른 키"""
+    results = intents('이직할까요?', '승진할 수 있을까요?', '사업을 시작해도 될까요?', '돈 문제', '올해 돈을 벌 수 있을까요?')
+    assert results == ['text:이직할까요', 'text:승진할수있을까요', 'text:사업을시작해도될까요',
+                       'text:돈문제', 'text:올해돈을벌수있을까요']
+    # 정형 질문에 내용이 덧붙으면 원문 기준
+    assert intents('올해 운세는 어떤가요? 이직 고민 중이에요') == ['text:올해운세는어떤가요이직고민중이에요']
+
+
+def test_answer_cache_key():
+    keys = run_node('answerCacheKey', [
+        ['saju:session:a', '올해 운세는 어떤가요?'],
+        ['saju:session:a', '올해 운세가 궁금해요'],
+        ['saju:session:b', '올해 운세는 어떤가요?'],
+        ['saju:session:a', '이직할까요?'],
+        ['saju:session:a', '승진할까요?']
+    ])
+    assert all(key.startswith('saju:answer:v2:') for key in keys), keys
+    assert keys[0] == keys[1]
+    assert len({keys[0], keys[2], keys[3], keys[4]}) == 4
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("질문 정규화", test_normalize_question),
+                        ("정형 질문 의도", test_canonical_questions_share_intent),
+                        ("구체적인 질문 원문 유지", test_specific_questions_keep_text),
+                        ("답변 캐시 키", test_answer_cache_key)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
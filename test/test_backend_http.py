@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+http.client Backend 세션 재시도 테스트 (lambda/backend_http.py StdlibSession, 로컬 소켓 서버)
+
+- 서버가 닫은 유휴 연결은 재시도 횟수를 쓰지 않고 버린 뒤 새 연결로 요청
+- 요청을 보낸 뒤 연결이 끊기면 POST를 다시 보내지 않고 BackendConnectionError
+- 연결 실패는 max_retries만큼 재시도
+"""
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+from backend_http import BackendConnectionError, StdlibSession  # noqa: E402
+
+RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 11\r\n\r\n{"ok":true}'
+
+
+class BackendStub:
+    """연결마다 behavior(연결 번호, 요청 번호)로 응답/종료를 정하는 HTTP/1.1 서버"""
+
+    def __init__(self, behavior):
+        self.behavior = behavior
+        self.connections = 0
+        self.requests = 0
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(16)
+        self.url = f'http://127.0.0.1:{self.server.getsockname()[1]}/saju/basic'
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self.handle, args=(client, self.connections), daemon=True).start()
+
+    def handle(self, client, number):
+        with client:
+            if self.behavior(number, None) == 'close':
+                return
+            buffer = b''
+            while True:
+                while b'\r\n\r\n' not in buffer:
+                    chunk = client.recv(65536)
+                    if not chunk:
+                        return
+                    buffer += chunk
+                head, _, buffer = buffer.partition(b'\r\n\r\n')
+                length = int([line.split(b':')[1] for line in head.split(b'\r\n')
+                              if line.lower().startswith(b'content-length')][0])
+                while len(buffer) < length:
+                    buffer += client.recv(65536)
+                buffer = buffer[length:]
+                self.requests += 1
+                if self.behavior(number, self.requests) == 'drop':
+                    return
+                client.sendall(RESPONSE)
+
+    def close(self):
+        self.server.close()
+
+
+def test_stale_idle_connections_do_not_use_retries():
+    # 미리 연 연결 3개는 서버가 바로 닫음 (keep-alive 만료와 같은 상태)
+    stub = BackendStub(lambda connection, request: 'close' if connection <= 3 else 'ok')
+    try:
+        session = StdlibSession(max_retries=0)
+        assert session.preconnect(stub.url, 3) == 3
+        time.sleep(0.1)
+        response = session.post(stub.url, json={'a': 1})
+        assert response.status_code == 200 and response.json() == {'ok': True}
+        assert stub.connections == 4 and stub.requests == 1
+    finally:
+        stub.close()
+
+
+def test_no_resend_after_request_sent():
+    # 첫 요청은 응답하고 연결 유지, 같은 연결의 두 번째 요청은 받은 뒤 응답 없이 종료
+    stub = BackendStub(lambda connection, request: 'drop' if request == 2 else 'ok')
+    try:
+        session = StdlibSession(max_retries=2, backoff_factor=0)
+        assert session.post(stub.url, json={'a': 1}).status_code == 200
+        try:
+            session.post(stub.url, json={'a': 2})
+        except BackendConnectionError:
+            pass
+        else:
+            raise AssertionError('BackendConnectionError가 발생하지 않았습니다')
+        time.sleep(0.1)
+        assert stub.requests == 2, stub.requests
+    finally:
+        stub.close()
+
+
+def test_connect_failure_retries():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    url = f'http://127.0.0.1:{server.getsockname()[1]}/saju/basic'
+    server.close()
+
+    session = StdlibSession(max_retries=2, backoff_factor=0.01)
+    attempts = []
+    connect = session._connect
+
+    def counting_connect(key, timeout):
+        attempts.append(key)
+        return connect(key, timeout)
+
+    session._connect = counting_connect
+    try:
+        session.post(url, json={})
+    except BackendConnectionError:
+        pass
+    else:
+        raise AssertionError('BackendConnectionError가 발생하지 않았습니다')
+    assert len(attempts) == 3, attempts
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("끊긴 유휴 연결 정리", test_stale_idle_connections_do_not_use_retries),
+                        ("전송 후 재전송 없음", test_no_resend_after_request_sent),
+                        ("연결 실패 재시도", test_connect_failure_retries)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
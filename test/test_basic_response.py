@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+/saju/basic 응답 형태 테스트 (lambda/index.py handler, Backend 호출 없이 warm 캐시 적중 경로)
+
+- 기본 응답: backend_response/rawData 사본 제외
+- fields 투영 (pillars,wuxing 등), debug 전체 응답
+- Accept-Encoding에 따른 gzip/br 압축, base64 요청 본문
+- 요청 해시 헤더 (API Gateway 캐시 키) 응답/검증
+- warm 캐시 미스 시 Redis 차트 직접 조회 (Backend 호출 없음), 갱신 임박 차트는 Backend로
+- 로컬 엔진 차트는 공유 MCP 차트 키/warm 캐시가 아닌 로컬 엔진 차트 키에 저장 (Backend 간지 테이블 결과 포함)
+- ASGI 서버(asgi_app.py)가 같은 공용 처리(saju_api.py)로 Lambda와 같은 응답을 만드는지 (fastapi가 있을 때)
+"""
+import base64
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+import index  # noqa: E402
+import saju_api  # noqa: E402
+import saju_store  # noqa: E402
+from saju_codec import encode_chart  # noqa: E402
+from saju_engine import compute_saju_analysis  # noqa: E402
+from saju_store import chart_record  # noqa: E402
+
+BIRTH_INFO = {'year': 1990, 'month': 5, 'day': 15, 'hour': 14, 'gender': 'male'}
+
+
+def call(options=None, headers=None, base64_body=False):
+    """warm 캐시에 차트를 넣고 handler 호출 - (응답, 압축 해제한 본문 바이트)"""
+    chart = chart_record(compute_saju_analysis(1990, 5, 15, 14))
+    saju_api.saju_cache.set(saju_api.chart_key(BIRTH_INFO), chart)
+    body = json.dumps({'name': '홍길동', 'birth_info': BIRTH_INFO, **(options or {})})
+    if base64_body:
+        body = base64.b64encode(body.encode('utf-8')).decode('ascii')
+    event = {'path': '/saju/basic', 'body': body, 'isBase64Encoded': base64_body, 'headers': headers or {}}
+    response = index.handler(event, None)
+    if response.get('isBase64Encoded'):
+        content = base64.b64decode(response['body'])
+        encoding = response['headers'].get('Content-Encoding')
+        if encoding == 'gzip':
+            content = gzip.decompress(content)
+        elif encoding == 'br':
+            import brotli
+            content = brotli.decompress(content)
+        return response, content
+    return response, response['body'].encode('utf-8')
+
+
+def test_slim_default():
+    response, content = call()
+    body = json.loads(content)
+    assert response['statusCode'] == 200
+    assert 'backend_response' not in body
+    assert 'rawData' not in body['saju_analysis']
+    assert body['saju_analysis']['name'] == '홍길동'
+    assert '사주팔자' in body['saju_analysis']['translatedData']
+
+
+def test_debug():
+    _, slim = call()
+    _, content = call({'debug': True})
+    body = json.loads(content)
+    assert body['backend_response']['data'] == body['saju_analysis']
+    assert 'rawData' in body['saju_analysis']
+    assert len(content) >= 2 * len(slim), (len(content), len(slim))
+
+
+def test_fields():
+    _, content = call({'fields': 'pillars,wuxing'})
+    analysis = json.loads(content)['saju_analysis']
+    assert set(analysis) == {'name', 'translatedData', 'wuxingAnalysis'}
+    assert set(analysis['translatedData']) == {'사주팔자', '일주천간', '오행'}
+
+    _, content = call({'fields': ['zodiac']})
+    assert json.loads(content)['saju_analysis']['translatedData'] == {'띠': '말', '별자리': '황소자리'}
+
+    response, _ = call({'fields': 'pillars,unknown'})
+    assert response['statusCode'] == 500
+    assert 'unknown' in json.loads(response['body'])['error']
+
+
+def test_compression():
+    _, plain = call()
+    response, content = call(headers={'Accept-Encoding': 'gzip, deflate, br'}, base64_body=True)
+    assert response['headers']['Content-Encoding'] in ('gzip', 'br')
+    assert response['headers']['Vary'] == 'Accept-Encoding'
+    assert content == plain
+    assert len(base64.b64decode(response['body'])) < len(plain)
+
+    response, _ = call(headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in response['headers']
+
+
+def test_request_hash():
+    response, _ = call()
+    request_hash = response['headers']['X-Saju-Request-Hash']
+    assert len(request_hash) == 32
+
+    # 같은 출생 정보/이름/옵션이면 같은 해시 (fields 순서 무관)
+    response, _ = call(headers={'x-saju-request-hash': request_hash})
+    assert response['statusCode'] == 200
+    assert response['headers']['X-Saju-Request-Hash'] == request_hash
+    first, _ = call({'fields': 'wuxing,pillars'})
+    second, _ = call({'fields': ['pillars', 'wuxing']})
+    assert first['headers']['X-Saju-Request-Hash'] == second['headers']['X-Saju-Request-Hash'] != request_hash
+
+    # 본문과 다른 해시는 거부 (다른 사람의 응답이 같은 캐시 키로 저장되지 않도록)
+    response, _ = call({'name': '김철수'}, headers={'X-Saju-Request-Hash': request_hash})
+    assert response['statusCode'] == 500
+    assert 'X-Saju-Request-Hash' in json.loads(response['body'])['error']
+
+
+class DictRedis:
+    """store_chart/load_chart가 쓰는 명령만 지원하는 메모리 Redis"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+
+def test_redis_chart_read():
+    key = saju_api.chart_key(BIRTH_INFO)
+    redis = DictRedis()
+    redis.values[key] = encode_chart(chart_record(compute_saju_analysis(1990, 5, 15, 14)))
+    saju_store._redis_client = redis
+    try:
+        saju_api.saju_cache.clear()
+        event = {'path': '/saju/basic', 'body': json.dumps({'name': '홍길동', 'birth_info': BIRTH_INFO})}
+        response = index.handler(event, None)
+        body = json.loads(response['body'])
+        assert response['statusCode'] == 200, body
+        assert response['headers']['X-Cache'] == 'HIT'
+        assert body['saju_analysis']['name'] == '홍길동'
+        assert json.loads(redis.values[body['cache_key']]) == {'chart_key': key, 'name': '홍길동'}
+        assert saju_api.saju_cache.get(key) is not None
+
+        # 갱신 임박 차트는 직접 응답하지 않음 (Backend가 반환 후 백그라운드 갱신)
+        stale = chart_record(compute_saju_analysis(1990, 5, 15, 14))
+        stale['timestamp'] -= saju_api.SAJU_STORE_TTL
+        redis.values[key] = encode_chart(stale)
+        assert saju_api.load_fresh_chart(key) is None
+        assert saju_api.load_fresh_chart('saju:chart:v1:missing') is None
+    finally:
+        saju_store._redis_client = None
+        saju_api.saju_cache.clear()
+
+
+def test_local_engine_store():
+    redis = DictRedis()
+    saju_store._redis_client = redis
+    engine = saju_api.SAJU_ENGINE
+    saju_api.SAJU_ENGINE = 'local'
+    try:
+        saju_api.saju_cache.clear()
+        event = {'path': '/saju/basic', 'body': json.dumps({'name': '홍길동', 'birth_info': BIRTH_INFO})}
+        response = index.handler(event, None)
+        body = json.loads(response['body'])
+        assert response['statusCode'] == 200, body
+        assert response['headers']['X-Cache'] == 'MISS'
+
+        # 세션은 로컬 엔진 차트를 가리키고, MCP 차트 키와 warm 캐시는 비어 있음
+        local_key = saju_store.local_chart_key(BIRTH_INFO)
+        assert body['chart_key'] == local_key != saju_api.chart_key(BIRTH_INFO)
+        assert json.loads(redis.values[body['cache_key']]) == {'chart_key': local_key, 'name': '홍길동'}
+        assert saju_api.chart_key(BIRTH_INFO) not in redis.values
+        assert saju_api.saju_cache.get(saju_api.chart_key(BIRTH_INFO)) is None
+        assert saju_api.load_fresh_chart(saju_api.chart_key(BIRTH_INFO)) is None
+    finally:
+        saju_api.SAJU_ENGINE = engine
+        saju_store._redis_client = None
+        saju_api.saju_cache.clear()
+
+
+def test_backend_table_chart():
+    """Backend가 간지 테이블로 계산해 로컬 엔진 차트 키로 응답하면 MCP 차트 키의 warm 캐시에 넣지 않음"""
+    saju_api.saju_cache.clear()
+    request = {'cache_key': saju_api.chart_key(BIRTH_INFO)}
+    chart = compute_saju_analysis(1990, 5, 15, 14)
+    try:
+        table = {**chart, 'chart_key': saju_store.local_chart_key(BIRTH_INFO)}
+        saju_api.backend_saju_data(request, 200, 'application/json', json.dumps(table), '')
+        assert saju_api.saju_cache.get(request['cache_key']) is None
+
+        mcp = {**chart, 'chart_key': request['cache_key']}
+        saju_api.backend_saju_data(request, 200, 'application/json', json.dumps(mcp), '')
+        assert saju_api.saju_cache.get(request['cache_key']) is not None
+    finally:
+        saju_api.saju_cache.clear()
+
+
+def test_asgi_parity():
+    """warm 캐시 적중/해시 불일치 경로는 Backend 호출이 없어 lifespan 없이 ASGI 앱을 직접 호출"""
+    pytest.importorskip('fastapi')
+    import asyncio
+
+    import httpx
+
+    import asgi_app
+
+    async def post(body, headers):
+        transport = httpx.ASGITransport(app=asgi_app.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post('/saju/basic', json=body, headers=headers)
+
+    options = {'fields': 'pillars'}
+    response, content = call(options, headers={'Accept-Encoding': 'gzip'})
+    asgi = asyncio.run(post({'name': '홍길동', 'birth_info': BIRTH_INFO, **options}, {'Accept-Encoding': 'gzip'}))
+    mismatch = asyncio.run(post({'name': '홍길동', 'birth_info': BIRTH_INFO}, {'X-Saju-Request-Hash': 'bad'}))
+    assert asgi.status_code == 200
+    assert asgi.json() == json.loads(content)
+    for header in ('X-Cache', 'X-Saju-Request-Hash', 'Content-Encoding'):
+        assert asgi.headers.get(header) == response['headers'].get(header), header
+
+    lambda_mismatch, _ = call(headers={'X-Saju-Request-Hash': 'bad'})
+    assert mismatch.status_code == lambda_mismatch['statusCode'] == 500
+    assert mismatch.json() == json.loads(lambda_mismatch['body'])
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("기본 응답", test_slim_default),
+                        ("debug 전체 응답", test_debug),
+                        ("fields 투영", test_fields),
+                        ("압축", test_compression),
+                        ("요청 해시", test_request_hash),
+                        ("Redis 차트 직접 조회", test_redis_chart_read),
+                        ("로컬 엔진 차트 분리", test_local_engine_store),
+                        ("Backend 테이블 차트 분리", test_backend_table_chart),
+                        ("ASGI 응답 일치", test_asgi_parity)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except pytest.skip.Exception as e:
+            print(f"⚠️ {label} 건너뜀: {e}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
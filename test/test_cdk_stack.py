@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+YedamoStack synth 테스트 (aws-cdk-lib가 있을 때만)
+
+- SajuLambda 버전/별칭(live)과 별칭의 provisioned concurrency
+- 예약 확장(오전 증가/감소) + 사용률 기반 Application Auto Scaling
+- API Gateway가 함수가 아닌 별칭을 호출
+- saju_provisioned_concurrency=0이면 provisioned concurrency/확장 리소스 없음
+- api_cache=true면 스테이지 캐시 + 경로별 메서드 설정, /saju/basic 캐시 키 헤더
+- binary_media_types=*/*에서도 CORS 프리플라이트(MOCK)는 텍스트로 변환
+- Backend: 내부 ALB 뒤 Fargate 서비스, /health 헬스 체크, 요청 수/CPU 자동 조정, Lambda는 VPC에서 ALB 호출
+- Redis: single(기본) / replication(두 AZ 복제본 + 읽기 엔드포인트) / cluster(샤딩) 토폴로지
+- Lambda: 프라이빗 서브넷, ALB/Redis로만 보안 그룹 규칙, Redis 엔드포인트 환경 변수
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CDK_DIR = os.path.join(ROOT, 'cdk')
+sys.path.insert(0, CDK_DIR)
+os.environ.setdefault('JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION', '1')
+
+# importorskip은 여기서 aws_cdk를 import해 jsii 프로세스가 잘못된 cwd를 물려받으므로 존재 여부만 확인
+if importlib.util.find_spec('aws_cdk') is None:
+    if __name__ == '__main__':
+        print("⚠️ aws-cdk-lib가 없어 synth 테스트를 건너뜁니다")
+        exit(0)
+    pytest.skip("aws-cdk-lib가 없어 synth 테스트를 건너뜁니다", allow_module_level=True)
+
+
+def synth(context=None):
+    """YedamoStack 템플릿 (asset 경로가 cdk/ 기준 - jsii 프로세스가 첫 import 시 cwd를 물려받음)"""
+    cwd = os.getcwd()
+    os.chdir(CDK_DIR)
+    try:
+        import aws_cdk as cdk
+        from aws_cdk.assertions import Template
+        from stacks.yedamo_stack import YedamoStack
+
+        app = cdk.App(context=context or {})
+        return Template.from_stack(YedamoStack(app, 'YedamoStack'))
+    finally:
+        os.chdir(cwd)
+
+
+def test_alias_and_provisioned_concurrency():
+    template = synth({'saju_provisioned_concurrency': 2, 'saju_peak_concurrency': 8})
+    from aws_cdk.assertions import Match
+    template.resource_count_is('AWS::Lambda::Version', 1)
+    template.has_resource_properties('AWS::Lambda::Alias', {
+        'Name': 'live',
+        'ProvisionedConcurrencyConfig': {'ProvisionedConcurrentExecutions': 2}
+    })
+    template.has_resource_properties('AWS::ApplicationAutoScaling::ScalableTarget', {
+        'MinCapacity': 2,
+        'MaxCapacity': 8,
+        'ScalableDimension': 'lambda:function:ProvisionedConcurrency',
+        'ScheduledActions': Match.array_with([
+            Match.object_like({'Schedule': 'cron(45 21 * * ? *)',
+                               'ScalableTargetAction': {'MinCapacity': 8}}),
+            Match.object_like({'Schedule': 'cron(30 1 * * ? *)',
+                               'ScalableTargetAction': {'MinCapacity': 2}})
+        ])
+    })
+    template.has_resource_properties('AWS::ApplicationAutoScaling::ScalingPolicy', {
+        'TargetTrackingScalingPolicyConfiguration': Match.object_like({'TargetValue': 0.7})
+    })
+
+    # API Gateway 통합과 호출 권한이 별칭 ARN을 가리킴
+    alias_ref = {'Ref': Match.string_like_regexp('SajuLambdaLive')}
+    template.has_resource_properties('AWS::Lambda::Permission', {'FunctionName': alias_ref})
+    methods = template.find_resources('AWS::ApiGateway::Method', {'Properties': {'HttpMethod': 'POST'}})
+    assert methods
+    for method in methods.values():
+        assert 'SajuLambdaLive' in str(method['Properties']['Integration']['Uri']), method
+
+
+def test_without_provisioned_concurrency():
+    template = synth({'saju_provisioned_concurrency': 0})
+    template.resource_count_is('AWS::Lambda::Alias', 1)
+    targets = template.find_resources('AWS::ApplicationAutoScaling::ScalableTarget', {
+        'Properties': {'ScalableDimension': 'lambda:function:ProvisionedConcurrency'}})
+    assert not targets
+    alias = next(iter(template.find_resources('AWS::Lambda::Alias').values()))
+    assert 'ProvisionedConcurrencyConfig' not in alias['Properties']
+
+
+def test_api_cache_policies():
+    template = synth({'api_cache': 'true', 'api_cache_ttl_saju_basic': '600'})
+    stage = next(iter(template.find_resources('AWS::ApiGateway::Stage').values()))['Properties']
+    assert stage['CacheClusterEnabled'] is True
+    settings = {setting['ResourcePath']: setting for setting in stage['MethodSettings']}
+    basic = settings['/~1saju~1basic']
+    assert basic['CachingEnabled'] is True and basic['CacheTtlInSeconds'] == 600
+    assert settings['/~1saju~1consultation']['CachingEnabled'] is False
+    # 스트리밍 상담은 API Gateway에서 버퍼링되므로 경로 없음 (ASGI 서버/Backend 직접 사용)
+    assert '/~1saju~1consultation~1stream' not in settings
+    resources = template.find_resources('AWS::ApiGateway::Resource')
+    paths = [resource['Properties']['PathPart'] for resource in resources.values()]
+    assert 'stream' not in paths
+
+    methods = template.find_resources('AWS::ApiGateway::Method', {'Properties': {'HttpMethod': 'POST'}})
+    keyed = [method['Properties'] for method in methods.values()
+             if method['Properties'].get('RequestParameters')]
+    assert len(keyed) == 1
+    assert keyed[0]['RequestParameters'] == {'method.request.header.X-Saju-Request-Hash': True,
+                                             'method.request.header.Accept-Encoding': False}
+    assert keyed[0]['Integration']['CacheKeyParameters'] == list(keyed[0]['RequestParameters'])
+
+    # 기본값은 캐시 없음
+    template = synth()
+    stage = next(iter(template.find_resources('AWS::ApiGateway::Stage').values()))['Properties']
+    assert not stage.get('CacheClusterEnabled')
+    template.resource_count_is('AWS::ApiGateway::RequestValidator', 0)
+
+
+def test_backend_service():
+    template = synth({'backend_min_tasks': '3', 'backend_max_tasks': '12'})
+    template.resource_count_is('AWS::EC2::Instance', 0)
+    template.has_resource_properties('AWS::ElasticLoadBalancingV2::LoadBalancer', {'Scheme': 'internal'})
+    template.has_resource_properties('AWS::ElasticLoadBalancingV2::TargetGroup', {
+        'HealthCheckPath': '/health', 'Port': 80
+    })
+    template.has_resource_properties('AWS::ECS::Service', {'DesiredCount': 3, 'LaunchType': 'FARGATE'})
+    template.has_resource_properties('AWS::ApplicationAutoScaling::ScalableTarget', {
+        'MinCapacity': 3, 'MaxCapacity': 12, 'ScalableDimension': 'ecs:service:DesiredCount'
+    })
+    metrics = {policy['Properties']['TargetTrackingScalingPolicyConfiguration']
+               ['PredefinedMetricSpecification']['PredefinedMetricType']
+               for policy in template.find_resources('AWS::ApplicationAutoScaling::ScalingPolicy').values()}
+    assert {'ALBRequestCountPerTarget', 'ECSServiceAverageCPUUtilization'} <= metrics, metrics
+
+    # Lambda는 VPC 안에서 ALB DNS 이름으로 Backend 호출
+    function = next(iter(template.find_resources('AWS::Lambda::Function').values()))['Properties']
+    assert function['VpcConfig']['SubnetIds']
+    backend_url = function['Environment']['Variables']['BACKEND_URL']
+    assert 'DNSName' in str(backend_url), backend_url
+
+
+def test_cors_preflight():
+    template = synth()
+    api = next(iter(template.find_resources('AWS::ApiGateway::RestApi').values()))['Properties']
+    assert api['BinaryMediaTypes'] == ['*/*']
+    methods = template.find_resources('AWS::ApiGateway::Method', {'Properties': {'HttpMethod': 'OPTIONS'}})
+    assert methods
+    for method in methods.values():
+        integration = method['Properties']['Integration']
+        assert integration['Type'] == 'MOCK'
+        assert integration['ContentHandling'] == 'CONVERT_TO_TEXT', integration
+
+
+def backend_environment(template):
+    """Backend 컨테이너 환경 변수 {이름: 값}"""
+    task = next(iter(template.find_resources('AWS::ECS::TaskDefinition').values()))['Properties']
+    return {item['Name']: item['Value'] for item in task['ContainerDefinitions'][0]['Environment']}
+
+
+def test_redis_topologies():
+    template = synth()
+    template.resource_count_is('AWS::ElastiCache::CacheCluster', 1)
+    template.resource_count_is('AWS::ElastiCache::ReplicationGroup', 0)
+    assert 'REDIS_READER_HOST' not in backend_environment(template)
+
+    template = synth({'redis_topology': 'replication', 'redis_replicas': '2', 'redis_node_type': 'cache.r7g.large'})
+    template.resource_count_is('AWS::ElastiCache::CacheCluster', 0)
+    group = next(iter(template.find_resources('AWS::ElastiCache::ReplicationGroup').values()))['Properties']
+    assert group['CacheNodeType'] == 'cache.r7g.large'
+    assert group['ReplicasPerNodeGroup'] == 2
+    assert group['AutomaticFailoverEnabled'] is True and group['MultiAZEnabled'] is True
+    zones = group['PreferredCacheClusterAZs']
+    assert len(zones) == 3 and zones[0] != zones[1] and zones[0] == zones[2]
+    environment = backend_environment(template)
+    assert 'ReaderEndPoint.Address' in str(environment['REDIS_READER_HOST'])
+    assert 'PrimaryEndPoint.Address' in str(environment['REDIS_HOST'])
+
+    template = synth({'redis_topology': 'cluster', 'redis_shards': '3'})
+    group = next(iter(template.find_resources('AWS::ElastiCache::ReplicationGroup').values()))['Properties']
+    assert group['NumNodeGroups'] == 3 and len(group['NodeGroupConfiguration']) == 3
+    assert group['CacheParameterGroupName'] == 'default.redis7.cluster.on'
+    environment = backend_environment(template)
+    assert environment['REDIS_CLUSTER_MODE'] == 'true'
+    assert 'ConfigurationEndPoint.Address' in str(environment['REDIS_HOST'])
+
+
+def test_lambda_private_path():
+    template = synth({'redis_topology': 'replication'})
+    function = next(iter(template.find_resources('AWS::Lambda::Function').values()))['Properties']
+    subnets = [subnet['Ref'] for subnet in function['VpcConfig']['SubnetIds']]
+    assert subnets and all('private' in subnet for subnet in subnets), subnets
+    variables = function['Environment']['Variables']
+    assert 'PrimaryEndPoint.Address' in str(variables['REDIS_HOST'])
+    assert 'ReaderEndPoint.Address' in str(variables['REDIS_READER_HOST'])
+
+    # Lambda 보안 그룹에서 들어오는 규칙: ALB(80), Redis(6379)
+    lambda_group = function['VpcConfig']['SecurityGroupIds'][0]['Fn::GetAtt'][0]
+    ingress = [rule['Properties'] for rule in template.find_resources('AWS::EC2::SecurityGroupIngress').values()
+               if rule['Properties'].get('SourceSecurityGroupId', {}).get('Fn::GetAtt', [None])[0] == lambda_group]
+    assert sorted(rule['FromPort'] for rule in ingress) == [80, 6379], ingress
+
+    # Backend 보안 그룹은 인터넷(0.0.0.0/0)에 열려 있지 않음
+    groups = template.find_resources('AWS::EC2::SecurityGroup')
+    for name, group in groups.items():
+        if name.startswith('YedamoBackendSecurityGroup'):
+            assert not group['Properties'].get('SecurityGroupIngress'), group
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("별칭/provisioned concurrency/예약 확장", test_alias_and_provisioned_concurrency),
+                        ("provisioned concurrency 끔", test_without_provisioned_concurrency),
+                        ("API Gateway 캐시 정책", test_api_cache_policies),
+                        ("CORS 프리플라이트", test_cors_preflight),
+                        ("Backend 서비스", test_backend_service),
+                        ("Redis 토폴로지", test_redis_topologies),
+                        ("Lambda 프라이빗 경로", test_lambda_private_path)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+사주 차트/세션 저장과 만료 임박 차트 갱신 테스트 (backend/utils/chartStore.js, node 필요)
+
+- 캐시 적중(갱신 임박 포함) 시 세션과 함께 차트 TTL 연장 - 갱신이 실패해도 세션이 차트를 가리킴
+- 갱신 실패: 계산 경로 없음(MCP 미연결)/계산 오류에도 락 해제, 기존 차트 유지
+- 락: 다른 워커가 갱신 중이면 재계산하지 않고, 만료 후 다른 워커가 잡은 락은 해제하지 않음
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = os.path.join(ROOT, 'backend', 'utils', 'chartStore.js')
+
+if shutil.which('node') is None:
+    if __name__ == '__main__':
+        print("⚠️ node가 없어 차트 저장 테스트를 건너뜁니다")
+        exit(0)
+    pytest.skip("node가 없어 차트 저장 테스트를 건너뜁니다", allow_module_level=True)
+
+# chartStore.js가 쓰는 명령만 지원하는 메모리 Redis (TTL은 초 단위, clock.now로 시간 진행)
+FAKE_REDIS = """
+const clock = { now: 0 };
+class FakeRedis {
+  constructor() { this.values = new Map(); }
+  alive(key) {
+    const item = this.values.get(key);
+    if (item && item.expiresAt !== null && item.expiresAt <= clock.now) this.values.delete(key);
+    return this.values.get(key);
+  }
+  ttl(key) { const item = this.alive(key); return item ? item.expiresAt - clock.now : -2; }
+  async get(key) { const item = this.alive(key); return item ? item.value : null; }
+  async setEx(key, ttl, value) { this.values.set(key, { value, expiresAt: clock.now + ttl }); return 'OK'; }
+  async expire(key, ttl) {
+    const item = this.alive(key);
+    if (!item) return 0;
+    item.expiresAt = clock.now + ttl;
+    return 1;
+  }
+  async set(key, value, { NX, PX }) {
+    if (NX && this.alive(key)) return null;
+    this.values.set(key, { value, expiresAt: clock.now + PX / 1000 });
+    return 'OK';
+  }
+  async eval(script, { keys, arguments: args }) {
+    if (!script.includes("redis.call('get', KEYS[1]) == ARGV[1]")) throw new Error('unknown script');
+    if ((await this.get(keys[0])) !== args[0]) return 0;
+    this.values.delete(keys[0]);
+    return 1;
+  }
+  multi() {
+    const commands = [];
+    const chain = {
+      setEx: (...args) => { commands.push(() => this.setEx(...args)); return chain; },
+      expire: (...args) => { commands.push(() => this.expire(...args)); return chain; },
+      exec: async () => { const results = []; for (const command of commands) results.push(await command()); return results; },
+    };
+    return chain;
+  }
+}
+const CHART = { success: true, data: { translatedData: { 띠: '말' } }, timestamp: 0 };
+"""
+
+
+def run_node(scenario):
+    """FakeRedis와 chartStore.js로 시나리오를 실행해 result 객체를 반환"""
+    script = (
+        f"import {{ writeChartSession, refreshChart }} from {json.dumps('file://' + MODULE)};"
+        f"import {{ decodeChart }} from {json.dumps('file://' + os.path.join(ROOT, 'backend', 'utils', 'sajuCodec.js'))};"
+        + FAKE_REDIS
+        + "const result = {};"
+        + scenario
+        + "process.stdout.write(JSON.stringify(result));"
+    )
+    completed = subprocess.run(
+        ['node', '--input-type=module', '-e', script],
+        capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def test_stale_hit_extends_chart():
+    """갱신 임박 차트(남은 TTL 100초)에 새 세션을 저장하면 차트도 세션만큼 유지"""
+    result = run_node("""
+const redis = new FakeRedis();
+await redis.setEx('chart', 100, 'stale-chart');
+await writeChartSession(redis, { chartKey: 'chart', chart: null, sessionKey: 'session', name: '홍길동', ttl: 1800 });
+result.chartTtl = redis.ttl('chart');
+result.sessionTtl = redis.ttl('session');
+result.chart = await redis.get('chart');
+clock.now = 1000;
+result.session = JSON.parse(await redis.get('session'));
+result.chartAfter = await redis.get('chart');
+
+const cluster = new FakeRedis();
+await cluster.setEx('chart', 100, 'stale-chart');
+await writeChartSession(cluster, { chartKey: 'chart', chart: null, sessionKey: 'session', name: '', ttl: 1800, cluster: true });
+result.clusterChartTtl = cluster.ttl('chart') + clock.now;
+""")
+    assert result['chartTtl'] == result['sessionTtl'] == 1800
+    assert result['chart'] == result['chartAfter'] == 'stale-chart'
+    assert result['session'] == {'chart_key': 'chart', 'name': '홍길동'}
+    assert result['clusterChartTtl'] == 1000 + 1800
+
+
+def test_new_chart_stored_with_session():
+    result = run_node("""
+const redis = new FakeRedis();
+await writeChartSession(redis, { chartKey: 'chart', chart: CHART, sessionKey: 'session', name: '홍길동', ttl: 1800 });
+result.chart = decodeChart(await redis.get('chart'));
+result.ttls = [redis.ttl('chart'), redis.ttl('session')];
+""")
+    assert result['chart']['data']['translatedData'] == {'띠': '말'}
+    assert result['ttls'] == [1800, 1800]
+
+
+def test_refresh():
+    result = run_node("""
+const redis = new FakeRedis();
+await redis.setEx('chart', 100, 'stale-chart');
+result.status = await refreshChart(redis, { chartKey: 'chart', compute: async () => CHART, ttl: 1800, lockTtl: 30 });
+result.chart = decodeChart(await redis.get('chart'));
+result.chartTtl = redis.ttl('chart');
+result.lock = await redis.get('saju:lock:chart');
+""")
+    assert result['status'] == 'refreshed'
+    assert result['chart']['success'] is True
+    assert result['chartTtl'] == 1800
+    assert result['lock'] is None
+
+
+def test_refresh_failure_keeps_chart():
+    """MCP 미연결(계산 결과 null)/계산 오류 - 락은 해제되고 세션은 기존 차트를 계속 가리킴"""
+    result = run_node("""
+const redis = new FakeRedis();
+await redis.setEx('chart', 100, 'stale-chart');
+await writeChartSession(redis, { chartKey: 'chart', chart: null, sessionKey: 'session', name: '홍길동', ttl: 1800 });
+result.unavailable = await refreshChart(redis, { chartKey: 'chart', compute: async () => null, ttl: 1800, lockTtl: 30 });
+result.lockAfterUnavailable = await redis.get('saju:lock:chart');
+try {
+  await refreshChart(redis, { chartKey: 'chart', compute: async () => { throw new Error('MCP 오류'); }, ttl: 1800, lockTtl: 30 });
+  result.error = null;
+} catch (error) {
+  result.error = error.message;
+}
+result.lockAfterError = await redis.get('saju:lock:chart');
+clock.now = 1000;
+const session = JSON.parse(await redis.get('session'));
+result.sessionChart = await redis.get(session.chart_key);
+""")
+    assert result['unavailable'] == 'unavailable'
+    assert result['error'] == 'MCP 오류'
+    assert result['lockAfterUnavailable'] is None and result['lockAfterError'] is None
+    assert result['sessionChart'] == 'stale-chart'
+
+
+def test_refresh_lock():
+    """다른 워커가 락을 잡고 있으면 재계산하지 않고, 계산 중 락이 만료돼 다른 워커가 잡은 락은 유지"""
+    result = run_node("""
+const redis = new FakeRedis();
+await redis.setEx('chart', 100, 'stale-chart');
+await redis.set('saju:lock:chart', 'other-worker', { NX: true, PX: 30000 });
+let computed = 0;
+result.locked = await refreshChart(redis, {
+  chartKey: 'chart', compute: async () => { computed += 1; return CHART; }, ttl: 1800, lockTtl: 30
+});
+result.computedWhileLocked = computed;
+result.heldLock = await redis.get('saju:lock:chart');
+result.chart = await redis.get('chart');
+
+// 계산이 락 TTL보다 오래 걸려 다른 워커가 새 락을 잡은 경우
+clock.now = 31;
+result.slow = await refreshChart(redis, {
+  chartKey: 'chart',
+  compute: async () => {
+    clock.now = 62;
+    await redis.set('saju:lock:chart', 'next-worker', { NX: true, PX: 30000 });
+    return CHART;
+  },
+  ttl: 1800,
+  lockTtl: 30
+});
+result.nextLock = await redis.get('saju:lock:chart');
+""")
+    assert result['locked'] == 'locked'
+    assert result['computedWhileLocked'] == 0
+    assert result['heldLock'] == 'other-worker'
+    assert result['chart'] == 'stale-chart'
+    assert result['slow'] == 'refreshed'
+    assert result['nextLock'] == 'next-worker'
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("갱신 임박 차트 TTL 연장", test_stale_hit_extends_chart),
+                        ("새 차트/세션 저장", test_new_chart_stored_with_session),
+                        ("차트 갱신", test_refresh),
+                        ("갱신 실패 시 차트 유지", test_refresh_failure_keeps_chart),
+                        ("갱신 락", test_refresh_lock)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
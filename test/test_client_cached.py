@@ -39,7 +39,7 @@ def test_cached_flow(api_url):
         if response.status_code == 200:
             result = response.json()
             cache_key = result['cache_key']
-            print(f"✅ 사주 계산 완료! 캐시 키: {cache_key}")
+            print(f"✅ 사주 계산 완료! 캐시 키: {cache_key} (차트 키: {result.get('chart_key')})")
             print(
                 f"📊 사주 분석: {json.dumps(result, ensure_ascii=False, indent=2)}")
 
@@ -101,7 +101,7 @@ def test_cache_expiry(api_url):
     print("실제 환경에서는 30분 후 만료되지만, 테스트를 위해 짧은 시간으로 시뮬레이션")
 
     # 잘못된 캐시 키로 테스트
-    invalid_cache_key = "1234567890_테스트"
+    invalid_cache_key = "saju:session:invalid"
     consultation_data = {
         "cache_key": invalid_cache_key,
         "question": "테스트 질문"
@@ -134,7 +134,6 @@ if __name__ == "__main__":
         print("API URL이 필요합니다.")
         exit(1)
 
-    # test_cached_flow(api_url)
-    # # test_cache_expiry(api_url)
-    cache_key = "1757141251_김다롬"
-    test_consultation_with_cache(api_url, cache_key)
+    # 같은 생년월일시는 이름과 관계없이 같은 chart_key로 캐시됨 (cache_key는 요청별 세션 키)
+    test_cached_flow(api_url)
+    # test_cache_expiry(api_url)
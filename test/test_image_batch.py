@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+이미지 배치 스펙 검증 테스트 (lambda/image_generator.py, Bedrock 호출 없음)
+
+- 문자열이 아닌 color/animal/gender/dominant_element는 해당 항목만 오류로 응답
+- 잘못된 항목이 있어도 나머지 항목은 생성 (NDJSON 응답 시작 후 예외가 나지 않음)
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+import image_generator  # noqa: E402
+
+
+def test_validate_spec_types():
+    assert image_generator.validate_spec({'color': '빨강', 'animal': '용'}) is None
+    assert image_generator.validate_spec({'color': '빨강', 'animal': '용', 'gender': None}) is None
+    for field, value in (('gender', ['male']), ('dominant_element', {'wood': 1}),
+                         ('color', ['빨강']), ('animal', 3)):
+        spec = {'color': '빨강', 'animal': '용', field: value}
+        error = image_generator.validate_spec(spec)
+        assert error is not None and field in error, (field, error)
+
+
+def test_batch_rejects_unhashable_fields():
+    original = image_generator.generate_prompt_group
+
+    def generate(prompt, count, seed=None):
+        return [(f'key-{index}', b'image') for index in range(count)], 'MISS'
+
+    image_generator.generate_prompt_group = generate
+    try:
+        results = list(image_generator.iter_batch_results([
+            {'color': '빨강', 'animal': '용', 'gender': ['male']},
+            {'color': '빨강', 'animal': '용', 'dominant_element': {'wood': 1}},
+            {'color': '빨강', 'animal': '용', 'gender': 'male', 'dominant_element': '목'}
+        ]))
+    finally:
+        image_generator.generate_prompt_group = original
+
+    by_index = {result['index']: result for result in results}
+    assert sorted(by_index) == [0, 1, 2]
+    assert not by_index[0]['success'] and 'gender' in by_index[0]['error']
+    assert not by_index[1]['success'] and 'dominant_element' in by_index[1]['error']
+    assert by_index[2]['success'] and by_index[2]['data'] == b'image'
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("스펙 필드 타입 검증", test_validate_spec_types),
+                        ("배치 항목별 타입 오류", test_batch_rejects_unhashable_fields)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
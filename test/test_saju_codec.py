@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+사주 차트 바이너리 형식(SJC) 테스트
+
+- lambda/saju_codec.py 인코딩/디코딩 왕복 (압축 없음/deflate, zstandard가 있으면 zstd)
+- 기존 JSON 캐시 값 읽기
+- node가 있으면 backend/utils/sajuCodec.js와 교차 인코딩/디코딩
+- JSON 대비 크기 (Redis 항목/전송 본문)
+"""
+import base64
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+from saju_codec import decode_chart, encode_chart  # noqa: E402
+from saju_engine import compute_saju_analysis  # noqa: E402
+from saju_store import chart_record  # noqa: E402
+
+BIRTHS = [(1990, 5, 15, 14), (1985, 12, 3, 0), (2000, 2, 4, 23), (1968, 8, 30, 7)]
+
+# 최소 압축률 (JSON 크기 / SJC 크기)
+MIN_RATIO = 2.5
+
+
+def sample_charts():
+    """Redis에 저장되는 차트(이름 없음)와 Backend 응답 형태"""
+    charts = []
+    for birth in BIRTHS:
+        analysis = compute_saju_analysis(*birth, name='홍길동')
+        charts.append(chart_record(analysis))
+        charts.append({'cache_key': 'saju:session:test', 'cached': False, 'needsRefresh': False, **analysis})
+    return charts
+
+
+def compressions():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return ('none', 'deflate')
+    return ('none', 'deflate', 'zstd')
+
+
+def test_roundtrip():
+    for chart in sample_charts():
+        for compression in compressions():
+            assert decode_chart(encode_chart(chart, compression)) == chart, compression
+
+
+def test_legacy_json():
+    chart = sample_charts()[0]
+    text = json.dumps(chart, ensure_ascii=False)
+    assert decode_chart(text) == chart
+    assert decode_chart(text.encode('utf-8')) == chart
+    assert decode_chart(None) is None
+
+
+def test_size():
+    for chart in sample_charts():
+        json_size = len(json.dumps(chart, ensure_ascii=False).encode('utf-8'))
+        sjc_size = len(encode_chart(chart, 'deflate'))
+        assert json_size / sjc_size >= MIN_RATIO, (json_size, sjc_size)
+
+
+def test_node_parity():
+    """sajuCodec.js 인코딩 → Python 디코딩, Python 인코딩 → sajuCodec.js 디코딩"""
+    if shutil.which('node') is None:
+        print("⚠️ node가 없어 sajuCodec.js 교차 테스트를 건너뜁니다")
+        return
+    charts = sample_charts()
+    module = os.path.join(ROOT, 'backend', 'utils', 'sajuCodec.js')
+    script = (
+        f"import {{ decodeChart, encodeChart }} from {json.dumps('file://' + module)};"
+        "let input = '';"
+        "process.stdin.on('data', (chunk) => { input += chunk; });"
+        "process.stdin.on('end', () => {"
+        "  const { charts, encoded } = JSON.parse(input);"
+        "  process.stdout.write(JSON.stringify({"
+        "    encoded: charts.map((chart) => ['none', 'deflate']"
+        "      .map((compression) => encodeChart(chart, compression).toString('base64'))),"
+        "    decoded: encoded.map((value) => decodeChart(Buffer.from(value, 'base64')))"
+        "  }));"
+        "});"
+    )
+    encoded = [base64.b64encode(encode_chart(chart, 'deflate')).decode('ascii') for chart in charts]
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e', script],
+        input=json.dumps({'charts': charts, 'encoded': encoded}, ensure_ascii=False),
+        capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    output = json.loads(result.stdout)
+    for chart, values, decoded in zip(charts, output['encoded'], output['decoded']):
+        for value in values:
+            assert decode_chart(base64.b64decode(value)) == chart
+        assert decoded == chart
+
+
+if __name__ == '__main__':
+    chart = sample_charts()[0]
+    json_size = len(json.dumps(chart, ensure_ascii=False).encode('utf-8'))
+    for compression in compressions():
+        size = len(encode_chart(chart, compression))
+        print(f"📦 {compression}: JSON {json_size:,}B → SJC {size:,}B ({json_size / size:.1f}배)")
+
+    failed = False
+    for label, test in (("왕복", test_roundtrip),
+                        ("기존 JSON 읽기", test_legacy_json),
+                        ("크기", test_size),
+                        ("sajuCodec.js 교차", test_node_parity)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+로컬 사주 엔진(lambda/saju_engine.py) 패리티 테스트
+
+- fixtures/saju_reference.json: 만세력으로 확인한 기준 사주
+- fixtures/mcp_bazi/*.json: backend/record-bazi-fixtures.js로 녹화한 MCP get_bazi_details 결과
+  (녹화 파일이 없으면 MCP 패리티 테스트는 skip - 엔진은 기준 사주로만 검증된 상태)
+- 번역(translateSajuResult/analyzeWuxing)은 node가 있으면 sajuTranslator.js 결과와 비교
+- 간지 테이블(lambda/data/saju_pillars.bin)은 직접 계산 및 backend/utils/pillarTable.js 결과와 비교
+- 대량 계산(saju_bulk.py)은 numpy가 있으면 bazi_details 결과와 비교
+"""
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'test', 'fixtures')
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+from pillar_table import pillar_table  # noqa: E402
+from saju_engine import (  # noqa: E402
+    analyze_wuxing, bazi_details, compute_four_pillars, four_pillars, translate_saju_result
+)
+
+# MCP 결과와 비교하는 키 (녹화 데이터에 있는 키만 비교)
+COMPARED_KEYS = ('四柱', '五行', '十神', '生肖', '星座', '日主')
+
+
+def load_reference_cases():
+    with open(os.path.join(FIXTURES, 'saju_reference.json'), encoding='utf-8') as f:
+        return [(case['input'], case['expected'], 'reference') for case in json.load(f)['cases']]
+
+
+def load_recorded_cases():
+    cases = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, 'mcp_bazi', '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            recorded = json.load(f)
+        expected = json.loads(recorded['result']['content'][0]['text'])
+        cases.append((recorded['input'], expected, os.path.basename(path)))
+    return cases
+
+
+def load_cases():
+    return load_reference_cases() + load_recorded_cases()
+
+
+def parity_failures(cases):
+    failures = []
+    for birth, expected, source in cases:
+        diff = diff_case(birth, expected)
+        if diff:
+            failures.append((source, birth, diff))
+    return failures
+
+
+def diff_case(birth, expected):
+    actual = bazi_details(birth['year'], birth['month'], birth['day'], birth['hour'])
+    return {
+        key: {'expected': expected[key], 'actual': actual.get(key)}
+        for key in COMPARED_KEYS
+        if key in expected and expected[key] != actual.get(key)
+    }
+
+
+def translate_with_node(data):
+    """sajuTranslator.js로 같은 데이터를 번역"""
+    translator = os.path.join(ROOT, 'backend', 'utils', 'sajuTranslator.js')
+    script = (
+        f"import {{ translateSajuResult, analyzeWuxing }} from {json.dumps('file://' + translator)};"
+        "let input = '';"
+        "process.stdin.on('data', (chunk) => input += chunk);"
+        "process.stdin.on('end', () => {"
+        "  const translated = translateSajuResult({ content: [{ type: 'text', text: input }] });"
+        "  console.log(JSON.stringify({ translated, analysis: analyzeWuxing(translated.오행) }));"
+        "});"
+    )
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e', script],
+        input=json.dumps(data, ensure_ascii=False), capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    return json.loads(result.stdout)
+
+
+def test_engine_parity():
+    """만세력 기준 사주와 엔진 계산 비교"""
+    failures = parity_failures(load_reference_cases())
+    assert not failures, json.dumps(failures, ensure_ascii=False, indent=2)
+
+
+def test_mcp_parity():
+    """MCP get_bazi_details 녹화 결과와 엔진 계산 비교"""
+    cases = load_recorded_cases()
+    if not cases:
+        pytest.skip("fixtures/mcp_bazi에 녹화 파일이 없습니다 (node backend/record-bazi-fixtures.js)")
+    failures = parity_failures(cases)
+    assert not failures, json.dumps(failures, ensure_ascii=False, indent=2)
+
+
+def test_translator_parity():
+    """Python 번역이 sajuTranslator.js와 같은 결과를 내는지 비교"""
+    if shutil.which('node') is None:
+        print("⚠️ node가 없어 번역 패리티 테스트를 건너뜁니다")
+        return
+    for birth, _, source in load_cases():
+        details = bazi_details(birth['year'], birth['month'], birth['day'], birth['hour'])
+        translated = translate_saju_result(details)
+        expected = translate_with_node(details)
+        assert translated == expected['translated'], source
+        assert analyze_wuxing(translated['오행']) == expected['analysis'], source
+
+
+
+def table_sample_dates():
+    """절입일 전후 포함 테이블 전 구간에서 고르게 뽑은 날짜"""
+    day = date(pillar_table.start_year, 1, 1)
+    end = date(pillar_table.end_year, 12, 31)
+    while day <= end:
+        yield day
+        day += timedelta(days=13)
+    for year in range(pillar_table.start_year, pillar_table.end_year + 1, 7):
+        for month in range(1, 13):
+            for offset in range(3, 10):
+                yield date(year, month, offset)
+
+
+def test_pillar_table_parity():
+    """간지 테이블 조회가 태양 황경 직접 계산과 같은지 비교"""
+    assert pillar_table is not None, "lambda/data/saju_pillars.bin이 없습니다 (python lambda/pillar_table.py)"
+    failures = []
+    for day in table_sample_dates():
+        for hour in range(24):
+            expected = compute_four_pillars(day.year, day.month, day.day, hour)
+            actual = four_pillars(day.year, day.month, day.day, hour)
+            if actual != expected:
+                failures.append((day.isoformat(), hour, expected, actual))
+    assert not failures, failures[:10]
+
+
+def test_node_table_parity():
+    """pillarTable.js 조회가 Python bazi_details와 같은지 비교"""
+    if shutil.which('node') is None:
+        print("⚠️ node가 없어 간지 테이블 패리티 테스트를 건너뜁니다")
+        return
+    samples = [(day.year, day.month, day.day, hour)
+               for i, day in enumerate(table_sample_dates()) if i % 5 == 0
+               for hour in (0, 1, 11, 12, 22, 23)]
+    module = os.path.join(ROOT, 'backend', 'utils', 'pillarTable.js')
+    script = (
+        f"import {{ loadPillarTable, lookupBazi }} from {json.dumps('file://' + module)};"
+        "const table = loadPillarTable();"
+        "let input = '';"
+        "process.stdin.on('data', (chunk) => { input += chunk; });"
+        "process.stdin.on('end', () => {"
+        "  const samples = JSON.parse(input);"
+        "  process.stdout.write(JSON.stringify(samples.map((s) => lookupBazi(table, ...s))));"
+        "});"
+    )
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e', script],
+        input=json.dumps(samples), capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    for sample, actual in zip(samples, json.loads(result.stdout)):
+        assert actual == bazi_details(*sample), sample
+
+
+
+def test_bulk_parity():
+    """saju_bulk 벡터 계산이 bazi_details와 같은지 비교 (테이블 범위 밖/무효 날짜 포함)"""
+    try:
+        from saju_bulk import compute_bulk
+    except ImportError:
+        print("⚠️ numpy가 없어 대량 계산 패리티 테스트를 건너뜁니다")
+        return
+    samples = [(day.year, day.month, day.day, hour)
+               for i, day in enumerate(table_sample_dates()) if i % 5 == 0
+               for hour in (0, 12, 23)]
+    samples += [(1899, 12, 31, 23), (2101, 2, 4, 12), (2023, 2, 29, 0), (2024, 13, 1, 0), (2024, 1, 1, 24)]
+    result = compute_bulk(*zip(*samples))
+    for i, sample in enumerate(samples):
+        try:
+            expected = bazi_details(*sample)
+        except ValueError:
+            assert not result['valid'][i], sample
+            continue
+        actual_pillars = [result[key][i] for key in ('year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar')]
+        assert actual_pillars == list(expected['四柱'].values()), sample
+        assert {element: int(result[element][i]) for element in expected['五行']} == expected['五行'], sample
+
+
+if __name__ == "__main__":
+    print("🔮 로컬 사주 엔진 패리티 테스트")
+    cases = load_cases()
+    recorded = sum(1 for _, _, source in cases if source != 'reference')
+    print(f"📋 기준 사주 {len(cases) - recorded}건, MCP 녹화 {recorded}건")
+    if not recorded:
+        print("⚠️ MCP 녹화가 없어 MCP 패리티는 확인하지 않았습니다 (node backend/record-bazi-fixtures.js)")
+
+    failed = False
+    for birth, expected, source in cases:
+        diff = diff_case(birth, expected)
+        label = f"{birth['year']}-{birth['month']:02d}-{birth['day']:02d} {birth['hour']:02d}시 ({source})"
+        if diff:
+            failed = True
+            print(f"❌ {label}: {json.dumps(diff, ensure_ascii=False)}")
+        else:
+            print(f"✅ {label}")
+
+    try:
+        test_translator_parity()
+        print("✅ sajuTranslator.js 번역 패리티")
+    except AssertionError as e:
+        failed = True
+        print(f"❌ 번역 결과 불일치: {e}")
+
+    for label, test in (("간지 테이블 직접 계산", test_pillar_table_parity),
+                        ("pillarTable.js 조회", test_node_table_parity),
+                        ("대량 계산", test_bulk_parity)):
+        try:
+            test()
+            print(f"✅ {label} 패리티")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 불일치: {e}")
+
+    exit(1 if failed else 0)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+single-flight 동시성 테스트 (lambda/single_flight.py, image_generator 생성 합치기)
+
+- 동일 키 동시 호출은 한 번만 실행되고 나머지는 결과 공유
+- leader 예외는 합류한 호출에도 전달, 이후 호출은 새로 실행
+- 단건(load_images)과 배치(generate_prompt_group) 경로는 같은 캐시 키여도 서로 합류하지 않음
+- asyncio용: leader 요청이 취소되어도 합류한 요청은 결과를 받고, 이후 호출은 새로 실행
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+import image_generator  # noqa: E402
+from image_cache import MemoryImageCache, image_cache_key  # noqa: E402
+from prompt_builder import build_request_body  # noqa: E402
+from single_flight import AsyncSingleFlight, SingleFlight  # noqa: E402
+
+WAIT = 5
+
+
+def wait_until(condition, timeout=WAIT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def run_threads(targets):
+    """각 함수를 스레드로 실행 - 시작한 스레드 목록 반환"""
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_calls_coalesce():
+    flight = SingleFlight()
+    gate = threading.Event()
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        gate.wait(WAIT)
+        return object()
+
+    def caller():
+        results.append(flight.do('key', work))
+
+    threads = run_threads([caller] * 5)
+    # 모든 후속 호출이 leader를 기다리는 상태가 된 뒤 실행 완료
+    assert wait_until(lambda: flight.stats.snapshot()['coalesced'] == 4), flight.stats.snapshot()
+    gate.set()
+    for thread in threads:
+        thread.join(WAIT)
+
+    assert len(calls) == 1
+    assert len({id(result) for result, _ in results}) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.stats.snapshot() == {'leaders': 1, 'coalesced': 4}
+
+    # 완료 후에는 같은 키도 새로 실행
+    flight.do('key', work)
+    assert len(calls) == 2
+
+
+def test_leader_error_shared():
+    flight = SingleFlight()
+    gate = threading.Event()
+    errors = []
+
+    def work():
+        gate.wait(WAIT)
+        raise ValueError('생성 실패')
+
+    def caller():
+        try:
+            flight.do('key', work)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = run_threads([caller] * 3)
+    assert wait_until(lambda: flight.stats.snapshot()['coalesced'] == 2)
+    gate.set()
+    for thread in threads:
+        thread.join(WAIT)
+
+    assert len(errors) == 3 and len({id(error) for error in errors}) == 1
+    assert flight.do('key', lambda: 'ok') == ('ok', False)
+
+
+def test_single_and_group_do_not_share():
+    """count=1 배치와 단건 요청은 같은 캐시 키를 쓰지만 반환 형태가 달라 합류하면 안 됨"""
+    gate = threading.Event()
+    started = []
+
+    def fake_invoke_all(request_body, bedrock=None):
+        started.append(request_body['imageGenerationConfig']['numberOfImages'])
+        gate.wait(WAIT)
+        return [b'image'] * request_body['imageGenerationConfig']['numberOfImages']
+
+    prompt = 'single-flight 테스트 프롬프트'
+    request_body = build_request_body(prompt)
+    request_body['imageGenerationConfig']['numberOfImages'] = 1
+    cache_key = image_cache_key(request_body, image_generator.IMAGE_MODEL_ID)
+
+    original_cache = image_generator.image_cache
+    original_invoke = image_generator.invoke_image_model_all
+    image_generator.image_cache = MemoryImageCache()
+    image_generator.invoke_image_model_all = fake_invoke_all
+    results = {}
+    try:
+        single = run_threads([lambda: results.update(
+            single=image_generator.load_images(cache_key, request_body, [], 'png', True))])
+        assert wait_until(lambda: len(started) == 1)
+        group = run_threads([lambda: results.update(
+            group=image_generator.generate_prompt_group(prompt, 1))])
+        # 키 공간이 분리되어 있으면 배치도 자체 생성을 시작
+        wait_until(lambda: len(started) == 2, timeout=1)
+        gate.set()
+        for thread in single + group:
+            thread.join(WAIT)
+    finally:
+        image_generator.image_cache = original_cache
+        image_generator.invoke_image_model_all = original_invoke
+
+    images, status = results['single']
+    assert status == 'MISS' and images[0]['data'] == b'image'
+    group_images, group_status = results['group']
+    assert group_status == 'MISS', group_status
+    assert group_images == [(cache_key, b'image')], group_images
+
+
+def test_async_leader_cancel():
+    """leader 요청이 취소되어도 공유 작업은 계속되어 합류한 요청이 결과를 받음"""
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do('key', generate))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do('key', generate))
+        await asyncio.sleep(0)
+        leader.cancel()
+        follower_result = await follower
+        leader_cancelled = False
+        try:
+            await leader
+        except asyncio.CancelledError:
+            leader_cancelled = True
+        await asyncio.sleep(0)
+        return leader_cancelled, follower_result, await flight.do('key', generate)
+
+    leader_cancelled, follower_result, later_result = asyncio.run(scenario())
+    assert leader_cancelled
+    assert follower_result == (1, True), follower_result
+    # 완료된 작업은 정리되어 이후 호출은 새로 실행
+    assert later_result == (2, False), later_result
+    assert flight.stats.snapshot() == {'leaders': 2, 'coalesced': 1}
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("동일 키 합치기", test_concurrent_calls_coalesce),
+                        ("leader 예외 공유", test_leader_error_shared),
+                        ("단건/배치 키 분리", test_single_and_group_do_not_share),
+                        ("async leader 취소", test_async_leader_cancel)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Lambda 프로세스 캐시 테스트 (lambda/saju_api.py TTLCache)
+
+- 크기 제한 LRU (조회한 항목은 최근 사용으로 이동, 가장 오래된 항목부터 제거)
+- TTL 만료 (기본 TTL, 항목별 TTL), 만료 항목은 조회 시 삭제
+- max_entries <= 0이면 저장하지 않음
+- 적중/미스 통계 스냅샷 (동시 조회 후에도 합계 일치), /saju/basic 응답 헤더
+"""
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda'))
+
+from saju_api import TTLCache  # noqa: E402
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+
+    # 같은 키 다시 저장도 최근 사용으로 이동
+    cache.set('a', 10)
+    cache.set('d', 4)
+    assert cache.get('c') is None
+    assert cache.get('a') == 10 and cache.get('d') == 4
+
+
+def test_expiry():
+    cache = TTLCache(max_entries=10, ttl=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+    cache = TTLCache(max_entries=10, ttl=60)
+    cache.set('short', 1, ttl=0)
+    cache.set('long', 2)
+    assert cache.get('short') is None
+    assert cache.get('long') == 2
+    assert cache.snapshot() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+
+def test_disabled():
+    for max_entries in (0, -1):
+        cache = TTLCache(max_entries=max_entries, ttl=60)
+        cache.set('a', 1)
+        assert cache.get('a') is None
+        assert len(cache) == 0
+        assert cache.snapshot() == {'hits': 0, 'misses': 1, 'entries': 0}
+
+
+def test_snapshot_and_clear():
+    cache = TTLCache(max_entries=10, ttl=60)
+    cache.set('a', 1)
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        for _ in range(500):
+            cache.get('a')
+            cache.get('missing')
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.snapshot() == {'hits': 4000, 'misses': 4000, 'entries': 1}
+
+    cache.clear()
+    assert cache.snapshot() == {'hits': 0, 'misses': 0, 'entries': 0}
+
+
+def test_response_headers():
+    import saju_api
+
+    saju_api.saju_cache.clear()
+    try:
+        saju_api.saju_cache.get('missing')
+        headers = saju_api.basic_saju_headers('MISS')
+        assert headers['X-Cache'] == 'MISS'
+        assert headers['X-Cache-Hits'] == '0' and headers['X-Cache-Misses'] == '1'
+    finally:
+        saju_api.saju_cache.clear()
+
+
+if __name__ == '__main__':
+    failed = False
+    for label, test in (("LRU 제거", test_lru_eviction),
+                        ("TTL 만료", test_expiry),
+                        ("max_entries <= 0", test_disabled),
+                        ("통계 스냅샷/초기화", test_snapshot_and_clear),
+                        ("응답 헤더", test_response_headers)):
+        try:
+            test()
+            print(f"✅ {label}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {label} 실패: {e}")
+
+    exit(1 if failed else 0)
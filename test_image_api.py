@@ -15,8 +15,10 @@ def test_image_generation(api_url, color, animal):
         "animal": animal
     }
     
+    # PNG 원본 바이트 요청 (구버전 서버는 JSON/base64로 응답)
     headers = {
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
+        "Accept": "image/png"
     }
     
     print(f"🎨 {color} {animal} 이미지 생성 요청...")
@@ -27,7 +29,18 @@ def test_image_generation(api_url, color, animal):
         
         print(f"📊 응답 상태: {response.status_code}")
         
-        if response.status_code == 200:
+        if response.status_code == 200 and response.headers.get('Content-Type', '').startswith('image/'):
+            print("✅ 이미지 생성 성공! (binary)")
+            print(f"🗂  캐시: {response.headers.get('X-Image-Cache', 'N/A')}")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"generated_{color}_{animal}_{timestamp}.png"
+            
+            with open(filename, 'wb') as f:
+                f.write(response.content)
+            
+            print(f"💾 이미지 저장: {filename} ({len(response.content)} bytes)")
+            return True
+        elif response.status_code == 200:
             result = response.json()
             
             if result.get('success'):